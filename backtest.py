@@ -0,0 +1,93 @@
+# Internal Libraries
+from utils.arguments import backtest_arguments
+
+# Parse arguments before loading anything heavy so --help returns immediately
+args = backtest_arguments().parse_args()
+
+print("Loading dependencies...\n")
+
+# External Libraries
+from dotenv import load_dotenv
+import os
+import uuid
+import datetime
+import sqlite3
+import pandas as pd
+
+# Data Sources
+from data_sources.DataAggregate import DataAggregate
+from data_sources.ResultsDB import ResultsDB
+
+# Prediction Models
+from prediction_models.ModelPlugins import ModelPlugins
+from prediction_models.ModelRegistry import ModelRegistry
+from prediction_models.WalkForwardBacktest import WalkForwardBacktest
+
+# Utilities
+from utils.logger import log
+
+# Internal Libraries
+import setup # Loads launch states, sets preferences from .env, enables argument parsing
+
+load_dotenv()
+this_filename = os.path.basename(__file__).replace(".py","")
+
+state = {
+    "agent_id": str(uuid.uuid4()),
+    "db_path": os.getenv("DB_PATH"),
+    "log_type": "all" if args.debug else "file",
+    "compact_aggregates": args.compact
+}
+now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+state["log_path"] = f"logs/{ this_filename }/{ now }_{ state["agent_id"] }.jsonl"
+log(state["log_path"], "Backtesting...\n", state["log_type"], this_filename)
+
+with open("queries/insert_agent_run.sql") as f:
+    query = f.read().format(
+        agent_id = f"\"{ state["agent_id"] }\"",
+        agent_name = f"\"Backtest Agent\""
+    )
+conn = sqlite3.connect(state["db_path"])
+conn.execute(query)
+conn.commit()
+conn.close()
+
+rdb = ResultsDB(state["db_path"])
+rdb.ensure_hyperparameters_column()
+
+best_results = [best for best in rdb.load_best_results() if best["model_name"] in ModelPlugins.names()]
+if args.models:
+    best_results = [best for best in best_results if best["model_name"] in args.models]
+
+data_aggregates = DataAggregate(state)
+
+# Weekly fits are only cached on request, a season of RandomForest fits takes a lot of disk
+registry = ModelRegistry("results/backtest_registry", keep_latest = False) if args.cache_models else None
+backtest = WalkForwardBacktest(
+    data_aggregates.aggregates,
+    args.start_season,
+    args.end_season,
+    args.retrain_every,
+    registry,
+    args.retrain
+)
+log(state["log_path"], f"Backtesting { len(best_results) } models over seasons { backtest.start_season }-{ backtest.end_season }", state["log_type"], this_filename)
+
+all_results = []
+for best in best_results:
+    results = backtest.run(
+        ModelPlugins.get(best["model_name"]),
+        best["target"],
+        best["features_used"],
+        best.get("hyperparameters"),
+        log = lambda message: log(state["log_path"], message, state["log_type"], this_filename)
+    )
+    if len(results) == 0:
+        continue
+    rdb.save_backtest_results(state["agent_id"], results)
+    all_results.append(results)
+
+if all_results:
+    summary = WalkForwardBacktest.summarize(pd.concat(all_results, ignore_index=True))
+    log(state["log_path"], f"Backtest { state["agent_id"] }\n{ summary.to_string(index=False) }", "all", this_filename)
+rdb.set_agent_completion(state["agent_id"])
@@ -0,0 +1,205 @@
+"""
+Per-stage wall time and peak memory of building a DataAggregate.
+
+Each stage is timed by wrapping the method that implements it, so the numbers
+come from the production code path. Stages nest (Elo, RPI, rolling stats,
+trends and the home/away split run inside the rolling aggregates, which run once
+for the aggregates and once more for the prediction set); a stage's time
+includes its children and `calls` counts how often it ran.
+
+    python -m benchmarks.aggregate_pipeline --seasons 10 20 --teams 32 --output results/benchmark.json
+    python -m benchmarks.aggregate_pipeline --db db/historical_data.db
+"""
+# External Libraries
+import os
+import sys
+import time
+import json
+import platform
+import argparse
+import datetime
+import tracemalloc
+import functools
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Data Sources
+from data_sources.DataAggregate import DataAggregate
+from data_sources.ProFootballReference import ProFootballReference
+
+# Benchmarks
+from benchmarks.synthetic import fixture_database
+
+# (stage name, class, method) in pipeline order
+STAGES = [
+    ("load_game_data", ProFootballReference, "load_game_data_from_db"),
+    ("load_team_performance", ProFootballReference, "load_team_performance_from_db"),
+    ("opponent_stats", DataAggregate, "_DataAggregate__add_opponent_stats_to_team_performance"),
+    ("create_aggregates", DataAggregate, "_DataAggregate__create_aggregates"),
+    ("rolling_aggregates", DataAggregate, "_DataAggregate__get_rolling_aggregates"),
+    ("elo", DataAggregate, "_DataAggregate__calculate_elo"),
+    ("rpi", DataAggregate, "_DataAggregate__calculate_rpi"),
+    ("rolling_stats", DataAggregate, "_DataAggregate__calculate_stats"),
+    ("trends", DataAggregate, "_DataAggregate__calculate_trend"),
+    ("location_split", DataAggregate, "_DataAggregate__add_location_stats"),
+    ("compact_aggregates", DataAggregate, "_DataAggregate__compact_aggregates"),
+    ("upcoming_games", ProFootballReference, "get_upcoming_games"),
+    ("prediction_set", DataAggregate, "_DataAggregate__get_prediction_set")
+]
+
+class StageRecorder:
+    """
+    Wraps stage methods to record wall time and peak traced allocation.
+
+    tracemalloc only has one peak counter, so entering a nested stage folds the
+    peak seen so far into every open stage before resetting it. A stage's
+    `peak_mb` is its high-water mark above the memory in use when it started.
+    """
+    def __init__(self):
+        self.stages = {}
+        self.stack = []
+        self.originals = []
+
+    def install(self):
+        for name, owner, attribute in STAGES:
+            original = getattr(owner, attribute)
+            self.originals.append((owner, attribute, original))
+            setattr(owner, attribute, self.__wrap(name, original))
+
+    def uninstall(self):
+        for owner, attribute, original in reversed(self.originals):
+            setattr(owner, attribute, original)
+        self.originals = []
+
+    def __wrap(self, name, method):
+        recorder = self
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            recorder.enter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                recorder.exit(name)
+        return wrapper
+
+    def enter(self):
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in self.stack:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+        self.stack.append({ "start": time.perf_counter(), "memory": current, "peak": current })
+
+    def exit(self, name):
+        seconds = time.perf_counter() - self.stack[-1]["start"]
+        peak = max(self.stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+        frame = self.stack.pop()
+        for parent in self.stack:
+            parent["peak"] = max(parent["peak"], peak)
+
+        stage = self.stages.setdefault(name, { "seconds": 0.0, "peak_mb": 0.0, "calls": 0 })
+        stage["seconds"] += seconds
+        stage["peak_mb"] = max(stage["peak_mb"], (peak - frame["memory"]) / 1e6)
+        stage["calls"] += 1
+
+def build(state, trace):
+    recorder = StageRecorder()
+    recorder.install()
+    if trace:
+        tracemalloc.start()
+    try:
+        recorder.enter()
+        aggregate = DataAggregate(state)
+        recorder.exit("total")
+    finally:
+        if trace:
+            tracemalloc.stop()
+        recorder.uninstall()
+    return aggregate, recorder.stages
+
+def run(state, repeat):
+    """
+    Wall times come from the fastest of `repeat` untraced builds; tracemalloc slows
+    the pipeline down several times over, so peaks come from one extra traced build.
+    """
+    timed = None
+    for _ in range(repeat):
+        aggregate, stages = build(state, trace = False)
+        if timed is None or stages["total"]["seconds"] < timed["total"]["seconds"]:
+            timed = stages
+    _, traced = build(state, trace = True)
+
+    return {
+        "games": len(aggregate.aggregates),
+        "team_games": len(aggregate.team_performance),
+        "prediction_rows": len(aggregate.prediction_set),
+        "stages": {
+            name: {
+                "seconds": round(stage["seconds"], 4),
+                "peak_mb": round(traced[name]["peak_mb"], 4),
+                "calls": stage["calls"]
+            }
+            for name, stage in timed.items()
+        }
+    }
+
+def print_run(result, file=sys.stderr):
+    print(f"\n{ result["label"] }: { result["games"] } games, { result["team_games"] } team games", file = file)
+    print(f"  { "stage":<24}{ "seconds":>10}{ "peak MB":>10}{ "calls":>7}", file = file)
+    for name, stage in result["stages"].items():
+        print(f"  { name:<24}{ stage["seconds"]:>10.3f}{ stage["peak_mb"]:>10.1f}{ stage["calls"]:>7}", file = file)
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark each stage of the DataAggregate pipeline")
+    parser.add_argument("--seasons", type = int, nargs = "+", default = [20], help = "synthetic seasons to benchmark, one run per value, default is 20")
+    parser.add_argument("--teams", type = int, default = 32, help = "synthetic teams, default is 32")
+    parser.add_argument("--seed", type = int, default = 0, help = "seed for the synthetic history")
+    parser.add_argument("--db", default = None, help = "benchmark a copy of this historical_data.db instead of synthetic data")
+    parser.add_argument("--compact", action = "store_true", help = "build compact aggregates")
+    parser.add_argument("--repeat", type = int, default = 1, help = "builds per run, the fastest is reported, default is 1")
+    parser.add_argument("--output", default = None, help = "write the JSON report to this path instead of stdout")
+    parser.add_argument("--table", action = "store_true", help = "also print a table per run to stderr")
+    args = parser.parse_args()
+
+    runs = []
+    configurations = [{ "seasons": None, "path": args.db }] if args.db else [{ "seasons": seasons, "path": None } for seasons in args.seasons]
+    for configuration in configurations:
+        with fixture_database(configuration["seasons"], args.teams, args.seed, configuration["path"]) as tmp:
+            state = {
+                "log_path": os.path.join(tmp, "benchmark.txt"),
+                "log_type": "file",
+                "compact_aggregates": args.compact
+            }
+            result = run(state, args.repeat)
+        if args.db:
+            result["label"] = os.path.basename(args.db)
+        else:
+            result["label"] = f"{ configuration["seasons"] } seasons x { args.teams } teams"
+            result["seasons"] = configuration["seasons"]
+            result["teams"] = args.teams
+        runs.append(result)
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec = "seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "compact": args.compact,
+        "runs": runs
+    }
+
+    if args.table:
+        for result in runs:
+            print_run(result)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok = True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent = 2)
+    else:
+        print(json.dumps(report, indent = 2))
+
+if __name__ == "__main__":
+    main()
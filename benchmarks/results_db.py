@@ -0,0 +1,188 @@
+"""
+Benchmarks the database writes of optimize_progressor over a long optimization run.
+
+"before" is the previous implementation: ResultsDB.save_result per experiment and
+save_best_result per new best, each opening a connection, formatting the SQL
+template with the values inlined and committing. "after" is the current
+ResultsDB.save_plan_results, one transaction per plan with bound parameters and
+executemany. Both write the same synthetic results into a fresh database and the
+tables they leave are checked for equality.
+
+    python -m benchmarks.results_db --experiments 5000 --plan_size 10
+"""
+# External Libraries
+import os
+import sys
+import time
+import json
+import random
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Data Sources
+from data_sources.ResultsDB import ResultsDB
+
+RESULT_COLUMNS = """
+    model_name TEXT,
+    target TEXT,
+    train_time_in_seconds REAL,
+    features_used TEXT,
+    mean_absolute_error REAL,
+    root_mean_squared_error REAL,
+    train_accuracy REAL,
+    test_accuracy REAL,
+    feature_importance TEXT,
+    feature_coefficients TEXT,
+    confidence_intervals TEXT,
+    agent_id TEXT,
+    hyperparameters TEXT
+"""
+MODELS = { "LinearRegression": "point_differential", "XGBoost": "point_differential", "LogisticRegression": "win", "KNearest": "win" }
+
+def create_database(path):
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE result (id INTEGER PRIMARY KEY AUTOINCREMENT, { RESULT_COLUMNS }, created TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute(f"CREATE TABLE best_result (id INTEGER PRIMARY KEY AUTOINCREMENT, { RESULT_COLUMNS }, last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    conn.executemany("INSERT INTO best_result (model_name, target) VALUES (?, ?)", MODELS.items())
+    conn.commit()
+    conn.close()
+
+def make_plans(experiments, plan_size, best_rate, seed=0):
+    """Plans of (results, best-result updates), each a list of (result, features_used)."""
+    rng = random.Random(seed)
+    features = [f"team_a_stat_{ i }" for i in range(60)]
+    plans = []
+    for start in range(0, experiments, plan_size):
+        results, best_updates = [], []
+        for _ in range(min(plan_size, experiments - start)):
+            model_name = rng.choice(list(MODELS))
+            used = rng.sample(features, rng.randint(3, 20))
+            result = {
+                "model_name": model_name,
+                "target": MODELS[model_name],
+                "train_time_in_seconds": round(rng.uniform(0.05, 5), 2),
+                "agent_id": "benchmark",
+                "hyperparameters": { "alpha": rng.choice([0.1, 1.0, 10.0]) },
+                "confidence_intervals": { "0.5-0.6": { "accuracy": round(rng.random(), 4), "count": rng.randint(1, 99) } },
+                "feature_coefficients": { col: round(rng.gauss(0, 1), 4) for col in used }
+            }
+            if MODELS[model_name] == "point_differential":
+                result["mean_absolute_error"] = round(rng.uniform(9, 12), 4)
+                result["root_mean_squared_error"] = round(rng.uniform(12, 16), 4)
+            else:
+                result["train_accuracy"] = round(rng.uniform(0.55, 0.7), 4)
+                result["test_accuracy"] = round(rng.uniform(0.55, 0.7), 4)
+            results.append((result, used))
+            if rng.random() < best_rate:
+                best_updates.append((result, used))
+        plans.append((results, best_updates))
+    return plans
+
+def save_result_before(rdb, result, features_used):
+    values = f"\t{ rdb.sql_string(result['model_name']) }, { rdb.sql_string(result['target']) }, { rdb.sql_value(result['train_time_in_seconds']) }, "
+    values += f"{ rdb.sql_json(features_used) }, { rdb.sql_value(result.get('mean_absolute_error')) }, "
+    values += f"{ rdb.sql_value(result.get('root_mean_squared_error')) }, { rdb.sql_value(result.get('train_accuracy')) }, "
+    values += f"{ rdb.sql_value(result.get('test_accuracy')) }, "
+    values += f"{ rdb.sql_json(result.get('feature_importance')) }, "
+    values += f"{ rdb.sql_json(result.get('feature_coefficients')) }, "
+    values += f"{ rdb.sql_json(result.get('confidence_intervals')) }, "
+    values += f"{ rdb.sql_string(result['agent_id']) }, "
+    values += f"{ rdb.sql_json(result.get('hyperparameters')) }"
+
+    conn = sqlite3.connect(rdb.db_path)
+    cur = conn.cursor()
+    with open("queries/insert_result.sql") as f:
+        query = f.read().format(table = "result", values = values)
+    cur.execute(query)
+    conn.commit()
+    conn.close()
+
+def save_best_result_before(rdb, best, features_used):
+    set_statements = f"target = { rdb.sql_string(best['target']) },\n"
+    set_statements += f"\ttrain_time_in_seconds = { rdb.sql_value(best['train_time_in_seconds']) },\n"
+    set_statements += f"\tfeatures_used = { rdb.sql_json(features_used) },\n"
+    set_statements += f"\tmean_absolute_error = { rdb.sql_value(best.get('mean_absolute_error')) },\n"
+    set_statements += f"\troot_mean_squared_error = { rdb.sql_value(best.get('root_mean_squared_error')) },\n"
+    set_statements += f"\ttrain_accuracy = { rdb.sql_value(best.get('train_accuracy')) },\n"
+    set_statements += f"\ttest_accuracy = { rdb.sql_value(best.get('test_accuracy')) },\n"
+    set_statements += f"\tfeature_importance = { rdb.sql_json(best.get('feature_importance')) },\n"
+    set_statements += f"\tfeature_coefficients = { rdb.sql_json(best.get('feature_coefficients')) },\n"
+    set_statements += f"\tconfidence_intervals = { rdb.sql_json(best.get('confidence_intervals')) },\n"
+    set_statements += f"\tagent_id = { rdb.sql_string(best['agent_id']) },\n"
+    set_statements += f"\thyperparameters = { rdb.sql_json(best.get('hyperparameters')) },\n"
+    set_statements += f"\tlast_updated = CURRENT_TIMESTAMP\n"
+
+    conn = sqlite3.connect(rdb.db_path)
+    cur = conn.cursor()
+    with open("queries/update_best_result.sql") as f:
+        query = f.read().format(set_statements = set_statements, model_name = best["model_name"])
+    cur.execute(query)
+    conn.commit()
+    conn.close()
+
+def write_before(rdb, plans):
+    for results, best_updates in plans:
+        best = { id(result) for result, _ in best_updates }
+        for result, features_used in results:
+            save_result_before(rdb, result, features_used)
+            if id(result) in best:
+                save_best_result_before(rdb, result, features_used)
+
+def write_after(rdb, plans):
+    for results, best_updates in plans:
+        rdb.save_plan_results(results, best_updates)
+
+def measure(function, plans, tmp, name):
+    path = os.path.join(tmp, f"{ name }.db")
+    create_database(path)
+    start = time.perf_counter()
+    function(ResultsDB(path), plans)
+    seconds = time.perf_counter() - start
+    return seconds, path
+
+def tables(path):
+    """Both tables without their ids and timestamps."""
+    conn = sqlite3.connect(path)
+    columns = [line.split()[0] for line in RESULT_COLUMNS.strip().splitlines()]
+    rows = {
+        table: conn.execute(f"SELECT { ', '.join(columns) } FROM { table } ORDER BY id").fetchall()
+        for table in ["result", "best_result"]
+    }
+    conn.close()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark optimize_progressor's result writes before and after batching them per plan")
+    parser.add_argument("--experiments", type = int, default = 5000, help = "experiments in the run, default is 5000")
+    parser.add_argument("--plan_size", type = int, default = 10, help = "experiments per plan, default is 10")
+    parser.add_argument("--best_rate", type = float, default = 0.02, help = "share of experiments that improve a best result, default is 0.02")
+    parser.add_argument("--json", action = "store_true", help = "print results as JSON")
+    args = parser.parse_args()
+
+    plans = make_plans(args.experiments, args.plan_size, args.best_rate)
+    with tempfile.TemporaryDirectory() as tmp:
+        before, before_path = measure(write_before, plans, tmp, "before")
+        after, after_path = measure(write_after, plans, tmp, "after")
+        assert tables(before_path) == tables(after_path), "batched writes left different tables"
+
+    results = {
+        "experiments": args.experiments,
+        "plans": len(plans),
+        "best_updates": sum(len(best_updates) for _, best_updates in plans),
+        "before": { "seconds": before, "per_experiment_ms": before / args.experiments * 1000 },
+        "after": { "seconds": after, "per_experiment_ms": after / args.experiments * 1000 },
+        "speedup": before / after
+    }
+    if args.json:
+        print(json.dumps(results, indent = 2))
+    else:
+        print(f"\nResult writes for { results["experiments"] } experiments in { results["plans"] } plans ({ results["best_updates"] } best-result updates)")
+        for name in ["before", "after"]:
+            print(f"  { name:<7} { results[name]["seconds"]:.3f}s  { results[name]["per_experiment_ms"]:.3f} ms per experiment")
+        print(f"  speedup { results["speedup"]:.1f}x")
+
+if __name__ == "__main__":
+    main()
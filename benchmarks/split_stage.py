@@ -0,0 +1,111 @@
+"""
+Benchmarks the home/away split stage of DataAggregate.__get_rolling_aggregates.
+
+"before" is the previous implementation (per-location copy, merge back on
+['event_id', 'team'], then a grouped ffill and bfill per split column); "after"
+is the current positional scatter. Both run on the same synthetic history and
+their outputs are checked for equality.
+
+    python -m benchmarks.split_stage --seasons 20 --teams 32 --repeat 3
+"""
+# External Libraries
+import os
+import sys
+import time
+import json
+import argparse
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Data Sources
+from data_sources.DataAggregate import DataAggregate
+
+# Benchmarks
+from benchmarks.synthetic import fixture_database
+
+def split_before(aggregate, team_performance, interval):
+    calculate_stats = aggregate._DataAggregate__calculate_stats
+    for location in ['home','away']:
+        if location == 'home':
+            mask = team_performance['is_home'] == 1
+        elif location == 'away':
+            mask = team_performance['is_home'] == 0
+
+        split_performance = team_performance[mask].copy()
+        split_performance = calculate_stats(split_performance, ['team'], interval, location)
+
+        split_cols = [col for col in split_performance.columns if col.endswith(f'_{location}') and col != 'is_home']
+
+        team_performance = team_performance.merge(
+            split_performance[['event_id', 'team'] + split_cols],
+            on=['event_id', 'team'],
+            how='left'
+        )
+
+        for col in split_cols:
+            team_performance[col] = team_performance.groupby('team')[col].ffill()
+            team_performance[col] = team_performance.groupby('team')[col].bfill()
+
+    return team_performance
+
+def split_after(aggregate, team_performance, interval):
+    return aggregate._DataAggregate__add_location_stats(team_performance, interval)
+
+def measure(function, aggregate, team_performance, repeat):
+    """Best wall time over `repeat` runs and the peak traced allocation of a single run."""
+    times = []
+    for _ in range(repeat):
+        frame = team_performance.copy()
+        start = time.perf_counter()
+        result = function(aggregate, frame, 7)
+        times.append(time.perf_counter() - start)
+
+    frame = team_performance.copy()
+    tracemalloc.start()
+    function(aggregate, frame, 7)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return { "seconds": min(times), "peak_mb": peak / 1e6 }, result
+
+def prepare(aggregate):
+    """The team_performance frame as it reaches the split stage."""
+    team_performance = aggregate.team_performance.copy()
+    team_performance['date'] = pd.to_datetime(team_performance['date'])
+    team_performance = team_performance.sort_values(['team', 'date'])
+    team_performance['point_differential'] = team_performance['points_scored'] - team_performance['opp_points_scored']
+    return team_performance
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark the home/away split stage before and after the positional scatter")
+    parser.add_argument("--seasons", type = int, default = 20, help = "synthetic seasons, default is 20")
+    parser.add_argument("--teams", type = int, default = 32, help = "synthetic teams, default is 32")
+    parser.add_argument("--repeat", type = int, default = 3, help = "timed runs per implementation, default is 3")
+    parser.add_argument("--json", action = "store_true", help = "print results as JSON")
+    args = parser.parse_args()
+
+    with fixture_database(args.seasons, args.teams) as tmp:
+        aggregate = DataAggregate({ "log_path": os.path.join(tmp, "benchmark.txt"), "log_type": "file" })
+
+    team_performance = prepare(aggregate)
+    before, before_result = measure(split_before, aggregate, team_performance, args.repeat)
+    after, after_result = measure(split_after, aggregate, team_performance, args.repeat)
+    pd.testing.assert_frame_equal(before_result, after_result)
+
+    results = {
+        "rows": len(team_performance),
+        "before": before,
+        "after": after,
+        "speedup": before["seconds"] / after["seconds"]
+    }
+    if args.json:
+        print(json.dumps(results, indent = 2))
+    else:
+        print(f"\nSplit stage over { results["rows"] } team games")
+        for name in ["before", "after"]:
+            print(f"  { name:<7} { results[name]["seconds"]:.4f}s  peak { results[name]["peak_mb"]:.1f} MB")
+        print(f"  speedup { results["speedup"]:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# External Libraries
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+# Utilities
+from utils.nfl import teams
+
+def make_history(seasons=20, num_teams=32, weeks=17, seed=0, start_season=2000):
+    """
+    Generates `event` and `team_result` frames shaped like the scraped Pro Football
+    Reference tables. Every team plays once a week; the week after the last
+    completed week of the final season is left incomplete as the upcoming games.
+    """
+    rng = np.random.default_rng(seed)
+    codes = teams.all_teams_pfr()[:num_teams]
+    strength = rng.normal(0, 4, num_teams)
+
+    events, team_results = [], []
+    for season in range(start_season, start_season + seasons):
+        for week in range(1, weeks + 2):
+            date = pd.Timestamp(f"{ season }-09-07") + pd.Timedelta(days = 7 * (week - 1))
+            is_complete = not (season == start_season + seasons - 1 and week == weeks + 1)
+            order = rng.permutation(num_teams)
+            for game in range(num_teams // 2):
+                home, away = order[2 * game], order[2 * game + 1]
+                event_id = f"{ season }_{ week }_{ codes[home] }_{ codes[away] }"
+                events.append({
+                    "event_id": event_id,
+                    "season": season,
+                    "season_week_number": week,
+                    "date": str(date.date()),
+                    "day_of_week": "Sun",
+                    "home_team": codes[home],
+                    "away_team": codes[away],
+                    "overtime": 0,
+                    "is_playoffs": 0,
+                    "is_neutral": 0,
+                    "is_complete": int(is_complete)
+                })
+                if not is_complete:
+                    continue
+
+                home_points = max(0, int(rng.normal(23.5 + strength[home] - strength[away], 9)))
+                away_points = max(0, int(rng.normal(22 + strength[away] - strength[home], 9)))
+                for team, opponent, is_home, points, opponent_points in [
+                    (home, away, 1, home_points, away_points),
+                    (away, home, 0, away_points, home_points)
+                ]:
+                    team_results.append({
+                        "event_id": event_id,
+                        "team": codes[team],
+                        "date": str(date.date()),
+                        "opponent": codes[opponent],
+                        "is_home": is_home,
+                        "win": int(points > opponent_points),
+                        "points_scored": points,
+                        "pass_adjusted_yards_per_attempt": rng.normal(6.5 + strength[team] / 8, 1.5),
+                        "rushing_yards_per_attempt": rng.normal(4.2, 0.8),
+                        "turnovers": int(rng.poisson(1.3)),
+                        "penalty_yards": rng.normal(50, 15),
+                        "sack_yards_lost": rng.normal(15, 8)
+                    })
+
+    return pd.DataFrame(events), pd.DataFrame(team_results)
+
+def write_database(path, events, team_results):
+    """Writes the frames to a SQLite database at `path` (e.g. db/historical_data.db)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok = True)
+    conn = sqlite3.connect(path)
+    events.to_sql("event", conn, index = False, if_exists = "replace")
+    team_results.to_sql("team_result", conn, index = False, if_exists = "replace")
+    conn.close()
+
+@contextmanager
+def fixture_database(seasons=20, num_teams=32, seed=0, path=None):
+    """
+    Runs the body inside a temporary working directory holding db/historical_data.db,
+    which is where ProFootballReference reads from. Uses a synthetic history unless
+    `path` points at an existing database, which is copied in instead.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "db", "historical_data.db")
+        if path is not None:
+            os.makedirs(os.path.dirname(target))
+            shutil.copyfile(path, target)
+        else:
+            write_database(target, *make_history(seasons, num_teams, seed = seed))
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(cwd)
@@ -0,0 +1,126 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+
+class ExperimentIndex:
+	"""
+	In-memory index over one agent's rows of the result table, for the planner tools.
+
+	Experiments are numbered in the order they were saved and every feature keeps a
+	bitset (a Python int) of the experiments that used it, alongside per-experiment
+	model names and metrics. Usage counts are kept per feature and model as rows are
+	indexed, and the experiments with or without a feature are bitset operations, so
+	a tool call doesn't read or JSON-decode the agent's history. Rows are read from
+	the database once: on first use, then only the rows saved since (see refresh_loaded).
+	"""
+	__cache = {}
+	__cache_lock = threading.Lock()
+
+	def __init__(self, db_path, agent_id):
+		self.db_path = db_path
+		self.agent_id = agent_id
+		self.last_id = 0
+		self.ids = []
+		self.model_names = []
+		self.metrics = { 'mean_absolute_error': [], 'test_accuracy': [] }
+		self.features = {}
+		self.usage = {}
+		# Experiments with a features_used list, the only ones `NOT LIKE` can match
+		self.described = 0
+		self.lock = threading.Lock()
+
+	@classmethod
+	def for_agent(cls, db_path, agent_id):
+		"""
+		Returns the index of the agent's results in `db_path`, reading them on first use.
+		ResultsDB.save_plan_results refreshes loaded indexes, so later calls don't read.
+		"""
+		key = (os.path.abspath(db_path), agent_id)
+		with cls.__cache_lock:
+			index = cls.__cache.get(key)
+			if index is not None:
+				return index
+			index = cls.__cache[key] = cls(db_path, agent_id)
+			return index.refresh()
+
+	@classmethod
+	def refresh_loaded(cls, db_path):
+		"""Indexes the rows saved since the last refresh in every loaded index of `db_path`."""
+		path = os.path.abspath(db_path)
+		with cls.__cache_lock:
+			indexes = [index for (db, _), index in cls.__cache.items() if db == path]
+		for index in indexes:
+			index.refresh()
+
+	def __len__(self):
+		return len(self.ids)
+
+	def refresh(self):
+		"""Indexes the agent's rows saved since the last refresh, a read of the new rows only."""
+		with self.lock:
+			with open("queries/get_experiment_index.sql") as f:
+				query = f.read()
+			conn = sqlite3.connect(self.db_path)
+			try:
+				rows = conn.execute(query, (self.last_id, self.agent_id)).fetchall()
+			finally:
+				conn.close()
+			for row in rows:
+				self.__add(*row)
+		return self
+
+	def __add(self, row_id, model_name, features_used, mean_absolute_error, test_accuracy):
+		position = len(self.ids)
+		bit = 1 << position
+		self.ids.append(row_id)
+		self.last_id = row_id
+		self.model_names.append(model_name)
+		self.metrics['mean_absolute_error'].append(mean_absolute_error)
+		self.metrics['test_accuracy'].append(test_accuracy)
+		if features_used is None:
+			return
+		self.described |= bit
+		for feature in json.loads(features_used):
+			self.features[feature] = self.features.get(feature, 0) | bit
+			counts = self.usage.setdefault(feature, {})
+			counts[model_name] = counts.get(model_name, 0) + 1
+
+	def feature_usage(self, features, models):
+		"""{ feature: { model: experiments } } for `features` and `models`, plus any others used."""
+		with self.lock:
+			usage = { feature: { model: 0 for model in models } for feature in features }
+			for feature, counts in self.usage.items():
+				usage.setdefault(feature, { model: 0 for model in models }).update(counts)
+			return usage
+
+	def experiments_with_feature(self, feature, limit=25):
+		"""
+		(with, without): the latest `limit` experiments whose features_used does and
+		doesn't match `feature`, newest first, as dicts with model_name,
+		mean_absolute_error and test_accuracy. A feature matches like the result
+		table's `features_used LIKE '%feature%'`, the union of the features it matches.
+		"""
+		pattern = re.compile("".join(
+			"." if c == "_" else ".*" if c == "%" else re.escape(c) for c in feature
+		), re.IGNORECASE | re.ASCII | re.DOTALL)
+		with self.lock:
+			with_bits = 0
+			for name, bits in self.features.items():
+				if pattern.search(name):
+					with_bits |= bits
+			without_bits = self.described & ~with_bits
+			return self.__experiments(with_bits, limit), self.__experiments(without_bits, limit)
+
+	def __experiments(self, bits, limit):
+		experiments = []
+		while bits and len(experiments) < limit:
+			position = bits.bit_length() - 1
+			bits ^= 1 << position
+			experiments.append({
+				'model_name': self.model_names[position],
+				'mean_absolute_error': self.metrics['mean_absolute_error'][position],
+				'test_accuracy': self.metrics['test_accuracy'][position]
+			})
+		return experiments
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from data_sources.FrameCache import FrameCache
+
+class FeatureIndex:
+	"""
+	Column-position index over the numeric columns of an aggregates frame.
+
+	Holds one contiguous 2-D copy of the numeric data plus a packed non-null bitmap
+	per column, so a feature subset's rows and valid-row mask can be assembled with
+	a bitwise AND and a single take instead of `frame[columns].copy().dropna()`.
+	Cached per frame with FrameCache.
+	"""
+	__cache = FrameCache()
+
+	def __init__(self, frame, dtype=np.float64):
+		numeric = frame.select_dtypes(include=[np.number, 'bool'])
+		self.columns = list(numeric.columns)
+		self.positions = { col: i for i, col in enumerate(self.columns) }
+		self.index = frame.index
+		self.num_rows = len(frame)
+
+		# Column-major so a feature subset is a contiguous take of whole columns
+		self.values = np.ascontiguousarray(numeric.to_numpy(dtype=dtype, na_value=np.nan).T)
+
+		# One packed bit per row for each column, set when the value is not null
+		self.bitmap = np.packbits(~np.isnan(self.values), axis=1)
+
+	@classmethod
+	def for_frame(cls, frame):
+		"""Returns the cached index for `frame`, building it on first use."""
+		return cls.__cache.get(frame, lambda: cls.__build(frame))
+
+	@classmethod
+	def __build(cls, frame):
+		# Compact frames (all float columns already float32) keep a float32 block
+		float_dtypes = set(frame.select_dtypes(include=['floating']).dtypes)
+		dtype = np.float32 if float_dtypes == { np.dtype(np.float32) } else np.float64
+		return cls(frame, dtype)
+
+	def has_columns(self, columns):
+		return all(col in self.positions for col in columns)
+
+	def valid_rows(self, columns):
+		"""Boolean mask of rows where every one of `columns` is non-null."""
+		positions = [self.positions[col] for col in columns]
+		packed = np.bitwise_and.reduce(self.bitmap[positions], axis=0)
+		return np.unpackbits(packed, count=self.num_rows).astype(bool)
+
+	def take(self, columns):
+		"""Returns the (rows x columns) values of `columns` for valid rows, and the valid-row positions."""
+		mask = self.valid_rows(columns)
+		positions = [self.positions[col] for col in columns]
+		return self.values.take(positions, axis=0)[:, mask].T, np.flatnonzero(mask)
+
+	def frame(self, columns):
+		"""
+		Equivalent of `frame[columns].copy().dropna()` built from the index.
+		Every column comes back as the index dtype, so integer columns become floats.
+		"""
+		values, rows = self.take(columns)
+		return pd.DataFrame(values, index=self.index[rows], columns=columns)
@@ -0,0 +1,41 @@
+import weakref
+import threading
+
+class FrameCache:
+	"""
+	One cached value per live aggregates frame, for the per-frame indexes and engines.
+
+	Entries are keyed by the frame's id and hold the frame itself only weakly, so an
+	entry is dropped as soon as its frame is garbage collected. Cached values must not
+	reference the frame (a FeatureIndex or another engine is fine, neither holds it).
+	The values are built from the frame's data on first use, so a frame must not be
+	mutated after it has been looked up.
+	"""
+	def __init__(self):
+		self.entries = {}
+		# Reentrant, a frame can be collected (and its entry dropped) while the lock is held
+		self.lock = threading.RLock()
+
+	def get(self, frame, build):
+		"""The value cached for `frame`, calling build() on first use."""
+		key = id(frame)
+		with self.lock:
+			cached = self.entries.get(key)
+			if cached is not None and cached[0]() is frame:
+				return cached[1]
+
+		value = build()
+		with self.lock:
+			self.entries[key] = (weakref.ref(frame, lambda ref: self.__drop(key, ref)), value)
+		return value
+
+	def __drop(self, key, ref):
+		with self.lock:
+			cached = self.entries.get(key)
+			# The id may already belong to a newer frame
+			if cached is not None and cached[0] is ref:
+				del self.entries[key]
+
+	def __len__(self):
+		with self.lock:
+			return len(self.entries)
@@ -1,41 +1,14 @@
 import json
 import sqlite3
 from datetime import datetime
+from data_sources.ExperimentIndex import ExperimentIndex
 
 class ResultsDB:
     def __init__(self, db_path):
         self.db_path = db_path
     
     def save_best_result(self, best, features_used):
-        model_name = best["model_name"]
-
-        set_statements = ""
-        set_statements += f"target = {self.sql_string(best['target'])},\n"
-        set_statements += f"\ttrain_time_in_seconds = {self.sql_value(best['train_time_in_seconds'])},\n"
-        set_statements += f"\tfeatures_used = {self.sql_json(features_used)},\n"
-        set_statements += f"\tmean_absolute_error = {self.sql_value(best.get('mean_absolute_error'))},\n"
-        set_statements += f"\troot_mean_squared_error = {self.sql_value(best.get('root_mean_squared_error'))},\n"
-        set_statements += f"\ttrain_accuracy = {self.sql_value(best.get('train_accuracy'))},\n"
-        set_statements += f"\ttest_accuracy = {self.sql_value(best.get('test_accuracy'))},\n"
-        set_statements += f"\tfeature_importance = {self.sql_json(best.get('feature_importance'))},\n"
-        set_statements += f"\tfeature_coefficients = {self.sql_json(best.get('feature_coefficients'))},\n"
-        set_statements += f"\tconfidence_intervals = {self.sql_json(best.get('confidence_intervals'))},\n"
-        set_statements += f"\tagent_id = { self.sql_string(best["agent_id"]) },\n"
-        set_statements += f"\tlast_updated = CURRENT_TIMESTAMP\n"
-
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-
-        with open('queries/update_best_result.sql', 'r') as f:
-            template = f.read()
-            query = template.format(
-                set_statements = set_statements,
-                model_name = model_name
-            )
-
-        cur.execute(query)
-        conn.commit()
-        conn.close()
+        self.save_plan_results([], [(best, features_used)])
     
     def insert_best_results_from_json(self):
         with open("results/feature_optimization_results.json", "r") as f:
@@ -111,7 +84,7 @@ class ResultsDB:
             if result.get('test_accuracy') is not None:
                 result['test_accuracy'] = float(result['test_accuracy'])
             
-            for json_field in ['features_used', 'feature_importance', 'feature_coefficients', 'confidence_intervals']:
+            for json_field in ['features_used', 'feature_importance', 'feature_coefficients', 'confidence_intervals', 'hyperparameters']:
                 if result.get(json_field):
                     result[json_field] = json.loads(result[json_field])
             
@@ -120,30 +93,137 @@ class ResultsDB:
         return best_results
 
     def save_result(self, result, features_used):
+        self.save_plan_results([(result, features_used)])
+
+    def save_plan_results(self, results, best_results=()):
+        """
+        Inserts a plan's results and applies its best-result updates, both lists of
+        (result, features_used), in one transaction with bound parameters. Updates are
+        applied in order, so a model improved twice in a plan keeps the last one.
+        """
+        with open("queries/insert_results.sql") as f:
+            insert_query = f.read()
+        with open("queries/update_best_results.sql") as f:
+            update_query = f.read()
+        rows = [(result["model_name"], *self.result_values(result, features_used)) for result, features_used in results]
+        updates = [(*self.result_values(best, features_used), best["model_name"]) for best, features_used in best_results]
 
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                cur = conn.cursor()
+                cur.executemany(insert_query, rows)
+                cur.executemany(update_query, updates)
+        finally:
+            conn.close()
+        ExperimentIndex.refresh_loaded(self.db_path)
+
+    def result_values(self, result, features_used):
+        """A result's bound values, in the column order of insert_results.sql after model_name."""
+        return (
+            result["target"],
+            self.bind_value(result["train_time_in_seconds"]),
+            self.bind_json(features_used),
+            self.bind_value(result.get("mean_absolute_error")),
+            self.bind_value(result.get("root_mean_squared_error")),
+            self.bind_value(result.get("train_accuracy")),
+            self.bind_value(result.get("test_accuracy")),
+            self.bind_json(result.get("feature_importance")),
+            self.bind_json(result.get("feature_coefficients")),
+            self.bind_json(result.get("confidence_intervals")),
+            result["agent_id"],
+            self.bind_json(result.get("hyperparameters"))
+        )
+
+    def bind_value(self, val):
+        """Convert Python value to a bound parameter, as sql_value would write it"""
+        if val is None or val == "NULL":
+            return None
+        # sqlite3 can't bind numpy scalars
+        return val.item() if hasattr(val, "item") else val
+
+    def bind_json(self, val):
+        """Convert Python value to a bound JSON string or NULL"""
+        if val is None:
+            return None
+        return json.dumps(val)
+    
+    def ensure_hyperparameters_column(self):
+        """Adds the hyperparameters column to result tables created before it existed."""
         conn = sqlite3.connect(self.db_path)
         cur = conn.cursor()
+        for table in ['result', 'best_result']:
+            columns = [row[1] for row in cur.execute(f"PRAGMA table_info({ table })").fetchall()]
+            if columns and 'hyperparameters' not in columns:
+                cur.execute(f"ALTER TABLE { table } ADD COLUMN hyperparameters TEXT")
+        conn.commit()
+        conn.close()
 
-        values = f"\t{ self.sql_string(result['model_name']) }, { self.sql_string(result['target']) }, { self.sql_value(result['train_time_in_seconds']) }, "
-        values += f"{ self.sql_json(features_used) }, { self.sql_value(result.get('mean_absolute_error')) }, "
-        values += f"{ self.sql_value(result.get('root_mean_squared_error')) }, { self.sql_value(result.get('train_accuracy')) }, "
-        values += f"{ self.sql_value(result.get('test_accuracy')) }, "
-        values += f"{ self.sql_json(result.get('feature_importance')) }, "
-        values += f"{ self.sql_json(result.get('feature_coefficients')) }, "
-        values += f"{ self.sql_json(result.get('confidence_intervals')) }, "
-        values += f"{ self.sql_string(result['agent_id']) }"
-            
-        with open("queries/insert_result.sql") as f:
-            template = f.read()
-            query = template.format(
-                table = "result",
-                values = values
-            )   
-        cur.execute(query)
+    def save_node_metrics(self, metrics):
+        """Inserts node invocation metrics (see utils.instrumentation), creating the table if needed."""
+        with open("queries/create_node_metric.sql") as f:
+            create_query = f.read()
+        with open("queries/insert_node_metric.sql") as f:
+            insert_query = f.read()
+        rows = [
+            (
+                metric["agent_id"], metric["graph"], metric["node"],
+                metric["wall_time_in_seconds"], metric["cpu_time_in_seconds"],
+                metric["peak_rss_mb"], metric["rss_growth_mb"],
+                metric["llm_tokens"], metric["error"]
+            )
+            for metric in metrics
+        ]
+        conn = sqlite3.connect(self.db_path)
+        cur = conn.cursor()
+        cur.execute(create_query)
+        cur.executemany(insert_query, rows)
         conn.commit()
-        
         conn.close()
-    
+
+    def load_node_metrics(self, agent_id):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        with open("queries/create_node_metric.sql") as f:
+            cur.execute(f.read())
+        cur.execute("SELECT * FROM node_metric WHERE agent_id = ? ORDER BY id", (agent_id,))
+        metrics = [dict(row) for row in cur.fetchall()]
+        conn.close()
+        return metrics
+
+    def save_backtest_results(self, backtest_id, results):
+        """Inserts per-game walk-forward backtest rows (see prediction_models.WalkForwardBacktest), creating the table if needed."""
+        with open("queries/create_backtest.sql") as f:
+            create_query = f.read()
+        with open("queries/insert_backtest.sql") as f:
+            insert_query = f.read()
+        columns = [
+            "model_name", "target", "season", "week", "event_id", "home_team", "away_team",
+            "actual", "prediction", "confidence", "predicted_home_win", "home_win", "correct",
+            "absolute_error", "train_rows", "trained_through", "features_used", "hyperparameters"
+        ]
+        # Plain Python values, sqlite3 can't bind numpy scalars
+        records = results[columns].astype(object).where(results[columns].notna(), None)
+        rows = [(backtest_id, *record) for record in records.itertuples(index=False, name=None)]
+        conn = sqlite3.connect(self.db_path)
+        cur = conn.cursor()
+        cur.execute(create_query)
+        cur.executemany(insert_query, rows)
+        conn.commit()
+        conn.close()
+
+    def load_backtest_results(self, backtest_id):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        with open("queries/create_backtest.sql") as f:
+            cur.execute(f.read())
+        cur.execute("SELECT * FROM backtest WHERE backtest_id = ? ORDER BY id", (backtest_id,))
+        results = [dict(row) for row in cur.fetchall()]
+        conn.close()
+        return results
+
     def set_agent_completion(self, agent_id):
         with open("queries/set_agent_completion.sql") as f:
             template = f.read()
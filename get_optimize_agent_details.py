@@ -1,4 +1,5 @@
 from utils.features import calculate_feature_effects, get_extended_features
+from prediction_models.ModelPlugins import ModelPlugins
 import sqlite3
 import json
 
@@ -34,13 +35,7 @@ def get_feature_usage(agent_id, db_path):
 
     usage = {}
     for feature in get_extended_features():
-        usage[feature] = {
-            'XGBoost': 0,
-            'LinearRegression': 0,
-            'RandomForest': 0,
-            'LogisticRegression': 0,
-            'KNearest': 0
-        }
+        usage[feature] = { model: 0 for model in ModelPlugins.names() }
         
     result = query_database(query, db_path)
     
@@ -13,6 +13,9 @@ from nodes.analyzer_caller import analyzer_caller_node as caller
 from nodes.analyzer_progressor import analyzer_progressor_node as progressor
 from nodes.analyzer_validator import analyzer_validator_node as validator
 
+# Utils
+from utils.instrumentation import instrument
+
 print("Starting Analyzer app...\n")
 
 # INSTANTIATE THE GRAPH PULLING OVER SHARED KEYS FROM OptimizeState
@@ -33,10 +36,10 @@ def is_validated(state: AnalyzerState) -> AnalyzerState:
     return "continue"
     
 # NODE DEFINITIONS
-analyzer.add_node("setup", setup)
-analyzer.add_node("caller", caller)
-analyzer.add_node("validator", validator)
-analyzer.add_node("progressor", progressor)
+analyzer.add_node("setup", instrument("analyzer", "setup", setup))
+analyzer.add_node("caller", instrument("analyzer", "caller", caller))
+analyzer.add_node("validator", instrument("analyzer", "validator", validator))
+analyzer.add_node("progressor", instrument("analyzer", "progressor", progressor))
 
 # EDGE DEFINITIONS
 analyzer.add_edge(START, "setup")
@@ -61,5 +64,4 @@ analyzer.add_conditional_edges(
 )
 
 # COMPILE THE GRAPH
-analyzer_graph = analyzer.compile()
-analyzer_graph.get_graph().draw_mermaid_png(output_file_path="graphs/images/planner_graph.png")
\ No newline at end of file
+analyzer_graph = analyzer.compile()
\ No newline at end of file
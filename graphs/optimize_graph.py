@@ -3,7 +3,6 @@ import os
 
 # LangChain + LangGraph Libraries
 from langgraph.graph import StateGraph, START, END
-from langchain_core.runnables.graph import CurveStyle, MermaidDrawMethod, NodeStyles
 
 
 # Models
@@ -18,6 +17,7 @@ from nodes.optimize_trainer import optimize_trainer as trainer
 from graphs.planner_graph import planner_graph as planner
 
 # Utils
+from utils.instrumentation import instrument
 from utils.formatting import formatting
 from utils.logger import log
 
@@ -46,10 +46,10 @@ def is_optimization_complete(state: OptimizeState) -> OptimizeState:
     return "continue"
 
 # NODE DEFINITIONS
-graph.add_node("setup", setup)
+graph.add_node("setup", instrument("optimize", "setup", setup))
 graph.add_node("planner", planner)
-graph.add_node("progressor", progressor)
-graph.add_node("trainer", trainer)
+graph.add_node("progressor", instrument("optimize", "progressor", progressor))
+graph.add_node("trainer", instrument("optimize", "trainer", trainer))
 
 # EDGE DEFINITIONS
 graph.add_edge(START, "setup")
@@ -66,5 +66,4 @@ graph.add_conditional_edges(
 )
 
 # COMPILE THE GRAPH
-app = graph.compile()
-app.get_graph(xray=True).draw_mermaid_png(output_file_path="graphs/images/optimize_graph.png")
\ No newline at end of file
+app = graph.compile()
\ No newline at end of file
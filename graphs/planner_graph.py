@@ -14,6 +14,10 @@ from nodes.planner_caller import planner_caller_node as caller
 from nodes.planner_validator import planner_validator_node as validator
 from nodes.planner_progressor import planner_progressor_node as progressor
 from nodes.planner_judge import planner_judge_node as judge
+from nodes.planner_local import planner_local_node as local
+
+# Utils
+from utils.instrumentation import instrument
 
 print("Starting Planner app...\n")
 
@@ -21,6 +25,10 @@ print("Starting Planner app...\n")
 planner = StateGraph(PlannerState)
 
 # CONDITIONAL EDGE DEFINITIONS
+def planner_backend(state: PlannerState):
+    if state["phase"] in state.get("local_planner_strategies", {}):
+        return "local"
+    return "llm"
 
 def valid_and_judged(state: PlannerState):
     if (state["validated"] and state["judged"]) or (state["validated"] and state["phase"] == 1):
@@ -41,15 +49,24 @@ def has_been_judged(state: PlannerState):
     return "continue"
 
 # NODE DEFINITIONS
-planner.add_node("setup", setup)
-planner.add_node("caller", caller)
-planner.add_node("validator", validator)
-planner.add_node("judge", judge)
-planner.add_node("progressor", progressor)
+planner.add_node("setup", instrument("planner", "setup", setup))
+planner.add_node("caller", instrument("planner", "caller", caller))
+planner.add_node("validator", instrument("planner", "validator", validator))
+planner.add_node("judge", instrument("planner", "judge", judge))
+planner.add_node("progressor", instrument("planner", "progressor", progressor))
+planner.add_node("local", instrument("planner", "local", local))
 
 # EDGE DEFINITIONS
 planner.add_edge(START, "setup")
-planner.add_edge("setup", "caller")
+planner.add_conditional_edges(
+    "setup",
+    planner_backend,
+    {
+        "local": "local",
+        "llm": "caller"
+    }
+)
+planner.add_edge("local", "progressor")
 planner.add_edge("caller", "validator")
 planner.add_conditional_edges(
     "validator",
@@ -64,5 +81,4 @@ planner.add_edge("judge", "caller")
 planner.add_edge("progressor", END)
 
 # COMPILE THE GRAPH
-planner_graph = planner.compile()
-planner_graph.get_graph().draw_mermaid_png(output_file_path="graphs/images/planner_graph.png")
\ No newline at end of file
+planner_graph = planner.compile()
\ No newline at end of file
@@ -19,6 +19,9 @@ from nodes.predict_predictor import predict_predictor_node as predictor
 # Graphs
 from graphs.analyzer_graph import analyzer_graph as analyzer
 
+# Utils
+from utils.instrumentation import instrument
+
 print("Starting Predictor app...\n")
 
 # INSTANTIATE THE GRAPH PULLING OVER SHARED KEYS FROM OptimizeState
@@ -26,9 +29,9 @@ predict = StateGraph(PredictState)
 
 
 # NODE DEFINITIONS
-predict.add_node("setup", setup)
-predict.add_node("aggregate_loader", aggregate_loader)
-predict.add_node("predictor", predictor)
+predict.add_node("setup", instrument("predict", "setup", setup))
+predict.add_node("aggregate_loader", instrument("predict", "aggregate_loader", aggregate_loader))
+predict.add_node("predictor", instrument("predict", "predictor", predictor))
 predict.add_node("analyzer", analyzer)
 #predict.add_node("injury_reporter", injury_reporter)
 #predict.add_node("injury_adjuster", injury_adjuster)
@@ -61,5 +64,4 @@ predict.add_edge("predictor", "analyzer")
 predict.add_edge("analyzer", END)
 
 # COMPILE THE GRAPH
-predict_graph = predict.compile()
-predict_graph.get_graph().draw_mermaid_png(output_file_path="graphs/images/predict_graph.png")
\ No newline at end of file
+predict_graph = predict.compile()
\ No newline at end of file
@@ -8,14 +8,17 @@ from models.scrape_model import ScrapeState
 from nodes.scrape_setup import scrape_setup_node as setup
 from nodes.load_history_from_pfr import load_history_from_pfr as load
 
+# Utils
+from utils.instrumentation import instrument
+
 print("Starting app...\n")
 
 # INSTANTIATE THE GRAPH
 graph = StateGraph(ScrapeState)
 
 # NODE DEFINITIONS
-graph.add_node("setup", setup)
-graph.add_node("load", load)
+graph.add_node("setup", instrument("scrape", "setup", setup))
+graph.add_node("load", instrument("scrape", "load", load))
 
 # EDGE DEFINITIONS
 graph.add_edge(START, "setup")
@@ -23,5 +26,4 @@ graph.add_edge("setup", "load")
 graph.add_edge("load", END)
 
 # COMPILE THE GRAPH
-app = graph.compile()
-app.get_graph().draw_mermaid_png(output_file_path="graphs/images/scrape_graph.png")
\ No newline at end of file
+app = graph.compile()
\ No newline at end of file
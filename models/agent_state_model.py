@@ -8,4 +8,5 @@ class AgentState(TypedDict):
     db_path: str # Path to the database file
     home_path: str
     llm_base_url: str
-    llm_model: str
\ No newline at end of file
+    llm_model: str
+    compact_aggregates: bool # Load DataAggregate in its compact float32 / categorical form
\ No newline at end of file
@@ -1,8 +1,11 @@
 # External Libraries
-from typing import List
+from typing import List, Optional
 
 # Models
-from pydantic import BaseModel, Field, field_validator, ValidationError
+from pydantic import BaseModel, Field, field_validator, model_validator, ValidationError
+
+# Prediction Models
+from prediction_models.ModelPlugins import ModelPlugins
 
 # Utilities
 from utils.features import get_extended_features
@@ -14,14 +17,40 @@ class Experiment(BaseModel):
     experiment_number: int = Field(..., description = "Represents the experiment number from 1 to 10, to help in counting a valid number of experiments has been planned")
     model: str = Field(..., description = "The name of the ML model to use")
     features: list[str] = Field(..., description = "The features to be used")
+    hyperparameters: Optional[dict] = Field(None, description = "Optional model hyperparameters, only the ones the model accepts, the model defaults are used when omitted")
+    half_life: Optional[float] = Field(None, description = "Optional half-life in seasons of the recency sample weights, older games count less the shorter it is, 6 when omitted")
+    half_life_sweep: Optional[list[float]] = Field(None, description = "Optional half-lives to also score in the same experiment, their test metrics are reported in half_life_sweep")
 
     @field_validator('model')
     @classmethod
     def validate_model(cls, v):
-        if v not in ['XGBoost', 'LinearRegression', 'RandomForest', 'LogisticRegression', 'KNearest']:
+        if v not in ModelPlugins.names():
             raise ValueError(f"Invalid model: { v }")
         return v
     
+    @field_validator('half_life')
+    @classmethod
+    def validate_half_life(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError(f"half_life must be positive, got { v }")
+        return v
+
+    @field_validator('half_life_sweep')
+    @classmethod
+    def validate_half_life_sweep(cls, v):
+        if v is not None and any(half_life <= 0 for half_life in v):
+            raise ValueError(f"Every half_life_sweep value must be positive, got { v }")
+        return v
+
+    @model_validator(mode = 'after')
+    def validate_hyperparameters(self):
+        # half_life and half_life_sweep are merged into the hyperparameters, so models without sample weights reject them too
+        planned = { **(self.hyperparameters or {}), **{ name: value for name, value in [('half_life', self.half_life), ('half_life_sweep', self.half_life_sweep)] if value is not None } }
+        _, rejected = ModelPlugins.check_hyperparameters(self.model, planned)
+        if rejected:
+            raise ValueError(f"{ self.model } does not accept the hyperparameters { rejected }. Only use: { ModelPlugins.hyperparameters(self.model) }")
+        return self
+
     @field_validator('features')
     @classmethod
     def validate_features(cls, v):
@@ -26,4 +26,9 @@ class OptimizeState(AgentState):
     aggregates: pd.DataFrame
     upcoming_games: pd.DataFrame
     prediction_set: pd.DataFrame
-    total_tokens: int
\ No newline at end of file
+    total_tokens: int
+    local_planner_strategies: dict[int, str] # Phase number -> local search strategy, phases not listed use the LLM
+    local_planner_memory: dict # Progress of each local search strategy between planner runs
+    local_batch_size: int # Number of experiments per plan when planning locally
+    evaluation: dict # How experiments are scored, see PredictionModel.default_evaluation
+    batch_summary: dict # Experiments, batches, seconds and data prep seconds saved for the last plan, see ExperimentBatch
\ No newline at end of file
@@ -7,7 +7,6 @@ from models.agent_state_model import AgentState
 # LangGraph / LangChain
 from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage
-from langchain_nvidia_ai_endpoints import ChatNVIDIA
 
 class PlannerState(AgentState):
     planner_agent_id: str
@@ -37,3 +36,9 @@ class PlannerState(AgentState):
     total_tokens: int
     best_results_found: list[dict] # List of all Best Results that have been identified in this run
     total_error_count: int
+    prediction_models: list[dict]
+    extended_features: list[str]
+    historical_results: list
+    local_planner_strategies: dict[int, str] # Phase number -> local search strategy, phases not listed use the LLM
+    local_planner_memory: dict # Progress of each local search strategy between planner runs
+    local_batch_size: int
@@ -32,3 +32,6 @@ class PredictState(AgentState):
     transcription_summary_tokens: int
     final_analysis: list
     game_index: int
+    retrain_models: bool # Skip the fitted model registry and retrain every best model
+    multi_target: bool # Only fit the spread models, their win probabilities stand in for the classifiers
+    stack_models: bool # Also blend the best models' predictions with a ModelStack
@@ -5,11 +5,8 @@ import json
 import uuid
 
 # LangGraph / LangChain
-from langchain_nvidia_ai_endpoints import ChatNVIDIA
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
 from langchain.tools import tool
-from langchain.agents import create_agent
 
 # Models
 from models.analyzer_model import AnalyzerState
@@ -60,6 +57,10 @@ def run_select_query(sql: str):
 
 
 def analyzer_caller_node(state: AnalyzerState) -> AnalyzerState:
+    # The LLM client and agent runtime are only loaded when the LLM is actually called
+    from langchain_nvidia_ai_endpoints import ChatNVIDIA
+    from langchain.agents import create_agent
+
     global db_path
     db_path = state["db_path"]
     llm = ChatNVIDIA(
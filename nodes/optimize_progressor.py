@@ -45,9 +45,7 @@ def is_best_result(result, best_results):
     
     return is_best
 
-def set_best_result(result, best_results, features_used, db_path):
-    rdb = ResultsDB(db_path)
-    rdb.save_best_result(result, features_used)
+def set_best_result(result, best_results, features_used):
     new_best_results = []
     for best in best_results:
         if not result["model_name"] == best["model_name"]:
@@ -71,15 +69,17 @@ def optimize_progressor(state: OptimizeState) -> OptimizeState:
 
     id = uuid.uuid4()
     
-    # Validate best results
-    rdb = ResultsDB(state["db_path"])
+    # Validate best results, then write the plan's results and best-result updates in one transaction
+    plan_results = []
+    best_updates = []
     for result in state["last_results"]:
         result["result"]["agent_id"] = state["agent_id"]
-        rdb.save_result(result["result"], result["features_used"])
+        plan_results.append((result["result"], result["features_used"]))
         if is_best_result(result["result"], state["best_results"]):
             state["best_results_found"].append(result["result"])
-            state["best_results"] = set_best_result(result["result"], state["best_results"], result["features_used"], state["db_path"])
-
+            best_updates.append((result["result"], result["features_used"]))
+            state["best_results"] = set_best_result(result["result"], state["best_results"], result["features_used"])
+    ResultsDB(state["db_path"]).save_plan_results(plan_results, best_updates)
 
     # Reset some variables
     state["last_results"] = []
@@ -94,6 +94,9 @@ def optimize_progressor(state: OptimizeState) -> OptimizeState:
     lines.append(f"Best results updated { len(state["best_results_found"]) } times")
     lines.append(f"{ state["total_error_count"] } validation errors identified")
     lines.append(f"Total tokens so far: { state["total_tokens"]}")
+    batch_summary = state.get("batch_summary")
+    if batch_summary:
+        lines.append(f"Last plan: { batch_summary["experiments"] } experiments in { batch_summary["groups"] } batches, trained in { batch_summary["seconds"] }s, up to { batch_summary["saved_seconds"] }s of data prep saved by batching")
     lines.append(f"{'='*80}\n")
 
     log(log_path, "\n".join(lines), log_type, this_filename)
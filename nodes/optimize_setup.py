@@ -3,7 +3,6 @@ from dotenv import load_dotenv
 import os
 import datetime
 import uuid
-import argparse
 import sys
 from pathlib import Path
 import time
@@ -16,9 +15,13 @@ from data_sources.ResultsDB import ResultsDB
 # Internal Models
 from models.optimize_model import OptimizeState
 
+# Prediction Models
+from prediction_models.ModelPlugins import ModelPlugins
+
 # Utilities
 from utils.logger import log
 from utils.features import get_extended_features
+from utils.arguments import optimize_arguments
 
 load_dotenv()
 this_filename = os.path.basename(__file__).replace(".py","")
@@ -28,6 +31,10 @@ this_filename = os.path.basename(__file__).replace(".py","")
 
 def optimize_setup_node(state: OptimizeState) -> OptimizeState:
     state["start"] = time.time()
+
+    # Parse Arguments before recording the run, invalid --local_planner values exit here
+    args = optimize_arguments().parse_args()
+
     # Set the agent ID
     state["agent_id"] = str(uuid.uuid4())
 
@@ -46,12 +53,16 @@ def optimize_setup_node(state: OptimizeState) -> OptimizeState:
         conn.commit()
         conn.close()
 
-
-    # Parse Arguments
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--debug", action = "store_true", help = "verbose printing of logs to stdout (not just logfile)")
-    parser.add_argument("--max_experiments", type = int, default = 500, help = "max number of experiments to run, default is 500")
-    args = parser.parse_args()
+    # Which phases skip the LLM?
+    state["local_planner_strategies"] = dict(args.local_planner)
+    state["local_planner_memory"] = {}
+    state["local_batch_size"] = args.local_batch_size
+    state["compact_aggregates"] = args.compact
+    state["evaluation"] = {
+        "mode": args.evaluation,
+        "folds": args.cv_folds,
+        "jobs": args.cv_jobs
+    }
     
     # Print logs to console?
     if args.debug:
@@ -70,39 +81,19 @@ def optimize_setup_node(state: OptimizeState) -> OptimizeState:
     # Generate log_file name
     now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     script = sys.argv[0].replace(".py", "")
-    state["log_path"] = f"logs/{ script }/{ now }_{ state["agent_id"] }.txt"
+    state["log_path"] = f"logs/{ script }/{ now }_{ state["agent_id"] }.jsonl"
     log(state["log_path"], "Setting up...\n", state["log_type"], this_filename)
     
     # Load best current best feature results
     rdb = ResultsDB(state["db_path"])
+    rdb.ensure_hyperparameters_column()
     state["best_results"] = rdb.load_best_results()
     
     #with open('results/feature_optimization_results.json', 'r') as f:
     #    state["best_results"] = json.load(f)['best_results']
 
     # Load the list of relevant models
-    state["prediction_models"] = [
-        {
-            "name": "XGBoost",
-            "type": "regressor"
-        },
-        {
-            "name": "LinearRegression",
-            "type": "regressor"
-        },
-        {
-            "name": "RandomForest",
-            "type": "regressor"
-        },
-        {
-            "name": "LogisticRegression",
-            "type": "classifier"
-        },
-        {
-            "name": "KNearest",
-            "type": "classifier"
-        }
-    ]
+    state["prediction_models"] = ModelPlugins.describe()
 
     # Load all of the extendeded features
     state["extended_features"] = get_extended_features()
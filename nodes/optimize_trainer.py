@@ -4,16 +4,12 @@ import os
 # Data Sources
 from data_sources.DataAggregate import DataAggregate
 
-# Prediction Models
-from prediction_models.XGBoost import XGBoost
-from prediction_models.LinearRegression import LinearRegression
-from prediction_models.RandomForest import RandomForest
-from prediction_models.LogisticRegression import LogisticRegression
-from prediction_models.KNearest import KNearest
-
 # Models
 from models.optimize_model import OptimizeState
 
+# Prediction Models
+from prediction_models.ModelPlugins import ModelPlugins
+
 # Utilities
 from utils.logger import log
 
@@ -23,30 +19,31 @@ log_path = None
 log_type = None
 db_path = None
 
-def evaluate_model_with_features(aggregates, model_name, feature_list, prediction_set):	
-	if(model_name == 'XGBoost'):
-		model = XGBoost(aggregates, 'point_differential', feature_list, prediction_set)
-	
-	elif(model_name == 'LinearRegression'):
-		model = LinearRegression(aggregates, 'point_differential', feature_list, prediction_set)
-	
-	elif(model_name == 'RandomForest'):
-		model = RandomForest(aggregates, 'point_differential', feature_list, prediction_set)
-	
-	elif(model_name == 'LogisticRegression'):
-		model = LogisticRegression(aggregates, 'win', feature_list, prediction_set)
-	
-	elif(model_name == 'KNearest'):
-		model = KNearest(aggregates, 'win', feature_list, prediction_set)
-	
+def evaluate_model_with_features(aggregates, model_name, feature_list, prediction_set, hyperparameters=None, train_fraction=1.0, refit=True, evaluation=None):
+	# Prediction models pull in xgboost and scikit-learn, so ModelPlugins loads them on first use
+	options = { 'hyperparameters': hyperparameters, 'train_fraction': train_fraction, 'refit': refit, 'evaluation': evaluation }
+	model = ModelPlugins.build(model_name, aggregates, feature_list, prediction_set, **options)
 	return model.model_output
 
+def experiment_hyperparameters(experiment):
+	# The sample weight settings travel with the hyperparameters, so best results and the models fit from them keep them
+	hyperparameters = dict(experiment.get('hyperparameters') or {})
+	for name in ['half_life', 'half_life_sweep']:
+		if experiment.get(name) is not None:
+			hyperparameters[name] = experiment[name]
+
+	# Plans are validated against the same list, but an unknown key would abort the run in the estimator's constructor
+	hyperparameters, rejected = ModelPlugins.check_hyperparameters(experiment['model'], hyperparameters)
+	if rejected:
+		log(log_path, f"Dropped hyperparameters { rejected } from a { experiment['model'] } experiment, it only accepts { ModelPlugins.hyperparameters(experiment['model']) }", log_type, this_filename, level = "warning")
+	return hyperparameters or None
+
 def optimize_trainer(state: OptimizeState) -> OptimizeState:
 	"""
 	Trains models with specified features and returns performance metrics.
 	
 	Args:
-		model_name: One of ['XGBoost', 'LinearRegression', 'RandomForest', 'LogisticRegression', 'KNearest']
+		model_name: One of ModelPlugins.names()
 		features: List of feature names to include
 	
 	Returns:
@@ -68,9 +65,17 @@ def optimize_trainer(state: OptimizeState) -> OptimizeState:
 	log_type = state["log_type"]
 	db_path = state["db_path"]
 
+	# Experiments sharing a model and training rows reuse one data prep, the results are unchanged
+	from prediction_models.ExperimentBatch import ExperimentBatch
+	batch = ExperimentBatch(state["aggregates"], state["prediction_set"], state.get("evaluation"))
+	results = batch.evaluate([
+		{ 'model': experiment['model'], 'features': experiment['features'], 'hyperparameters': experiment_hyperparameters(experiment) }
+		for experiment in state["next_experiments"]
+	])
+	state["batch_summary"] = batch.summary
+
 	all_train_results = []
-	for experiment in state["next_experiments"]:
-		result = evaluate_model_with_features(state["aggregates"], experiment['model'], experiment['features'], state["prediction_set"])
+	for experiment, result in zip(state["next_experiments"], results):
 		result_dict = {
 			"experiment_num": state["experiment_count"] + 1,
 			"model_name": experiment['model'],
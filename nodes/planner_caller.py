@@ -1,17 +1,20 @@
 # External Libraries
 import os
 import sqlite3
-import json
 
 # LangGraph / LangChain
-from langchain_nvidia_ai_endpoints import ChatNVIDIA
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
-from langchain.agents import create_agent
 from langchain.tools import tool
 
+# Data Sources
+from data_sources.ExperimentIndex import ExperimentIndex
+
 # Models
 from models.planner_model import PlannerState
 
+# Prediction Models
+from prediction_models.ModelPlugins import ModelPlugins
+
 # Tools
 from tools.train_results import train_result_tools as trt
 # Utilities
@@ -102,33 +105,10 @@ def get_experiments_without_feature(
 def get_feature_usage():
     """Returns a dictionary of all features and how many experiments have contained them."""
     print(f"Agent is requesting feature usage data")
-    with open("queries/get_feature_usage.sql") as f:
-        query = f.read()
-    query = query.format(
-        agent_id = f"\"{ agent_id }\""
-    )
-    result = query_database(query, db_path)
-
-    usage = {}
-    for feature in get_extended_features():
-        usage[feature] = {
-            'XGBoost': 0,
-            'LinearRegression': 0,
-            'RandomForest': 0,
-            'LogisticRegression': 0,
-            'KNearest': 0
-        }
-        
-    result = query_database(query, db_path)
-    
-    if isinstance(result, str):
-        return result
-    
-    for item in result:
-        for feature in json.loads(item['features_used']):
-            usage[feature][item['model_name']] += 1
-    
-    return usage
+    index = ExperimentIndex.for_agent(db_path, agent_id)
+    if len(index) == 0:
+        return "No experiments run yet"
+    return index.feature_usage(get_extended_features(), ModelPlugins.names())
 
 @tool
 def summarize_feature_effects(feature):
@@ -137,22 +117,9 @@ def summarize_feature_effects(feature):
         Provides the average score for each model type.
     """
     print(f"Agent is requesting feature effect summary for { feature }")
-    with open("queries/get_experiments_by_feature.sql") as f:
-        query_with = f.read()
-    query_with = query_with.format(
-        agent_id = f"\"{ agent_id }\"",
-        feature = f"\"%{ feature }%\""
-    )
-    with open("queries/get_experiments_without_feature.sql") as f:
-        query_without = f.read()
-    query_without = query_without.format(
-        agent_id = f"\"{ agent_id }\"",
-        feature = f"\"%{ feature }%\""
-    )
-
-    result_with = query_database(query_with, db_path)
-    result_without = query_database(query_without, db_path)
-    if isinstance(result_with, str):
+    # The last 25 experiments with and without the feature, as the by/without feature queries return
+    result_with, result_without = ExperimentIndex.for_agent(db_path, agent_id).experiments_with_feature(feature, 25)
+    if not result_with:
         print("No experiments found")
         return f"No experiments found using { feature }"
 
@@ -161,6 +128,10 @@ def summarize_feature_effects(feature):
     return effects
 
 def planner_caller_node(state: PlannerState) -> PlannerState:
+    # The LLM client and agent runtime are only loaded when the LLM is actually called
+    from langchain_nvidia_ai_endpoints import ChatNVIDIA
+    from langchain.agents import create_agent
+
     global db_path, agent_id
     db_path = state["db_path"]
     agent_id = state["agent_id"]
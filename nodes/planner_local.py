@@ -0,0 +1,43 @@
+# External Libraries
+import os
+
+# Models
+from models.planner_model import PlannerState
+from models.experiments_model import Experiment
+
+# Planners
+from planners.LocalPlanner import LocalPlanner
+
+# Utilities
+from utils.logger import log
+
+# Set variables that will need to be accessed
+this_filename = os.path.basename(__file__).replace(".py","")
+
+def planner_local_node(state: PlannerState) -> PlannerState:
+    """Plans the next batch of experiments with a local search strategy instead of the LLM."""
+    strategy = state["local_planner_strategies"][state["phase"]]
+    log(state["log_path"], f"Planning experiments locally ({ strategy })", state["log_type"], this_filename)
+
+    memory = state["local_planner_memory"]
+    planner = LocalPlanner(
+        strategy,
+        state["prediction_models"],
+        state["extended_features"],
+        state["historical_results"],
+        memory,
+        seed = state["experiment_count"]
+    )
+    experiments = planner.plan(state["local_batch_size"])
+
+    # Same schema checks the LLM plan goes through
+    experiments = [Experiment.model_validate(experiment).model_dump() for experiment in experiments]
+
+    return {
+        "validated": True,
+        "judged": True,
+        "next_experiments": experiments,
+        "commentary": f"Local { strategy } planner proposed { len(experiments) } experiments for phase { state["phase"] }.",
+        "local_planner_memory": memory,
+        "failed_validation_count": 0
+    }
@@ -7,19 +7,15 @@ import argparse
 import sys
 import json
 
-# Prediction Models
-from prediction_models.XGBoost import XGBoost
-from prediction_models.LinearRegression import LinearRegression
-from prediction_models.RandomForest import RandomForest
-from prediction_models.LogisticRegression import LogisticRegression
-from prediction_models.KNearest import KNearest
-
 # Internal Models
 from models.predict_model import PredictState
 
 # Data Sources
 from data_sources.ResultsDB import ResultsDB
 
+# Prediction Models
+from prediction_models.ModelPlugins import ModelPlugins
+
 # Utilities
 from utils.logger import log
 from utils.matchups import get_predictions_by_matchup
@@ -29,34 +25,53 @@ load_dotenv()
 this_filename = os.path.basename(__file__).replace(".py","")
 
 def predict_predictor_node(state: PredictState):
+    # Prediction models pull in xgboost and scikit-learn, so they load on first use
+    from prediction_models.ModelRegistry import ModelRegistry
+    from prediction_models.ModelStack import ModelStack
+
     num_predictions = len(state["prediction_set"])
     log(state["log_path"], f"Making predictions for { num_predictions } games", state["log_type"], this_filename)
-    predictions = []
-    for best in state["best_results"]:
-        if best["model_name"] == 'XGBoost':
-            xgb = XGBoost(state["aggregates"], best["target"], best["features_used"], state["prediction_set"])
-            xgb.predict_spread(state["prediction_set"])
-            predictions.append(xgb.model_output)
-
-        elif best["model_name"] == 'LinearRegression':
-            lr = LinearRegression(state["aggregates"], best["target"], best["features_used"], state["prediction_set"])
-            lr.predict_spread(state["prediction_set"])
-            predictions.append(lr.model_output)
 
-        elif best["model_name"] == 'RandomForest':
-            rf = RandomForest(state["aggregates"], best["target"], best["features_used"], state["prediction_set"])
-            rf.predict_spread(state["prediction_set"])
-            predictions.append(rf.model_output)
-
-        elif best["model_name"] == 'LogisticRegression':
-            lg = LogisticRegression(state["aggregates"], best["target"], best["features_used"], state["prediction_set"])
-            lg.predict_winner(state["prediction_set"])
-            predictions.append(lg.model_output)
+    # Fitted models are reused across runs while features, hyperparameters and data are unchanged
+    registry = ModelRegistry()
+    best_results = [best for best in state["best_results"] if best["model_name"] in ModelPlugins.names()]
+    if state.get("multi_target", False):
+        # The spread models report each winner's confidence too, so the classifiers aren't fit
+        classifiers = [best["model_name"] for best in best_results if ModelPlugins.model_type(best["model_name"]) == 'classifier']
+        best_results = [best for best in best_results if best["model_name"] not in classifiers]
+        log(state["log_path"], f"Multi-target mode, skipping the classifiers: { ", ".join(classifiers) or "none" }", state["log_type"], this_filename)
+    predictions = []
+    member_predictions = {}
+    warm_started = []
+    for best in best_results:
+        model, loaded = registry.load_or_train(
+            ModelPlugins.get(best["model_name"]),
+            state["aggregates"],
+            best["target"],
+            best["features_used"],
+            state["prediction_set"],
+            best.get("hyperparameters"),
+            retrain = state.get("retrain_models", False)
+        )
+        if loaded:
+            warm_started.append(best["model_name"])
+        # One inference pass, published here and reused as the stack's member predictions
+        values = model.predict_values(state["prediction_set"])
+        model.publish_values(state["prediction_set"], values)
+        predictions.append(model.model_output)
+        if state.get("stack_models", False):
+            member_predictions[best["model_name"]] = values
+    log(state["log_path"], f"Loaded { len(warm_started) } fitted models from the registry: { ", ".join(warm_started) or "none" }", state["log_type"], this_filename)
 
-        elif best["model_name"] == 'KNearest':
-            kn = KNearest(state["aggregates"], best["target"], best["features_used"], state["prediction_set"])
-            kn.predict_winner(state["prediction_set"])
-            predictions.append(kn.model_output)
+    if state.get("stack_models", False) and best_results:
+        # Out-of-fold predictions are cached per season, so only the current season's folds refit each week
+        stack = ModelStack(state["aggregates"]).fit(
+            best_results,
+            state["prediction_set"],
+            log = lambda message: log(state["log_path"], message, state["log_type"], this_filename)
+        )
+        stack.predict(state["prediction_set"], member_predictions)
+        predictions.append(stack.model_output)
     
     matchups = get_predictions_by_matchup(predictions, state["matchups"])
     formatted = formatting.format_predictions(matchups)
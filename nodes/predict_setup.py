@@ -3,7 +3,6 @@ from dotenv import load_dotenv
 import os
 import datetime
 import uuid
-import argparse
 import sys
 from pathlib import Path
 import json
@@ -16,14 +15,14 @@ from data_sources.ResultsDB import ResultsDB
 
 # Utilities
 from utils.logger import log
+from utils.arguments import predict_arguments
 
 load_dotenv()
 this_filename = os.path.basename(__file__).replace(".py","")
 
 def predict_setup_node(state: PredictState) -> PredictState:
     # Parse Arguments
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--debug", action="store_true", help="verbose printing of logs to stdout (not just logfile)")
+    parser = predict_arguments()
     args = parser.parse_args()
         
     # Print logs to console?
@@ -36,7 +35,7 @@ def predict_setup_node(state: PredictState) -> PredictState:
     now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     script = sys.argv[0].replace(".py", "")
     agent_id = str(uuid.uuid4())
-    log_path = f"logs/{ script }/{ now }_{ agent_id }.txt"
+    log_path = f"logs/{ script }/{ now }_{ agent_id }.jsonl"
 
     log(log_path, "Setting up...\n", log_type, this_filename)
 
@@ -65,5 +64,9 @@ def predict_setup_node(state: PredictState) -> PredictState:
         "home_path": home_path,
         "llm_model": llm_model,
         "llm_base_url": llm_base_url,
-        "podcasts": podcasts
+        "podcasts": podcasts,
+        "compact_aggregates": args.compact,
+        "retrain_models": args.retrain,
+        "multi_target": args.multi_target,
+        "stack_models": args.stack
     }
\ No newline at end of file
@@ -3,7 +3,6 @@ from dotenv import load_dotenv
 import os
 import datetime
 import uuid
-import argparse
 import sys
 
 # Internal Models
@@ -11,15 +10,14 @@ from models.scrape_model import ScrapeState
 
 # Utilities
 from utils.logger import log
+from utils.arguments import scrape_arguments
 
 load_dotenv()
 this_filename = os.path.basename(__file__).replace(".py","")
 
 def scrape_setup_node(state: ScrapeState) -> ScrapeState:
     # Parse Arguments
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--history", action="store_true", help="load all historical data, if not set only the current season will be loaded")
-    parser.add_argument("--debug", action="store_true", help="verbose printing of logs to stdout (not just logfile)")
+    parser = scrape_arguments()
     args = parser.parse_args()
     
     # All data or just this season?
@@ -41,7 +39,7 @@ def scrape_setup_node(state: ScrapeState) -> ScrapeState:
     now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     script = sys.argv[0].replace(".py", "")
     state["agent_id"] = uuid.uuid4()
-    state["log_path"] = f"logs/{ script }/{ now }_{ state['agent_id'] }.txt"
+    state["log_path"] = f"logs/{ script }/{ now }_{ state['agent_id'] }.jsonl"
 
     log(state["log_path"], "Setting up...\n", state["log_type"], this_filename)
 
@@ -1,15 +1,35 @@
+# Internal Libraries
+from utils.arguments import optimize_arguments
+
+# Parse arguments before loading anything heavy so --help returns immediately
+args = optimize_arguments().parse_args()
+
 print("Loading dependencies...\n")
 
 # Graphs
 from graphs.optimize_graph import app
 
+# Utils
+from utils.instrumentation import summarize, save_records
+from utils.logger import log
+
 # Internal Libraries
 import setup # Loads launch states, sets preferences from .env, enables argument parsing
 
+# Render the graph images only when asked, drawing goes through a remote renderer
+if args.draw_graphs:
+    from graphs.planner_graph import planner_graph
+    app.get_graph(xray=True).draw_mermaid_png(output_file_path="graphs/images/optimize_graph.png")
+    planner_graph.get_graph().draw_mermaid_png(output_file_path="graphs/images/planner_graph.png")
+
 # Run the app
-app.invoke(
+final_state = app.invoke(
     {}, 
     config={
         "recursion_limit": 25000
     }
-)
\ No newline at end of file
+)
+
+# Where the time went, saved to the node_metric table in one transaction
+save_records()
+log(final_state["log_path"], summarize(final_state["agent_id"]), "all", "optimize")
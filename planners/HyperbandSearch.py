@@ -0,0 +1,95 @@
+import math
+import random
+
+# Prediction Models
+from prediction_models.ModelPlugins import ModelPlugins
+
+class HyperbandSearch:
+    """
+    Joint feature and hyperparameter search for a single model using Hyperband.
+
+    Each bracket samples random (features, hyperparameters) configurations and runs
+    successive halving on them: every configuration gets a cheap partial fit on a
+    fraction of the training rows, only the best 1/eta survive to the next rung, and
+    survivors are refit on eta times more rows until the last rung uses all of them.
+    Budgets grow from `min_budget`, the first rung of the most aggressive bracket.
+    Hyperparameters are sampled from the model's search space in ModelPlugins.
+    """
+    def __init__(self, evaluate, model_name, extended_features, eta=3, min_budget=1/9, seed=None):
+        """
+        `evaluate(model_name, features, hyperparameters, train_fraction)` must return a
+        model_output dict, e.g. optimize_trainer.evaluate_model_with_features.
+        """
+        if not 0 < min_budget <= 1:
+            raise ValueError(f"min_budget must be in (0, 1], got { min_budget }")
+        # Raises ValueError for unknown models
+        self.search_space = ModelPlugins.search_space(model_name)
+        self.evaluate = evaluate
+        self.model_name = model_name
+        self.features = list(dict.fromkeys(extended_features))
+        self.eta = eta
+        self.min_budget = min_budget
+        self.rng = random.Random(seed)
+        self.min_features = 3
+        self.max_features = min(15, len(self.features))
+        self.s_max = int(math.floor(math.log(1 / min_budget, eta) + 1e-9))
+
+    def run(self, brackets=None):
+        """Runs the brackets and returns every full-budget result."""
+        results = []
+        for s in list(range(self.s_max, -1, -1))[:brackets]:
+            results.extend(self.__run_bracket(s))
+        return results
+
+    def loss(self, result):
+        """Lower is better for every model type."""
+        if result.get("mean_absolute_error") is not None:
+            return float(result["mean_absolute_error"])
+        if result.get("test_accuracy") is not None:
+            return -float(result["test_accuracy"])
+        return math.inf
+
+    def budgets(self, s):
+        """
+        Training fractions for the rungs of bracket `s`: min_budget * eta**(i + s_max - s),
+        so bracket s_max starts at min_budget, and the last rung always trains on every row.
+        """
+        budgets = [min(1.0, self.min_budget * self.eta ** (i + self.s_max - s)) for i in range(s + 1)]
+        budgets[-1] = 1.0
+        return budgets
+
+    def sample_configuration(self):
+        size = self.rng.randint(self.min_features, self.max_features)
+        features = self.rng.sample(self.features, size)
+        hyperparameters = {}
+        for name, (kind, *bounds) in self.search_space.items():
+            if kind == 'int':
+                hyperparameters[name] = self.rng.randint(bounds[0], bounds[1])
+            elif kind == 'float':
+                hyperparameters[name] = round(self.rng.uniform(bounds[0], bounds[1]), 4)
+            elif kind == 'log':
+                hyperparameters[name] = round(math.exp(self.rng.uniform(math.log(bounds[0]), math.log(bounds[1]))), 6)
+            elif kind == 'choice':
+                hyperparameters[name] = self.rng.choice(bounds[0])
+        return { "features": features, "hyperparameters": hyperparameters }
+
+    def __run_bracket(self, s):
+        n = int(math.ceil((self.s_max + 1) / (s + 1) * self.eta ** s))
+        configurations = [self.sample_configuration() for _ in range(n)]
+        full_budget_results = []
+        for train_fraction in self.budgets(s):
+            scored = []
+            for configuration in configurations:
+                result = self.evaluate(
+                    self.model_name,
+                    configuration["features"],
+                    configuration["hyperparameters"],
+                    train_fraction
+                )
+                scored.append((self.loss(result), configuration))
+                if train_fraction >= 1.0:
+                    full_budget_results.append({ "result": result, "features_used": configuration["features"] })
+            scored.sort(key=lambda item: item[0])
+            keep = max(1, int(len(configurations) / self.eta))
+            configurations = [configuration for _, configuration in scored[:keep]]
+        return full_budget_results
@@ -0,0 +1,217 @@
+import math
+import random
+
+class LocalPlanner:
+    """
+    Deterministic, LLM-free experiment planner.
+
+    Proposes batches of experiments by running a local search strategy over the
+    extended feature list. Strategies keep their progress in a plain dict
+    (`memory`) so it can live in the graph state between planner invocations. A
+    strategy only proposes new candidates once its previous ones have results, so
+    a batch larger than its proposals is topped up with random feature sets.
+    """
+    strategies = ['random', 'greedy', 'annealing', 'halving']
+
+    def __init__(self, strategy, prediction_models, extended_features, historical_results, memory, seed=None):
+        if strategy not in self.strategies:
+            raise ValueError(f"Invalid local planner strategy: { strategy }")
+        self.strategy = strategy
+        self.model_names = [model["name"] for model in prediction_models]
+        self.features = list(dict.fromkeys(extended_features))
+        self.memory = memory
+        self.rng = random.Random(seed)
+        self.min_features = 3
+        self.max_features = min(15, len(self.features))
+
+        # Every experiment that has been run, keyed by model and feature set
+        self.tried = {}
+        for historical in historical_results:
+            key = self.__key(historical["model_name"], historical["features_used"])
+            self.tried[key] = self.loss(historical["result"])
+
+    def plan(self, batch_size):
+        """Returns a list of experiments in the same shape as a validated ExperimentPlan."""
+        experiments = []
+        proposed = set()
+        # Models whose strategy proposed experiments in this batch, those have no results yet
+        self.awaiting = set()
+        for i in range(batch_size):
+            model = self.model_names[i % len(self.model_names)]
+            features = self.__next_features(model, proposed)
+            proposed.add(self.__key(model, features))
+            experiments.append({
+                "experiment_number": i + 1,
+                "model": model,
+                "features": features
+            })
+        return experiments
+
+    def loss(self, result):
+        """Lower is better for every model type."""
+        if result.get("mean_absolute_error") is not None:
+            return float(result["mean_absolute_error"])
+        if result.get("test_accuracy") is not None:
+            return -float(result["test_accuracy"])
+        return math.inf
+
+    def __key(self, model, features):
+        return (model, frozenset(features))
+
+    def __is_new(self, model, features, proposed):
+        key = self.__key(model, features)
+        return key not in self.tried and key not in proposed
+
+    def __next_features(self, model, proposed):
+        if self.strategy == 'random':
+            return self.__random_features(model, proposed)
+
+        model_memory = self.memory.setdefault(self.strategy, {}).setdefault(model, {"queue": []})
+        # Refill the queue a bounded number of times; fall back to random if the strategy is exhausted.
+        # Refills score the last proposals, so a model that proposed in this batch waits for the next one.
+        for _ in range(5):
+            while model_memory["queue"]:
+                features = model_memory["queue"].pop(0)
+                if self.__is_new(model, features, proposed):
+                    self.awaiting.add(model)
+                    return features
+            if model in self.awaiting:
+                break
+            if self.strategy == 'greedy':
+                self.__refill_greedy(model, model_memory)
+            elif self.strategy == 'annealing':
+                self.__refill_annealing(model, model_memory)
+            elif self.strategy == 'halving':
+                self.__refill_halving(model, model_memory)
+        return self.__random_features(model, proposed)
+
+    def __random_features(self, model, proposed):
+        for _ in range(100):
+            size = self.rng.randint(self.min_features, self.max_features)
+            features = self.rng.sample(self.features, size)
+            if self.__is_new(model, features, proposed):
+                return features
+        return features
+
+    def __neighbor(self, features):
+        """Adds, removes or swaps a single feature."""
+        features = list(features)
+        unused = [f for f in self.features if f not in features]
+        moves = []
+        if unused and len(features) < self.max_features:
+            moves.append('add')
+        if len(features) > self.min_features:
+            moves.append('remove')
+        if unused and features:
+            moves.append('swap')
+        move = self.rng.choice(moves)
+        if move == 'add':
+            features.append(self.rng.choice(unused))
+        elif move == 'remove':
+            features.remove(self.rng.choice(features))
+        else:
+            features[self.rng.randrange(len(features))] = self.rng.choice(unused)
+        return features
+
+    def __lookup(self, model, features):
+        return self.tried.get(self.__key(model, features), math.inf)
+
+    def __refill_greedy(self, model, model_memory):
+        """
+        Forward selection: evaluate the current base plus one candidate feature,
+        keep the best addition, and repeat until no addition improves the loss.
+        Each run starts from a random base one feature short of min_features.
+        """
+        base = model_memory.get("base", [])
+        candidates = model_memory.get("candidates", [])
+        if candidates:
+            best = min(candidates, key=lambda features: self.__lookup(model, features))
+            best_loss = self.__lookup(model, best)
+            if best_loss < model_memory.get("base_loss", math.inf):
+                base = best
+                model_memory["base_loss"] = best_loss
+            else:
+                # Converged, restart from a new base
+                base = []
+                model_memory["base_loss"] = math.inf
+
+        if len(base) < self.min_features - 1 or len(base) >= self.max_features:
+            # Candidates have at least min_features and at most max_features
+            base = self.rng.sample(self.features, self.min_features - 1)
+            model_memory["base_loss"] = math.inf
+        unused = [f for f in self.features if f not in base]
+        pool = self.rng.sample(unused, min(20, len(unused)))
+        model_memory["base"] = base
+        model_memory["candidates"] = [base + [feature] for feature in pool]
+        model_memory["queue"] = list(model_memory["candidates"])
+
+    def __refill_annealing(self, model, model_memory):
+        """
+        Simulated annealing: accept each evaluated neighbor if it is better, or with a
+        probability that shrinks as the temperature cools.
+        """
+        current = model_memory.get("current")
+        temperature = model_memory.get("temperature", 0.05)
+        if current is None:
+            current = self.__random_features(model, set())
+            model_memory["current_loss"] = self.__lookup(model, current)
+            model_memory["queue"] = [current]
+        else:
+            current_loss = model_memory.get("current_loss", math.inf)
+            for features in model_memory.get("proposals", []):
+                loss = self.__lookup(model, features)
+                if math.isinf(loss):
+                    continue
+                if math.isinf(current_loss) or loss < current_loss:
+                    accept = True
+                else:
+                    delta = (loss - current_loss) / max(abs(current_loss), 1e-9)
+                    accept = self.rng.random() < math.exp(-delta / max(temperature, 1e-9))
+                if accept:
+                    current, current_loss = features, loss
+                temperature *= 0.95
+            model_memory["current_loss"] = current_loss
+            model_memory["queue"] = [self.__neighbor(current) for _ in range(4)]
+
+        model_memory["current"] = current
+        model_memory["temperature"] = temperature
+        model_memory["proposals"] = list(model_memory["queue"])
+
+    def __refill_halving(self, model, model_memory):
+        """
+        Successive halving over neighborhood exploration: start with a population of
+        random feature sets, then at each rung keep the best half and give every
+        survivor twice as many neighbor evaluations as the previous rung.
+        """
+        population = model_memory.get("population", [])
+        rung = model_memory.get("rung", 0)
+        if not population:
+            population = [self.__random_features(model, set()) for _ in range(16)]
+            model_memory["population"] = population
+            model_memory["rung"] = 0
+            model_memory["queue"] = list(population)
+            return
+
+        # Each survivor is replaced by its best evaluated neighbor
+        neighbors = model_memory.get("neighbors", {})
+        ranked = []
+        for i, features in enumerate(population):
+            candidates = [features] + neighbors.get(str(i), [])
+            best = min(candidates, key=lambda candidate: self.__lookup(model, candidate))
+            ranked.append(best)
+        ranked.sort(key=lambda features: self.__lookup(model, features))
+
+        survivors = ranked[:max(1, len(ranked) // 2)]
+        if len(ranked) == 1:
+            # Finished a full bracket, start a new one
+            model_memory["population"] = []
+            self.__refill_halving(model, model_memory)
+            return
+
+        rung += 1
+        budget = 2 ** rung
+        neighbors = {str(i): [self.__neighbor(features) for _ in range(budget)] for i, features in enumerate(survivors)}
+        model_memory["population"] = survivors
+        model_memory["rung"] = rung
+        model_memory["neighbors"] = neighbors
+        model_memory["queue"] = [features for group in neighbors.values() for features in group]
@@ -1,15 +1,35 @@
+# Internal Libraries
+from utils.arguments import predict_arguments
+
+# Parse arguments before loading anything heavy so --help returns immediately
+args = predict_arguments().parse_args()
+
 print("Loading dependencies...\n")
 
 # Graphs
 from graphs.predict_graph import predict_graph
 
+# Utils
+from utils.instrumentation import summarize, save_records
+from utils.logger import log
+
 # Internal Libraries
 import setup # Loads launch states, sets preferences from .env, enables argument parsing
 
+# Render the graph images only when asked, drawing goes through a remote renderer
+if args.draw_graphs:
+    from graphs.analyzer_graph import analyzer_graph
+    predict_graph.get_graph().draw_mermaid_png(output_file_path="graphs/images/predict_graph.png")
+    analyzer_graph.get_graph().draw_mermaid_png(output_file_path="graphs/images/analyzer_graph.png")
+
 # Run the app
-predict_graph.invoke(
+final_state = predict_graph.invoke(
     {},
     config={
         "recursion_limit": 500
     }
-)
\ No newline at end of file
+)
+
+# Where the time went, saved to the node_metric table in one transaction
+save_records()
+log(final_state["log_path"], summarize(final_state["agent_id"]), "all", "predict")
@@ -0,0 +1,66 @@
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from sklearn.preprocessing import StandardScaler
+from data_sources.FeatureIndex import FeatureIndex
+from data_sources.FrameCache import FrameCache
+
+class ColumnScaler:
+	"""
+	StandardScalers for any column subset of one aggregates frame.
+
+	For a set of training rows, the mean and variance of every numeric column of the
+	frame are computed once, so any feature subset's scaler is a slice of them and
+	experiments that share a split (most of them) never refit one. Row sets are
+	identified by a hash of their labels.
+	"""
+	__cache = FrameCache()
+	max_cached_scalings = 16
+
+	def __init__(self, feature_index):
+		self.feature_index = feature_index
+		self.scalings = OrderedDict()
+		self.lock = threading.Lock()
+
+	@classmethod
+	def for_frame(cls, frame):
+		"""Returns the cached scaler for `frame`, building it on first use."""
+		return cls.__cache.get(frame, lambda: cls(FeatureIndex.for_frame(frame)))
+
+	def has_columns(self, columns):
+		return self.feature_index.has_columns(columns)
+
+	def scaler(self, rows, columns):
+		"""A fitted StandardScaler for `columns` over the rows labelled `rows`."""
+		key = self.rows_key(rows)
+		with self.lock:
+			stats = self.scalings.get(key)
+			if stats is not None:
+				self.scalings.move_to_end(key)
+		if stats is None:
+			positions = self.feature_index.index.get_indexer(rows)
+			values = self.feature_index.values[:, positions].astype(np.float64)
+			# Other columns may be null on these rows, the requested ones never are
+			with np.errstate(all='ignore'):
+				stats = (np.nanmean(values, axis=1), np.nanvar(values, axis=1))
+			with self.lock:
+				self.scalings[key] = stats
+				while len(self.scalings) > self.max_cached_scalings:
+					self.scalings.popitem(last = False)
+
+		columns = list(columns)
+		column_positions = [self.feature_index.positions[col] for col in columns]
+		scaler = StandardScaler()
+		scaler.mean_ = stats[0][column_positions]
+		scaler.var_ = stats[1][column_positions]
+		scaler.scale_ = np.where(scaler.var_ > 0, np.sqrt(scaler.var_), 1.0)
+		scaler.n_features_in_ = len(columns)
+		scaler.feature_names_in_ = np.asarray(columns, dtype=object)
+		scaler.n_samples_seen_ = len(rows)
+		return scaler
+
+	@staticmethod
+	def rows_key(rows):
+		"""Identifies a set of training rows by a hash of their labels."""
+		return hashlib.sha1(np.ascontiguousarray(np.asarray(rows)).tobytes()).hexdigest()
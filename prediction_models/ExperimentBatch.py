@@ -0,0 +1,150 @@
+import time
+import hashlib
+import numpy as np
+from data_sources.FeatureIndex import FeatureIndex
+from .ColumnScaler import ColumnScaler
+from .PredictionModel import PredictionModel
+from .ModelPlugins import ModelPlugins
+
+class BatchData:
+	"""
+	Data prep shared by the experiments of one ExperimentBatch group.
+
+	Holds the training rows for the union of the group's columns, assembled once, and
+	memoizes anything else the members would each rebuild (evaluation splits, sample
+	weights, rows scaled with the frame's ColumnScaler). Members are valid on exactly
+	the same rows, so each one's training features and scaled rows are column slices
+	of the union's and its splits and weights are the ones it would have computed.
+	"""
+	def __init__(self, data_aggregate, columns):
+		# Seconds spent on shared items (builds and slices), and the seconds the members
+		# would have spent if each had built every item it used
+		self.spent_seconds = 0.0
+		self.independent_seconds = 0.0
+		self.build_seconds = {}
+		self.items = {}
+
+		start = time.time()
+		self.training = FeatureIndex.for_frame(data_aggregate).frame(columns)
+		self.items['training_features'] = self.training
+		self.build_seconds['training_features'] = time.time() - start
+		self.spent_seconds += self.build_seconds['training_features']
+		self.scaling = ColumnScaler.for_frame(data_aggregate)
+		self.positions = { col: i for i, col in enumerate(self.training.columns) }
+
+	def training_features(self, columns):
+		"""A member's training features, in place of assembling them itself."""
+		self.shared('training_features', None)
+		return self.slice(columns)
+
+	def slice(self, columns):
+		start = time.time()
+		features = self.training[columns]
+		self.spent_seconds += time.time() - start
+		return features
+
+	def scaled(self, fitted_rows, X):
+		"""
+		X standardized with the mean and variance of the rows labelled `fitted_rows`,
+		as the frame's ColumnScaler scaler would transform it.
+		"""
+		key = ('scaled', ColumnScaler.rows_key(fitted_rows), ColumnScaler.rows_key(X.index))
+		scaled = self.shared(key, lambda: self.__scale(fitted_rows, X.index))
+		start = time.time()
+		scaled = scaled[:, [self.positions[col] for col in X.columns]]
+		self.spent_seconds += time.time() - start
+		return scaled
+
+	def __scale(self, fitted_rows, rows):
+		scaler = self.scaling.scaler(fitted_rows, list(self.training.columns))
+		# In place on a copy, as StandardScaler.transform does, so the dtypes and results match
+		scaled = self.training.to_numpy()[self.training.index.get_indexer(rows)]
+		scaled -= scaler.mean_
+		scaled /= scaler.scale_
+		return scaled
+
+	def shared(self, key, build):
+		"""The item stored as `key`, calling build() the first time it's asked for."""
+		if key not in self.items:
+			start = time.time()
+			self.items[key] = build()
+			self.build_seconds[key] = time.time() - start
+			self.spent_seconds += self.build_seconds[key]
+		self.independent_seconds += self.build_seconds[key]
+		return self.items[key]
+
+	def saved_seconds(self):
+		"""
+		Upper bound on the prep time sharing saved: members' own builds would cover only
+		their columns, but also pay per-call overheads the bound doesn't see.
+		"""
+		return self.independent_seconds - self.spent_seconds
+
+class ExperimentBatch:
+	"""
+	Evaluates a plan's experiments in groups that share their data prep.
+
+	Experiments on the same model and target whose feature columns are non-null on
+	the same rows form a group. A group's training rows are assembled once for the
+	union of its columns (see BatchData) and every member reuses them along with the
+	evaluation splits and sample weights, so each result is the same as evaluating the
+	experiment on its own. Experiments whose columns aren't all in the aggregates'
+	FeatureIndex are evaluated on their own.
+	"""
+	def __init__(self, data_aggregate, prediction_set, evaluation=None):
+		self.data_aggregate = data_aggregate
+		self.prediction_set = prediction_set
+		self.evaluation = evaluation
+		self.feature_index = FeatureIndex.for_frame(data_aggregate)
+		self.summary = {}
+
+	def groups(self, experiments):
+		"""Lists of positions into `experiments` sharing their data prep, ordered by their first member."""
+		groups = {}
+		for i, experiment in enumerate(experiments):
+			columns = self.__columns(experiment)
+			if not self.feature_index.has_columns(columns):
+				groups[('unbatched', i)] = [i]
+				continue
+			rows = np.packbits(self.feature_index.valid_rows(columns))
+			key = (experiment['model'], ModelPlugins.target(experiment['model']), hashlib.sha1(rows.tobytes()).hexdigest())
+			groups.setdefault(key, []).append(i)
+		return list(groups.values())
+
+	def evaluate(self, experiments):
+		"""
+		model_output of every experiment ({ model, features, hyperparameters }), in the
+		order given. Adds the time spent and saved to `summary`.
+		"""
+		start = time.time()
+		outputs = [None] * len(experiments)
+		groups = self.groups(experiments)
+		saved = 0.0
+		for group in groups:
+			batch = None
+			if len(group) > 1:
+				batch = BatchData(self.data_aggregate, self.__union_columns([experiments[i] for i in group]))
+			for i in group:
+				experiment = experiments[i]
+				model = ModelPlugins.build(
+					experiment['model'], self.data_aggregate, experiment['features'], self.prediction_set,
+					hyperparameters = experiment.get('hyperparameters'), evaluation = self.evaluation, batch = batch
+				)
+				outputs[i] = model.model_output
+			if batch is not None:
+				saved += batch.saved_seconds()
+
+		self.summary = {
+			'experiments': len(experiments),
+			'groups': len(groups),
+			'seconds': round(time.time() - start, 2),
+			'saved_seconds': round(max(saved, 0.0), 2)
+		}
+		return outputs
+
+	def __columns(self, experiment):
+		target = ModelPlugins.target(experiment['model'])
+		return PredictionModel.team_specific_columns(target, experiment['features'], prediction_columns = bool(experiment['features'])) + ['season']
+
+	def __union_columns(self, experiments):
+		return list(dict.fromkeys(col for experiment in experiments for col in self.__columns(experiment)))
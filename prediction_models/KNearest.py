@@ -1,95 +1,114 @@
 from .PredictionModel import PredictionModel
+from .NeighborIndex import NeighborIndex
 from sklearn.neighbors import KNeighborsClassifier
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from utils.nfl import teams
-import time
-import json
+import numpy as np
 
 class KNearest(PredictionModel):
-	def __init__(self, data_aggregate, target, feature_columns, prediction_set):
-		super().__init__(data_aggregate, target, feature_columns, prediction_set)
-		start = time.time()
-		self.model_output = { 'model_name': 'KNearest', 'target': target }
-		self.kn_classifier = self.__train_model(self.training_features, test = True)
-		self.kn_classifier = self.__train_model(self.training_features)
-		self.model_output["train_time_in_seconds"] = round(time.time() - start, 2)
+	"""
+	k-nearest neighbors classifier on standardized features.
+
+	When the aggregates are indexed (see NeighborIndex) the scaler statistics, fitted
+	search and training-set neighbors of each feature subset are cached across
+	experiments, and the test pass answers n_neighbors and every `n_neighbors_sweep`
+	value from a single neighbor query, reporting the sweep's test accuracies in
+	model_output.
+	"""
+	estimator_attribute = 'kn_classifier'
+	default_hyperparameters = {
+		'n_neighbors': 5,
+		'weights': 'uniform',
+		'algorithm': 'auto',
+		'n_jobs': -1,
+		'n_neighbors_sweep': None
+	}
+	uses_sample_weights = False
+
+	def __init__(self, data_aggregate, target, feature_columns, prediction_set, hyperparameters=None, train_fraction=1.0, refit=True, evaluate=True, evaluation=None, batch=None):
+		super().__init__(data_aggregate, target, feature_columns, prediction_set, hyperparameters, train_fraction, evaluation, batch)
+		# A lone fit (no test pass) has nothing to share the cached scaling and trees with
+		self.neighbors = self.__get_neighbors(data_aggregate) if evaluate else None
+		self.train(evaluate, refit)
+
+	def __get_neighbors(self, data_aggregate):
+		neighbors = NeighborIndex.for_frame(data_aggregate)
+		return neighbors if neighbors.has_columns(list(self.training_features.columns)) else None
 			
-	def __train_model(self, features, test = False):
-		# Prep data
-		X = features.drop(['team_a_' + self.target], axis=1).copy()
-		y = features['team_a_' + self.target].copy()
-		
-		# 🔒 Always sanitize before giving to XGBoost
-		X = self.sanitize_features(X, model = self.model_output["model_name"])
-		X = X.drop(["season"], axis=1, errors="ignore")
+	def __indexed(self, X):
+		return self.neighbors is not None and not X.columns.duplicated().any()
+
+	def fit(self, X, y, sample_weight=None):
+		if self.__indexed(X):
+			scaler = self.neighbors.scaler(X.index, X.columns)
+			kn = self.neighbors.classifier(X.index, self.scale(scaler, X, X.index, True), y, list(X.columns), self.estimator_hyperparameters())
+			return {'model': kn, 'scaler': scaler}
 
-		if(test):
-			X, X_test, y, y_test = train_test_split(
-				X, 
-				y,
-				test_size = 0.2, 
-				random_state = 42
-			)
-				
 		# Scale
 		scaler = StandardScaler()
 		X = scaler.fit_transform(X)
 
 		# Train the model
-		kn = KNeighborsClassifier()
+		parameters = { k: v for k, v in self.estimator_hyperparameters().items() if k != 'n_neighbors_sweep' }
+		parameters['algorithm'] = NeighborIndex.algorithm(self.hyperparameters, X.shape[1])
+		kn = KNeighborsClassifier(**parameters)
 		kn.fit(X, y)
+		return {'model': kn, 'scaler': scaler}
+
+	def fit_and_score(self, X, y, sample_weight, X_test, y_test):
+		classifier = self.fit(X, y)
+		kn, scaler = classifier['model'], classifier['scaler']
+		n_neighbors = self.hyperparameters['n_neighbors']
+		# Scaled with the training rows' statistics, the test rows never fit the scaler
+		X_scaled = self.scale(scaler, X, X.index, self.__indexed(X))
+		X_test = self.scale(scaler, X_test, X.index, self.__indexed(X))
+		classes = np.searchsorted(kn.classes_, np.asarray(y))
 		
+		# Evaluate
+		metrics = {}
+		if self.__indexed(X):
+			distances, neighbors = self.neighbors.training_neighbors(X.index, kn, X_scaled, y, list(X.columns), self.estimator_hyperparameters(), n_neighbors)
+		else:
+			distances, neighbors = kn.kneighbors(X_scaled, n_neighbors = n_neighbors)
+		train_predictions = kn.classes_[self.__vote(distances, classes[neighbors], n_neighbors, len(kn.classes_)).argmax(axis=1)]
+		metrics['train_accuracy'] = float((train_predictions == y.to_numpy()).mean())
 
-		if(test):
-			X_test = scaler.fit_transform(X_test)
-			
-			# Evaluate
-			self.model_output['train_accuracy'] = kn.score(X, y)
-			self.model_output['test_accuracy'] = kn.score(X_test, y_test)
-			
-			# Confidence Calibration
-			predictions = kn.predict(X_test)
-			probabilities = kn.predict_proba(X_test)		
-			confidence = probabilities.max(axis=1)
+		# One neighbor query answers n_neighbors and every sweep value
+		sweep = self.hyperparameters['n_neighbors_sweep'] or []
+		distances, neighbors = kn.kneighbors(X_test, n_neighbors = max([n_neighbors, *sweep]))
+		labels = classes[neighbors]
+		probabilities = self.__vote(distances, labels, n_neighbors, len(kn.classes_))
+		predictions = kn.classes_[probabilities.argmax(axis=1)]
+		metrics['test_accuracy'] = float((predictions == y_test.to_numpy()).mean())
+		if sweep:
+			metrics['n_neighbors_sweep'] = {
+				str(k): round(float((kn.classes_[self.__vote(distances, labels, k, len(kn.classes_)).argmax(axis=1)] == y_test.to_numpy()).mean()), 4)
+				for k in sweep
+			}
+		
+		# Confidence Calibration
+		metrics['confidence_intervals'] = self.confidence_intervals(predictions, probabilities, y_test)
+		return classifier, metrics
 
-			self.model_output['confidence_intervals'] = []
-			for threshold in [0.6, 0.7, 0.8]:
-				mask = confidence > threshold
-				if mask.sum() > 0:
-					acc = (predictions[mask] == y_test[mask]).mean()
-					pct = 100 * mask.sum() / len(predictions)
-					self.model_output['confidence_intervals'].append(
-						{ f"confidence_greater_than_{ threshold }": { 
-							"count_predictions": int(mask.sum()),
-							"accuracy": round(float(acc), 4)
-						}
-					})
-		return {'model': kn, 'scaler': scaler}
+	def __vote(self, distances, labels, n_neighbors, num_classes):
+		"""Class probabilities from the first `n_neighbors` neighbors, as predict_proba computes them."""
+		distances, labels = distances[:, :n_neighbors], labels[:, :n_neighbors]
+		if self.hyperparameters['weights'] == 'distance':
+			with np.errstate(divide='ignore'):
+				weights = 1.0 / distances
+			# Exact matches take the whole vote
+			exact = np.isinf(weights)
+			exact_rows = exact.any(axis=1)
+			weights[exact_rows] = exact[exact_rows]
+		else:
+			weights = np.ones_like(distances)
+		votes = np.stack([(weights * (labels == c)).sum(axis=1) for c in range(num_classes)], axis=1)
+		return votes / votes.sum(axis=1, keepdims=True)
 	
-	def predict_winner(self, prediction_set):
+	def predict_values(self, prediction_set):
 		X_predict = prediction_set[self.team_specific_feature_columns].copy()
 		X_predict = X_predict.drop("team_a_" + self.target, axis=1)
 		X_predict = self.kn_classifier['scaler'].transform(X_predict)
-		win_predictions = self.kn_classifier['model'].predict(X_predict)
+		# predict is the most probable class, so one neighbor query covers both
 		probabilities = self.kn_classifier['model'].predict_proba(X_predict)
-
-		# Add to dataframe for readability
-		results = prediction_set[['home_team', 'away_team']].copy()
-		results['home_team'] = results['home_team'].map(teams.pfr_team_to_odds_api_team)
-		results['away_team'] = results['away_team'].map(teams.pfr_team_to_odds_api_team)
-		prediction_data = prediction_set[self.team_specific_feature_columns].copy()
-		prediction_data.columns = prediction_data.columns.str.replace('team_a', 'home_team').str.replace('team_b', 'away_team')
-		results['prediction_data'] = prediction_data.apply(
-			lambda row: json.dumps(row.to_dict(), indent=2), axis=1
-		)
-		results['predicted_winner'] = results.apply(
-			lambda row: row['home_team'] if win_predictions[row.name] == 1 else row['away_team'],
-			axis=1
-		)
-		results['confidence'] = probabilities.max(axis=1)
-		self.prediction_df = results
-		self.add_predictions_to_database()
-		results_obj = results.to_dict(orient="records")
-		self.model_output['results'] = results_obj
-		return results_obj
\ No newline at end of file
+		win_predictions = self.kn_classifier['model'].classes_[probabilities.argmax(axis=1)]
+		return win_predictions, probabilities
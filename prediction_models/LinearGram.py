@@ -0,0 +1,83 @@
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from data_sources.FeatureIndex import FeatureIndex
+from data_sources.FrameCache import FrameCache
+
+class LinearGram:
+	"""
+	Weighted least squares for any column subset of one aggregates frame.
+
+	For a given set of training rows and sample weights it computes, once, the
+	weighted Gram matrix XᵀWX over every numeric column of the frame (targets
+	included, so XᵀWy is a slice of it) plus the weighted column sums. A linear
+	regression with an intercept on any feature subset is then solved from the
+	centered k x k slice, without touching the rows again.
+
+	Row sets are identified by a hash of the row labels and weights, so every
+	experiment sharing a split (the usual case, since feature subsets mostly share
+	the same non-null rows) reuses one Gram matrix.
+	"""
+	__cache = FrameCache()
+	max_cached_grams = 16
+
+	def __init__(self, feature_index):
+		self.feature_index = feature_index
+		self.grams = OrderedDict()
+		self.lock = threading.Lock()
+
+	@classmethod
+	def for_frame(cls, frame):
+		"""Returns the cached engine for `frame`, building it on first use."""
+		return cls.__cache.get(frame, lambda: cls(FeatureIndex.for_frame(frame)))
+
+	def has_columns(self, columns):
+		return self.feature_index.has_columns(columns)
+
+	def solve(self, rows, sample_weight, feature_columns, target_column):
+		"""
+		Returns (coefficients, intercept) of the weighted least squares fit of
+		`target_column` on `feature_columns` over the rows labelled `rows`.
+		"""
+		sample_weight = np.asarray(sample_weight, dtype=np.float64)
+		gram, sums, total_weight = self.__gram(np.asarray(rows), sample_weight)
+
+		positions = [self.feature_index.positions[col] for col in feature_columns]
+		target = self.feature_index.positions[target_column]
+
+		# Center on the weighted means, as fitting with an intercept does
+		means = sums[positions] / total_weight
+		target_mean = sums[target] / total_weight
+		xtx = gram[np.ix_(positions, positions)] - total_weight * np.outer(means, means)
+		xty = gram[positions, target] - total_weight * means * target_mean
+
+		# lstsq gives the minimum-norm solution when features are collinear
+		coefficients = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+		intercept = target_mean - means @ coefficients
+		return coefficients, intercept
+
+	def __gram(self, rows, sample_weight):
+		fingerprint = hashlib.sha1()
+		fingerprint.update(np.ascontiguousarray(rows).tobytes())
+		fingerprint.update(sample_weight.tobytes())
+		key = fingerprint.hexdigest()
+
+		with self.lock:
+			cached = self.grams.get(key)
+			if cached is not None:
+				self.grams.move_to_end(key)
+				return cached
+
+		positions = self.feature_index.index.get_indexer(rows)
+		# The take is a copy, so nulls are zeroed in place: they never reach a solve (rows
+		# come from dropna'd features), zeros keep the products finite
+		columns = np.nan_to_num(self.feature_index.values[:, positions].astype(np.float64, copy=False), copy=False)
+		weighted = columns * sample_weight
+		cached = (weighted @ columns.T, weighted.sum(axis=1), sample_weight.sum())
+
+		with self.lock:
+			self.grams[key] = cached
+			while len(self.grams) > self.max_cached_grams:
+				self.grams.popitem(last = False)
+		return cached
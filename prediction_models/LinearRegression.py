@@ -1,86 +1,63 @@
 from .PredictionModel import PredictionModel
+from .LinearGram import LinearGram
 from sklearn.linear_model import LinearRegression as LinearRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, mean_squared_error
 import numpy as np
 import pandas as pd
-from utils.nfl import teams
-import time
-import json
 
 class LinearRegression(PredictionModel):
-	def __init__(self, data_aggregate, target, feature_columns, prediction_set):
-		super().__init__(data_aggregate, target, feature_columns, prediction_set)
-		start = time.time()
-		self.model_output = { 'model_name': 'LinearRegression', 'target': target }
-		self.lr_regressor = self.__train_model(self.training_features, test = True)
-		self.lr_regressor = self.__train_model(self.training_features)
-		self.model_output["train_time_in_seconds"] = round(time.time() - start, 2)
-			
-	def __train_model(self, features, test = False):
-		# Prep data
-		X = features.drop(['team_a_' + self.target], axis=1)
-		y = features['team_a_' + self.target]
-		
-		# 🔒 Always sanitize before giving to XGBoost
-		X = self.sanitize_features(X, model = self.model_output["model_name"])
+	"""
+	Weighted linear regression. With the default hyperparameters every fit is
+	solved from a cached Gram matrix (see LinearGram), so experiments that only
+	change the feature subset don't refit over the rows; fit_intercept=False or
+	positive=True fall back to scikit-learn.
+	"""
+	estimator_attribute = 'lr_regressor'
 
-		sample_weight = self.get_sample_weights(features, X)
+	def __init__(self, data_aggregate, target, feature_columns, prediction_set, hyperparameters=None, train_fraction=1.0, refit=True, evaluate=True, evaluation=None, batch=None):
+		super().__init__(data_aggregate, target, feature_columns, prediction_set, hyperparameters, train_fraction, evaluation, batch)
+		# A lone fit (no test pass) can't pay back building the Gram matrix
+		self.gram = self.__get_gram(data_aggregate) if evaluate else None
+		self.train(evaluate, refit)
 
-		X = X.drop(["season"], axis=1, errors="ignore")		
+	def __get_gram(self, data_aggregate):
+		if not self.hyperparameters.get('fit_intercept', True) or self.hyperparameters.get('positive', False):
+			return None
+		gram = LinearGram.for_frame(data_aggregate)
+		return gram if gram.has_columns(list(self.training_features.columns)) else None
 
-		if(test):
-			X, X_test, y, y_test, w, w_test = train_test_split(
-				X, 
-				y,
-				sample_weight,
-				test_size = 0.2, 
-				random_state = 42
-			)
-			sample_weight = w
-		
-		# Train the model
-		lr = LinearRegressor()
-		lr.fit(X, y, sample_weight = sample_weight)
-		
-		if test:
-			predictions = lr.predict(X_test)
-			self.model_output['mean_absolute_error'] = round(mean_absolute_error(y_test, predictions), 4)
-			self.model_output['root_mean_squared_error'] = round(float(np.sqrt(mean_squared_error(y_test, predictions))), 4)
-			importance = pd.DataFrame({
-				'feature': list(X.columns),
-				'coefficient': lr.coef_
-			}).sort_values('coefficient', ascending=False)
-			self.model_output['feature_coefficients']  = {
-				feature: round(coef, 4)
-				for feature, coef in zip(importance["feature"], importance["coefficient"])
-			}
-			#self.model_output['feature_coefficients'] = dict(zip(importance["feature"], importance["coefficient"]))
-		
+	def fit(self, X, y, sample_weight):
+		if self.gram is None or X.columns.duplicated().any():
+			lr = LinearRegressor(**self.estimator_hyperparameters())
+			lr.fit(X, y, sample_weight = sample_weight)
+			return lr
+
+		coefficients, intercept = self.gram.solve(X.index, sample_weight, list(X.columns), y.name)
+
+		# A fitted scikit-learn estimator, so predictions and pickles work as before
+		lr = LinearRegressor(**self.estimator_hyperparameters())
+		lr.coef_ = coefficients
+		lr.intercept_ = intercept
+		lr.n_features_in_ = X.shape[1]
+		lr.feature_names_in_ = np.asarray(X.columns, dtype=object)
 		return lr
-	
-	def predict_spread(self, prediction_set):	
+
+	def fit_and_score(self, X, y, sample_weight, X_test, y_test):
+		lr = self.fit(X, y, sample_weight)
+		# Same arithmetic as lr.predict and the sklearn metrics, without their input validation
+		errors = y_test.to_numpy() - (X_test.to_numpy() @ lr.coef_ + lr.intercept_)
+		metrics = {}
+		metrics['mean_absolute_error'] = round(float(np.mean(np.abs(errors))), 4)
+		metrics['root_mean_squared_error'] = round(float(np.sqrt(np.mean(errors ** 2))), 4)
+		importance = pd.DataFrame({
+			'feature': list(X.columns),
+			'coefficient': lr.coef_
+		}).sort_values('coefficient', ascending=False)
+		metrics['feature_coefficients']  = {
+			feature: round(coef, 4)
+			for feature, coef in zip(importance["feature"], importance["coefficient"])
+		}
+		return lr, metrics
+
+	def predict_values(self, prediction_set):
 		X_predict = prediction_set[self.team_specific_feature_columns].copy()
-		spread_predictions = self.lr_regressor.predict(X_predict)
-		# Add to dataframe for readability
-		results = prediction_set[['home_team', 'away_team']].copy()
-		results['home_team'] = results['home_team'].map(teams.pfr_team_to_odds_api_team)
-		results['away_team'] = results['away_team'].map(teams.pfr_team_to_odds_api_team)
-		prediction_data = prediction_set[self.team_specific_feature_columns].copy()
-		prediction_data.columns = prediction_data.columns.str.replace('team_a', 'home_team').str.replace('team_b', 'away_team')
-		results['prediction_data'] = prediction_data.apply(
-			lambda row: json.dumps(row.to_dict(), indent=2), axis=1
-		)
-		results['predicted_spread'] = spread_predictions
-		results['predicted_winner'] = results.apply(
-			lambda row: f"{ row['home_team'] }"
-			if row['predicted_spread'] < 0
-			else f"{ row['away_team'] }",
-			axis=1
-		)
-		results['prediction_text'] = results.apply(lambda row: f"{ row['predicted_winner'] } by { round(abs(row['predicted_spread'])) }", axis=1)
-		self.prediction_df = results
-		self.add_predictions_to_database()
-		results_obj = results.to_dict(orient="records")
-		self.model_output['results'] = results_obj
-		return results_obj
\ No newline at end of file
+		return self.lr_regressor.predict(X_predict), None
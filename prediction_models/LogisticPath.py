@@ -0,0 +1,73 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+from sklearn.linear_model import LogisticRegression as LogisticRegressor
+from data_sources.FeatureIndex import FeatureIndex
+from data_sources.FrameCache import FrameCache
+from .ColumnScaler import ColumnScaler
+
+class LogisticPath:
+	"""
+	Standardized columns and warm starts shared by LogisticRegression experiments.
+
+	Scalers come from the frame's ColumnScaler. A fit can start from an earlier
+	solution: the coefficients of the columns both fits share are carried over and
+	new columns start at zero, which saves lbfgs iterations whenever consecutive fits
+	are close (along a regularization path, the refit after the test pass, or
+	overlapping feature subsets). The last solution for each set of training rows and
+	target is kept so experiments with `warm_start` can start from their predecessor.
+	"""
+	__cache = FrameCache()
+	max_cached_solutions = 16
+
+	def __init__(self, feature_index, scaling):
+		self.feature_index = feature_index
+		self.scaling = scaling
+		self.solutions = OrderedDict()
+		self.lock = threading.Lock()
+
+	@classmethod
+	def for_frame(cls, frame):
+		"""Returns the cached engine for `frame`, building it on first use."""
+		return cls.__cache.get(frame, lambda: cls(FeatureIndex.for_frame(frame), ColumnScaler.for_frame(frame)))
+
+	def has_columns(self, columns):
+		return self.feature_index.has_columns(columns)
+
+	def scaler(self, rows, columns):
+		"""A fitted StandardScaler for `columns` over the rows labelled `rows`."""
+		return self.scaling.scaler(rows, columns)
+
+	def last_solution(self, rows, target):
+		"""The solution last remembered for these rows and target, or None."""
+		with self.lock:
+			return self.solutions.get((ColumnScaler.rows_key(rows), target))
+
+	def remember(self, rows, target, solution):
+		key = (ColumnScaler.rows_key(rows), target)
+		with self.lock:
+			self.solutions[key] = solution
+			self.solutions.move_to_end(key)
+			while len(self.solutions) > self.max_cached_solutions:
+				self.solutions.popitem(last = False)
+
+	@staticmethod
+	def fit(X, y, sample_weight, columns, hyperparameters, initial=None):
+		"""
+		A LogisticRegressor fit on the standardized `X`, starting from `initial` (a
+		solution(), possibly over other columns) instead of zeros when given.
+		"""
+		lg = LogisticRegressor(**hyperparameters)
+		if initial is not None:
+			start = dict(zip(initial[0], initial[1]))
+			lg.set_params(warm_start = True)
+			lg.coef_ = np.array([[start.get(col, 0.0) for col in columns]])
+			lg.intercept_ = np.array([initial[2]])
+		lg.fit(X, y, sample_weight = sample_weight)
+		lg.set_params(warm_start = hyperparameters.get('warm_start', False))
+		return lg
+
+	@staticmethod
+	def solution(lg, columns):
+		"""(columns, coefficients, intercept) of a fitted binary LogisticRegressor."""
+		return list(columns), lg.coef_[0].copy(), float(lg.intercept_[0])
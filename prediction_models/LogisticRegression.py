@@ -1,98 +1,103 @@
 from .PredictionModel import PredictionModel
-from sklearn.linear_model import LogisticRegression as LogisticRegressor
-from sklearn.model_selection import train_test_split
+from .LogisticPath import LogisticPath
 from sklearn.preprocessing import StandardScaler
-from utils.nfl import teams
-import time
-import json
+import numpy as np
 
 class LogisticRegression(PredictionModel):
-	def __init__(self, data_aggregate, target, feature_columns, prediction_set):
-		super().__init__(data_aggregate, target, feature_columns, prediction_set)
-		start = time.time()
-		self.model_output = { 'model_name': 'LogisticRegression', 'target': target }
-		self.lg_classifier = self.__train_model(self.training_features, test = True)
-		self.lg_classifier = self.__train_model(self.training_features)
-		self.model_output["train_time_in_seconds"] = round(time.time() - start, 2)
-			
-	def __train_model(self, features, test = False):
-		# Prep data
-		X = features.drop(['team_a_' + self.target], axis=1)
-		y = features['team_a_' + self.target]
-
-		# 🔒 Always sanitize before giving to XGBoost
-		X = self.sanitize_features(X, model = self.model_output["model_name"])
-
-		sample_weight = self.get_sample_weights(features, X)
-
-		X = X.drop(["season"], axis=1, errors="ignore")		
-
-		if(test):
-			X, X_test, y, y_test, w, w_test = train_test_split(
-				X, 
-				y,
-				sample_weight,
-				test_size = 0.2, 
-				random_state = 42
-			)
-			sample_weight = w
+	"""
+	Logistic regression on standardized features.
+
+	Scalers are shared across experiments (see LogisticPath) and the refit on all rows
+	starts from the test pass's solution. Setting `regularization_path` to a list of C
+	values also fits each of them in the test pass, strongest penalty first with every
+	fit starting from the previous solution, and reports their test accuracies in
+	model_output. The path's point at the model's own C is the main fit; the others
+	are within lbfgs's tolerance of a cold fit at their C, so their accuracies can
+	differ from one by a game or two. `warm_start` starts each experiment from the last solution on the
+	same rows; it's off by default because lbfgs stops within its tolerance of the
+	optimum, so results would depend on the order experiments ran in.
+	"""
+	estimator_attribute = 'lg_classifier'
+	default_hyperparameters = {
+		'C': 1.0,
+		'regularization_path': None
+	}
+
+	def __init__(self, data_aggregate, target, feature_columns, prediction_set, hyperparameters=None, train_fraction=1.0, refit=True, evaluate=True, evaluation=None, batch=None):
+		super().__init__(data_aggregate, target, feature_columns, prediction_set, hyperparameters, train_fraction, evaluation, batch)
+		# A lone fit (no test pass) has nothing to share the cached scaling with
+		self.path = self.__get_path(data_aggregate) if evaluate else None
+		self.train(evaluate, refit)
+
+	def __get_path(self, data_aggregate):
+		path = LogisticPath.for_frame(data_aggregate)
+		return path if path.has_columns(list(self.training_features.columns)) else None
+
+	def __estimator_parameters(self):
+		return { k: v for k, v in self.estimator_hyperparameters().items() if k != 'regularization_path' }
+
+	def fit(self, X, y, sample_weight):
+		# After a test pass, start from its solution
+		return self.__fit(X, y, sample_weight, start_from = self.lg_classifier)
+
+	def __shared(self, X):
+		return self.path is not None and not X.columns.duplicated().any()
+
+	def __fit(self, X, y, sample_weight, start_from = None):
+		shared = self.__shared(X)
 
 		# Scale
-		scaler = StandardScaler()
-		X = scaler.fit_transform(X)
-
-		# Train the model
-		lg = LogisticRegressor()
-		lg.fit(X, y, sample_weight = sample_weight)
-		
-		if(test):
-			X_test = scaler.fit_transform(X_test)
-			
-			# Evaluate
-			self.model_output['train_accuracy'] = round(lg.score(X, y), 4)
-			self.model_output['test_accuracy'] = round(lg.score(X_test, y_test), 4)
-			
-			# Confidence Calibration
-			predictions = lg.predict(X_test)
-			probabilities = lg.predict_proba(X_test)		
-			confidence = probabilities.max(axis=1)
-
-			self.model_output['confidence_intervals'] = []
-			for threshold in [0.6, 0.7, 0.8]:
-				mask = confidence > threshold
-				if mask.sum() > 0:
-					acc = round((predictions[mask] == y_test[mask]).mean(), 4)
-					pct = round(100 * mask.sum() / len(predictions), 4)
-					self.model_output['confidence_intervals'].append(
-						{ f"confidence_greater_than_{ threshold }": { 
-							"count_predictions": int(mask.sum()),
-							"accuracy": round(float(acc), 4)
-						}
-					})
+		scaler = self.path.scaler(X.index, X.columns) if shared else StandardScaler().fit(X)
+
+		# Train the model, from the test pass's solution or (with warm_start) the last experiment's
+		initial = None
+		if start_from is not None:
+			initial = LogisticPath.solution(start_from['model'], X.columns)
+		elif shared and self.hyperparameters.get('warm_start'):
+			initial = self.path.last_solution(X.index, y.name)
+		lg = LogisticPath.fit(self.scale(scaler, X, X.index, shared), y, sample_weight, list(X.columns), self.__estimator_parameters(), initial)
+		if shared:
+			self.path.remember(X.index, y.name, LogisticPath.solution(lg, X.columns))
 		return {'model': lg, 'scaler': scaler}
-	
-	def predict_winner(self, prediction_set):	
+
+	def fit_and_score(self, X, y, sample_weight, X_test, y_test):
+		classifier = self.__fit(X, y, sample_weight)
+		lg, scaler = classifier['model'], classifier['scaler']
+		shared = self.__shared(X)
+		X_scaled = self.scale(scaler, X, X.index, shared)
+		# Scaled with the training rows' statistics, the test rows never fit the scaler
+		X_test = self.scale(scaler, X_test, X.index, shared)
+
+		# Evaluate
+		metrics = {}
+		metrics['train_accuracy'] = round(float((lg.predict(X_scaled) == y.to_numpy()).mean()), 4)
+
+		# predict is the most probable class, so one pass gives predictions and confidence
+		probabilities = lg.predict_proba(X_test)
+		predictions = lg.classes_[probabilities.argmax(axis=1)]
+		metrics['test_accuracy'] = round(float((predictions == y_test.to_numpy()).mean()), 4)
+
+		path = sorted(self.hyperparameters['regularization_path'] or [])
+		if path:
+			metrics['regularization_path'] = {}
+			solution = None
+			for C in path:
+				if C == self.hyperparameters['C']:
+					# The main fit, so this point matches test_accuracy exactly rather than within lbfgs's tolerance
+					fitted = lg
+				else:
+					fitted = LogisticPath.fit(X_scaled, y, sample_weight, list(X.columns), { **self.__estimator_parameters(), 'C': C }, solution)
+				solution = LogisticPath.solution(fitted, X.columns)
+				metrics['regularization_path'][str(C)] = round(float((fitted.predict(X_test) == y_test.to_numpy()).mean()), 4)
+
+		# Confidence Calibration
+		metrics['confidence_intervals'] = self.confidence_intervals(predictions, probabilities, y_test)
+		return classifier, metrics
+
+	def predict_values(self, prediction_set):
 		X_predict = prediction_set[self.team_specific_feature_columns].copy()
 
 		X_predict = self.lg_classifier['scaler'].transform(X_predict)
-		win_predictions = self.lg_classifier['model'].predict(X_predict)
 		probabilities = self.lg_classifier['model'].predict_proba(X_predict)
-		# Add to dataframe for readability
-		results = prediction_set[['home_team', 'away_team']].copy()
-		results['home_team'] = results['home_team'].map(teams.pfr_team_to_odds_api_team)
-		results['away_team'] = results['away_team'].map(teams.pfr_team_to_odds_api_team)
-		prediction_data = prediction_set[self.team_specific_feature_columns].copy()
-		prediction_data.columns = prediction_data.columns.str.replace('team_a', 'home_team').str.replace('team_b', 'away_team')
-		results['prediction_data'] = prediction_data.apply(
-			lambda row: json.dumps(row.to_dict(), indent=2), axis=1
-		)
-		results['predicted_winner'] = results.apply(
-			lambda row: row['home_team'] if win_predictions[row.name] == 1 else row['away_team'],
-			axis=1
-		)
-		results['confidence'] = probabilities.max(axis=1)
-		self.prediction_df = results
-		self.add_predictions_to_database()
-		results_obj = results.to_dict(orient="records")
-		self.model_output['results'] = results_obj
-		return results_obj
\ No newline at end of file
+		win_predictions = self.lg_classifier['model'].classes_[probabilities.argmax(axis=1)]
+		return win_predictions, probabilities
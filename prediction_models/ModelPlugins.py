@@ -0,0 +1,125 @@
+import importlib
+
+class ModelPlugins:
+	"""
+	The prediction models the agents can use, by name.
+
+	A model is a PredictionModel subclass implementing fit, fit_and_score and
+	predict_values (see PredictionModel), registered here with the module that
+	defines it, the target it predicts by default and whether it's a regressor or a
+	classifier. Modules are only imported when their model is first used, since they
+	pull in xgboost and scikit-learn, so listing the models stays cheap.
+
+	A model also registers the hyperparameters it accepts: its `search_space`, the
+	ones HyperbandSearch samples as { name: (kind, *bounds) } with kind 'int',
+	'float', 'log' or 'choice', and its other `options`. Experiments may only set
+	those, anything else would reach the estimator's constructor.
+	"""
+	__models = {}
+
+	@classmethod
+	def register(cls, name, module, target, model_type, search_space=None, options=()):
+		"""Registers the PredictionModel subclass `name`, defined in `module`."""
+		if model_type not in ['regressor', 'classifier']:
+			raise ValueError(f"Unknown model type: { model_type }")
+		cls.__models[name] = {
+			'module': module,
+			'target': target,
+			'type': model_type,
+			'search_space': dict(search_space or {}),
+			'options': list(options)
+		}
+
+	@classmethod
+	def names(cls):
+		return list(cls.__models)
+
+	@classmethod
+	def describe(cls):
+		"""[{ name, type }] for every registered model."""
+		return [{ 'name': name, 'type': model['type'] } for name, model in cls.__models.items()]
+
+	@classmethod
+	def target(cls, name):
+		return cls.__plugin(name)['target']
+
+	@classmethod
+	def model_type(cls, name):
+		return cls.__plugin(name)['type']
+
+	@classmethod
+	def search_space(cls, name):
+		return dict(cls.__plugin(name)['search_space'])
+
+	@classmethod
+	def hyperparameters(cls, name):
+		"""Every hyperparameter `name` accepts, its search space's first."""
+		plugin = cls.__plugin(name)
+		return list(plugin['search_space']) + plugin['options']
+
+	@classmethod
+	def check_hyperparameters(cls, name, hyperparameters):
+		"""(accepted, rejected): `hyperparameters` split into the ones `name` accepts and the names of the others."""
+		allowed = cls.hyperparameters(name)
+		accepted = { k: v for k, v in (hyperparameters or {}).items() if k in allowed }
+		rejected = [k for k in (hyperparameters or {}) if k not in allowed]
+		return accepted, rejected
+
+	@classmethod
+	def get(cls, name):
+		"""The model class registered as `name`, importing its module on first use."""
+		plugin = cls.__plugin(name)
+		return getattr(importlib.import_module(plugin['module']), name)
+
+	@classmethod
+	def build(cls, name, data_aggregate, feature_columns, prediction_set, target=None, **options):
+		"""Trains the model `name` on its default target unless `target` is given."""
+		return cls.get(name)(data_aggregate, target or cls.target(name), feature_columns, prediction_set, **options)
+
+	@classmethod
+	def __plugin(cls, name):
+		plugin = cls.__models.get(name)
+		if plugin is None:
+			raise ValueError(f"Unknown model: { name }")
+		return plugin
+
+# Models that use recency sample weights accept their settings, see PredictionModel
+sample_weight_options = ['half_life', 'half_life_sweep']
+
+ModelPlugins.register('XGBoost', 'prediction_models.XGBoost', 'point_differential', 'regressor',
+	search_space = {
+		'n_estimators': ('int', 50, 600),
+		'max_depth': ('int', 2, 8),
+		'learning_rate': ('log', 0.01, 0.3),
+		'subsample': ('float', 0.5, 1.0),
+		'colsample_bytree': ('float', 0.5, 1.0),
+		'min_child_weight': ('log', 1.0, 20.0)
+	},
+	options = ['gamma', 'reg_alpha', 'reg_lambda', 'tree_method', 'n_jobs', 'early_stopping_rounds', 'validation_fraction', 'max_bin', *sample_weight_options]
+)
+ModelPlugins.register('LinearRegression', 'prediction_models.LinearRegression', 'point_differential', 'regressor',
+	options = ['fit_intercept', 'positive', *sample_weight_options]
+)
+ModelPlugins.register('RandomForest', 'prediction_models.RandomForest', 'point_differential', 'regressor',
+	search_space = {
+		'n_estimators': ('int', 50, 400),
+		'max_depth': ('choice', [None, 4, 6, 8, 12, 16]),
+		'min_samples_leaf': ('int', 1, 20),
+		'max_features': ('choice', [1.0, 0.5, 0.3, 'sqrt'])
+	},
+	options = ['n_jobs', 'bootstrap', *sample_weight_options]
+)
+ModelPlugins.register('LogisticRegression', 'prediction_models.LogisticRegression', 'win', 'classifier',
+	search_space = {
+		'C': ('log', 0.001, 100.0)
+	},
+	options = ['regularization_path', 'warm_start', 'max_iter', *sample_weight_options]
+)
+# KNearest can't weight its training rows, so it doesn't take the sample weight settings
+ModelPlugins.register('KNearest', 'prediction_models.KNearest', 'win', 'classifier',
+	search_space = {
+		'n_neighbors': ('int', 3, 75),
+		'weights': ('choice', ['uniform', 'distance'])
+	},
+	options = ['algorithm', 'n_jobs', 'n_neighbors_sweep']
+)
@@ -0,0 +1,95 @@
+import os
+import json
+import pickle
+import hashlib
+import sklearn
+import xgboost
+import pandas as pd
+from .PredictionModel import PredictionModel
+
+class ModelRegistry:
+	"""
+	On-disk cache of fitted prediction models.
+
+	Entries are keyed by model name, target, feature list, hyperparameters and a
+	fingerprint of the model's training rows, so a model is only retrained when one
+	of those changes. Each entry holds the fitted estimator (with its scaler, for the
+	classifiers), the column order it was trained on and its model_output metrics.
+	By default only the most recently saved entry per model name is kept, so entries
+	for last week's data or replaced best results don't pile up; `keep_latest=False`
+	keeps every entry (e.g. one per backtest week).
+	"""
+	def __init__(self, directory="results/model_registry", keep_latest=True):
+		self.directory = directory
+		self.keep_latest = keep_latest
+		os.makedirs(self.directory, exist_ok=True)
+
+	def load_or_train(self, model_class, data_aggregate, target, feature_columns, prediction_set, hyperparameters=None, retrain=False, **options):
+		"""
+		Returns (model, warm_started) with the model ready for predict.
+		`retrain` skips the lookup and overwrites the entry with a fresh fit. Any other
+		options (e.g. evaluate=False) are passed to the model's constructor.
+		"""
+		# Only assemble the features; the subclass __init__ is what trains
+		model = model_class.__new__(model_class)
+		PredictionModel.__init__(model, data_aggregate, target, feature_columns, prediction_set, hyperparameters)
+		key = self.key(model_class.__name__, model)
+
+		entry = None if retrain else self.__load(key)
+		if entry is not None:
+			setattr(model, model_class.estimator_attribute, entry["estimator"])
+			model.team_specific_feature_columns = entry["team_specific_feature_columns"]
+			model.model_output = dict(entry["model_output"])
+			return model, True
+
+		# Train the keyed instance, its features are already assembled
+		model_class.__init__(model, data_aggregate, target, feature_columns, prediction_set, hyperparameters, **options)
+		self.save(key, model)
+		return model, False
+
+	def key(self, model_name, model):
+		fingerprint = hashlib.sha256()
+		fingerprint.update(json.dumps({
+			"model_name": model_name,
+			"target": model.target,
+			"feature_columns": list(model.feature_columns),
+			"hyperparameters": model.hyperparameters,
+			"training_columns": list(model.training_features.columns),
+			# Pickles are only safe to load with the library versions that wrote them
+			"versions": [sklearn.__version__, xgboost.__version__]
+		}, sort_keys=True, default=str).encode())
+		fingerprint.update(pd.util.hash_pandas_object(model.training_features, index=True).values.tobytes())
+		return f"{ model_name }_{ fingerprint.hexdigest()[:32] }"
+
+	def save(self, key, model):
+		model_output = { k: v for k, v in model.model_output.items() if k != 'results' }
+		entry = {
+			"estimator": getattr(model, model.estimator_attribute),
+			"team_specific_feature_columns": list(model.team_specific_feature_columns),
+			"model_output": model_output
+		}
+		path = self.__path(key)
+		with open(path + ".tmp", "wb") as f:
+			pickle.dump(entry, f)
+		os.replace(path + ".tmp", path)
+		if not self.keep_latest:
+			return
+
+		model_name = key.rsplit("_", 1)[0]
+		for filename in os.listdir(self.directory):
+			if filename.startswith(f"{ model_name }_") and filename != os.path.basename(path):
+				os.remove(os.path.join(self.directory, filename))
+
+	def __load(self, key):
+		path = self.__path(key)
+		if not os.path.exists(path):
+			return None
+		try:
+			with open(path, "rb") as f:
+				return pickle.load(f)
+		except Exception:
+			# Unreadable entries are retrained and overwritten
+			return None
+
+	def __path(self, key):
+		return os.path.join(self.directory, f"{ key }.pkl")
@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import hashlib
+import sklearn
+import xgboost
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression as LinearRegressor, LogisticRegression as LogisticRegressor
+from sklearn.metrics import log_loss
+from utils.nfl import teams
+from .ModelPlugins import ModelPlugins
+
+class ModelStack:
+	"""
+	Blends the best models into one spread and one win probability per game.
+
+	The blend is learned on out-of-fold predictions: every season from the
+	`min_train_seasons`th on is predicted by each member fit only on the seasons
+	before it, as in WalkForwardBacktest. Each season's predictions are cached on
+	disk, keyed by the member's name, target, features and hyperparameters and a
+	fingerprint of the rows it was fit on and predicted, so a weekly rerun only
+	refits the members for the current season.
+
+	The spread is a non-negative blend of the regressors' spreads and the win
+	probability a logistic regression over those spreads and the classifiers'
+	log-odds. The blends' metrics in model_output are scored season by season, each
+	season by blends fit on the other seasons' out-of-fold predictions.
+	"""
+	model_name = 'Stacked'
+
+	def __init__(self, data_aggregate, directory="results/model_stack", min_train_seasons=3):
+		self.data_aggregate = data_aggregate
+		self.directory = directory
+		self.min_train_seasons = max(1, min_train_seasons)
+		os.makedirs(self.directory, exist_ok=True)
+		self.members = []
+		self.spread_blend = None
+		self.win_blend = None
+		self.model_output = { 'model_name': self.model_name }
+
+	def fit(self, best_results, prediction_set, log=None):
+		"""
+		Fits the blends over the out-of-fold predictions of the best results' models
+		(dicts with model_name, target, features_used and hyperparameters).
+		`log` is an optional callable for progress messages.
+		"""
+		start = time.time()
+		self.members = []
+		columns = {}
+		folds_loaded = folds_total = 0
+		for best in best_results:
+			name = best["model_name"]
+			predictions, loaded, total = self.out_of_fold(name, best["target"], best["features_used"], prediction_set, best.get("hyperparameters"))
+			folds_loaded += loaded
+			folds_total += total
+			if len(predictions) == 0:
+				continue
+			self.members.append(name)
+			columns[name] = predictions
+
+		# Only games every member predicted (and that have both results) can be blended
+		stacked = pd.DataFrame(columns).dropna()
+		outcomes = self.data_aggregate.loc[stacked.index, ['team_a_point_differential', 'team_a_win', 'season']].dropna()
+		stacked = stacked.loc[outcomes.index]
+		if len(stacked) == 0:
+			raise ValueError("No games with out-of-fold predictions from every member to stack")
+
+		spread_inputs, win_inputs = self.__inputs(stacked)
+		point_differential = outcomes['team_a_point_differential'].to_numpy(dtype=float)
+		win = outcomes['team_a_win'].to_numpy(dtype=int)
+		seasons = outcomes['season'].to_numpy()
+
+		self.model_output.update({
+			'members': list(self.members),
+			'rows': len(stacked),
+			'seasons': [int(seasons.min()), int(seasons.max())],
+			**self.__score(spread_inputs, win_inputs, point_differential, win, seasons),
+			'member_metrics': self.__member_metrics(stacked, point_differential, win)
+		})
+
+		self.spread_blend = self.__fit_spread(spread_inputs, point_differential)
+		self.win_blend = self.__fit_win(win_inputs, win)
+		regressors = self.__regressors()
+		if self.spread_blend is not None:
+			self.model_output['spread_weights'] = { name: round(float(w), 4) for name, w in zip(regressors, self.spread_blend.coef_) }
+		self.model_output['win_weights'] = { name: round(float(w), 4) for name, w in zip(regressors + self.__classifiers(), self.win_blend.coef_[0]) }
+		self.model_output['train_time_in_seconds'] = round(time.time() - start, 2)
+
+		if log is not None:
+			log(f"{ self.model_name }: blended { len(self.members) } models over { len(stacked) } games, { folds_loaded } of { folds_total } season folds loaded from the cache in { self.model_output['train_time_in_seconds'] }s")
+		return self
+
+	def out_of_fold(self, model_name, target, feature_columns, prediction_set, hyperparameters=None):
+		"""
+		(predictions, folds loaded, folds) for one member: a Series of its out-of-fold
+		spreads (regressors) or probabilities that team_a wins (classifiers), labelled
+		like the aggregate rows.
+		"""
+		# Only assemble the features, every fold is fit below
+		model = ModelPlugins.build(model_name, self.data_aggregate, feature_columns, prediction_set, target = target, hyperparameters = hyperparameters, evaluate = False, refit = False)
+		X, y, sample_weight = model.training_data()
+		seasons = model.training_features['season'].to_numpy()
+		row_hashes = pd.util.hash_pandas_object(model.training_features, index=False).to_numpy()
+		config = self.__config_key(model_name, model)
+
+		predicted = pd.Series(np.nan, index=model.training_features.index)
+		unique_seasons = np.unique(seasons)
+		folds = unique_seasons[self.min_train_seasons:]
+		loaded = 0
+		for season in folds:
+			train_rows = seasons < season
+			test_rows = seasons == season
+			fingerprint = hashlib.sha256(row_hashes[train_rows].tobytes())
+			if sample_weight is not None:
+				fingerprint.update(np.asarray(sample_weight)[train_rows].tobytes())
+			fingerprint.update(row_hashes[test_rows].tobytes())
+			path = os.path.join(self.directory, f"{ model_name }_{ config }_{ season }_{ fingerprint.hexdigest()[:32] }.npy")
+
+			values = self.__load(path)
+			if values is None:
+				values = self.__fit_fold(model, model_name, X, y, sample_weight, train_rows, test_rows)
+				self.__save(path, values)
+			else:
+				loaded += 1
+			predicted[test_rows] = values
+		return predicted.dropna(), loaded, len(folds)
+
+	def predict(self, prediction_set, member_predictions):
+		"""
+		Publishes the blended predictions for `prediction_set` into model_output, from
+		{ model_name: predict_values(prediction_set) } for every member.
+		"""
+		values = pd.DataFrame({
+			name: self.member_value(name, *member_predictions[name]) for name in self.members
+		}, index=prediction_set.index)
+		spread_inputs, win_inputs = self.__inputs(values)
+		home_win_probability = self.win_blend.predict_proba(win_inputs)[:, 1]
+
+		results = prediction_set[['home_team', 'away_team']].copy()
+		results['home_team'] = results['home_team'].map(teams.pfr_team_to_odds_api_team)
+		results['away_team'] = results['away_team'].map(teams.pfr_team_to_odds_api_team)
+		home_team = results['home_team'].to_numpy()
+		away_team = results['away_team'].to_numpy()
+		if self.spread_blend is not None:
+			spread = self.spread_blend.predict(spread_inputs)
+			home_picked = spread < 0
+			results['predicted_spread'] = spread
+			results['predicted_winner'] = np.where(home_picked, home_team, away_team)
+			margin = np.rint(np.abs(spread)).astype(int).astype(str)
+			results['prediction_text'] = results['predicted_winner'] + " by " + margin
+		else:
+			home_picked = home_win_probability >= 0.5
+			results['predicted_winner'] = np.where(home_picked, home_team, away_team)
+		results['home_win_probability'] = home_win_probability
+		# The picked winner's probability, under 50% when the classifiers outweigh the spread
+		results['confidence'] = np.where(home_picked, home_win_probability, 1 - home_win_probability)
+		results['member_predictions'] = [json.dumps(record) for record in values.round(4).to_dict(orient="records")]
+
+		results_obj = results.to_dict(orient="records")
+		self.model_output['results'] = results_obj
+		return results_obj
+
+	@staticmethod
+	def member_value(model_name, predictions, probabilities):
+		"""A member's input to the blends: its spread, or its probability that team_a wins."""
+		if ModelPlugins.model_type(model_name) == 'regressor':
+			return np.asarray(predictions, dtype=float)
+		# Columns are ordered like the classes, [team_a loses, team_a wins]
+		return np.asarray(probabilities, dtype=float)[:, -1]
+
+	def __fit_fold(self, model, model_name, X, y, sample_weight, train_rows, test_rows):
+		weights = None if sample_weight is None else np.asarray(sample_weight)[train_rows]
+		# Fits that warm start from the current estimator must start fresh every fold
+		setattr(model, model.estimator_attribute, None)
+		setattr(model, model.estimator_attribute, model.fit(X[train_rows], y[train_rows], weights))
+		predictions, probabilities = model.predict_values(model.training_features[test_rows])
+		return self.member_value(model_name, predictions, probabilities)
+
+	def __config_key(self, model_name, model):
+		return hashlib.sha256(json.dumps({
+			"model_name": model_name,
+			"target": model.target,
+			"feature_columns": list(model.feature_columns),
+			"hyperparameters": model.hyperparameters,
+			"training_columns": list(model.training_features.columns),
+			"versions": [sklearn.__version__, xgboost.__version__]
+		}, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+	def __load(self, path):
+		if not os.path.exists(path):
+			return None
+		try:
+			return np.load(path, allow_pickle=False)
+		except Exception:
+			# Unreadable folds are refit and overwritten
+			return None
+
+	def __save(self, path, values):
+		with open(path + ".tmp", "wb") as f:
+			np.save(f, values, allow_pickle=False)
+		os.replace(path + ".tmp", path)
+
+		# A season's fold is only ever needed for the latest rows, e.g. last week's is stale
+		fold = os.path.basename(path).rsplit("_", 1)[0]
+		for filename in os.listdir(self.directory):
+			if filename.startswith(f"{ fold }_") and filename != os.path.basename(path):
+				os.remove(os.path.join(self.directory, filename))
+
+	def __regressors(self):
+		return [name for name in self.members if ModelPlugins.model_type(name) == 'regressor']
+
+	def __classifiers(self):
+		return [name for name in self.members if ModelPlugins.model_type(name) == 'classifier']
+
+	def __inputs(self, values):
+		"""(spread blend inputs, win blend inputs) from member values, one column per member."""
+		regressors = values[self.__regressors()].to_numpy(dtype=float)
+		probabilities = np.clip(values[self.__classifiers()].to_numpy(dtype=float), 1e-6, 1 - 1e-6)
+		log_odds = np.log(probabilities / (1 - probabilities))
+		return regressors, np.hstack([regressors, log_odds])
+
+	def __fit_spread(self, spread_inputs, point_differential):
+		if spread_inputs.shape[1] == 0:
+			return None
+		return LinearRegressor(positive = True).fit(spread_inputs, point_differential)
+
+	def __fit_win(self, win_inputs, win):
+		return LogisticRegressor().fit(win_inputs, win)
+
+	def __score(self, spread_inputs, win_inputs, point_differential, win, seasons):
+		"""The blends' metrics, each season predicted by blends fit on the others."""
+		spread = np.full(len(win), np.nan)
+		home_win_probability = np.full(len(win), np.nan)
+		for season in np.unique(seasons):
+			test_rows = seasons == season
+			if test_rows.all():
+				break
+			train_rows = ~test_rows
+			spread_blend = self.__fit_spread(spread_inputs[train_rows], point_differential[train_rows])
+			if spread_blend is not None:
+				spread[test_rows] = spread_blend.predict(spread_inputs[test_rows])
+			home_win_probability[test_rows] = self.__fit_win(win_inputs[train_rows], win[train_rows]).predict_proba(win_inputs[test_rows])[:, 1]
+
+		metrics = {}
+		if np.isnan(home_win_probability).any():
+			# A single season has nothing to score the blends on
+			return metrics
+		if spread_inputs.shape[1] > 0:
+			metrics['mean_absolute_error'] = round(float(np.abs(spread - point_differential).mean()), 4)
+			metrics['root_mean_squared_error'] = round(float(np.sqrt(((spread - point_differential) ** 2).mean())), 4)
+		metrics['test_accuracy'] = round(float(((home_win_probability >= 0.5) == (win == 1)).mean()), 4)
+		metrics['log_loss'] = round(float(log_loss(win, home_win_probability, labels=[0, 1])), 4)
+		return metrics
+
+	def __member_metrics(self, stacked, point_differential, win):
+		"""Each member's out-of-fold metrics over the blended games, to compare the blends with."""
+		metrics = {}
+		for name in self.members:
+			values = stacked[name].to_numpy(dtype=float)
+			if ModelPlugins.model_type(name) == 'regressor':
+				metrics[name] = {
+					'mean_absolute_error': round(float(np.abs(values - point_differential).mean()), 4),
+					'test_accuracy': round(float(((values < 0) == (win == 1)).mean()), 4)
+				}
+			else:
+				metrics[name] = {
+					'test_accuracy': round(float(((values >= 0.5) == (win == 1)).mean()), 4),
+					'log_loss': round(float(log_loss(win, values, labels=[0, 1])), 4)
+				}
+		return metrics
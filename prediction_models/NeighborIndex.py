@@ -0,0 +1,103 @@
+import copy
+import threading
+from collections import OrderedDict
+from sklearn.neighbors import KNeighborsClassifier
+from data_sources.FeatureIndex import FeatureIndex
+from data_sources.FrameCache import FrameCache
+from .ColumnScaler import ColumnScaler
+
+class NeighborIndex:
+	"""
+	Standardized features and fitted neighbor searches shared by KNearest experiments.
+
+	Scalers come from the frame's ColumnScaler, so each feature subset's scaling is a
+	slice of statistics computed once per set of training rows. The fitted classifier
+	(its KD-tree, or the rows for a brute force search) and the training rows' own
+	neighbor lists are cached per feature subset, so experiments that only change
+	n_neighbors or weights skip both the fit and the costliest query. Row sets are
+	identified by a hash of their labels.
+	"""
+	__cache = FrameCache()
+	max_cached_trees = 64
+	max_cached_graphs = 16
+	max_tree_features = 6
+
+	def __init__(self, feature_index, scaling):
+		self.feature_index = feature_index
+		self.scaling = scaling
+		self.trees = OrderedDict()
+		self.graphs = OrderedDict()
+		self.lock = threading.Lock()
+
+	@classmethod
+	def for_frame(cls, frame):
+		"""Returns the cached index for `frame`, building it on first use."""
+		return cls.__cache.get(frame, lambda: cls(FeatureIndex.for_frame(frame), ColumnScaler.for_frame(frame)))
+
+	@classmethod
+	def algorithm(cls, hyperparameters, num_features):
+		"""
+		Resolves algorithm='auto'. On a few thousand standardized rows a KD-tree only
+		beats brute force for a handful of features; past that it's several times slower.
+		"""
+		algorithm = hyperparameters.get('algorithm', 'auto')
+		if algorithm == 'auto':
+			return 'kd_tree' if num_features <= cls.max_tree_features else 'brute'
+		return algorithm
+
+	def has_columns(self, columns):
+		return self.feature_index.has_columns(columns)
+
+	def scaler(self, rows, columns):
+		"""A fitted StandardScaler for `columns` over the rows labelled `rows`."""
+		return self.scaling.scaler(rows, columns)
+
+	def classifier(self, rows, X_scaled, y, columns, hyperparameters):
+		"""
+		A fitted KNeighborsClassifier with `hyperparameters`, sharing the cached tree
+		for these rows and columns when there is one.
+		"""
+		tree_parameters = self.__tree_parameters(hyperparameters, columns)
+		key = self.__tree_key(rows, y, columns, tree_parameters)
+		with self.lock:
+			fitted = self.trees.get(key)
+			if fitted is not None:
+				self.trees.move_to_end(key)
+		if fitted is None:
+			fitted = KNeighborsClassifier(**tree_parameters).fit(X_scaled, y)
+			with self.lock:
+				self.trees[key] = fitted
+				while len(self.trees) > self.max_cached_trees:
+					self.trees.popitem(last = False)
+
+		# Shallow copy: the tree and training data are shared, the query settings are not
+		kn = copy.copy(fitted)
+		kn.set_params(**{ k: v for k, v in hyperparameters.items() if k in ['n_neighbors', 'weights', 'n_jobs'] })
+		return kn
+
+	def training_neighbors(self, rows, kn, X_scaled, y, columns, hyperparameters, n_neighbors):
+		"""
+		(distances, indices) of each training row's `n_neighbors` nearest training rows,
+		itself included, as kn.kneighbors(X_scaled) returns them. A longer cached list is
+		sliced, since the first n neighbors don't depend on how many were asked for.
+		"""
+		key = self.__tree_key(rows, y, columns, self.__tree_parameters(hyperparameters, columns))
+		with self.lock:
+			graph = self.graphs.get(key)
+			if graph is not None:
+				self.graphs.move_to_end(key)
+		if graph is None or graph[0].shape[1] < n_neighbors:
+			graph = kn.kneighbors(X_scaled, n_neighbors = n_neighbors)
+			with self.lock:
+				self.graphs[key] = graph
+				while len(self.graphs) > self.max_cached_graphs:
+					self.graphs.popitem(last = False)
+		return graph[0][:, :n_neighbors], graph[1][:, :n_neighbors]
+
+	def __tree_parameters(self, hyperparameters, columns):
+		tree_parameters = { k: v for k, v in hyperparameters.items() if k not in ['n_neighbors', 'weights', 'n_jobs', 'n_neighbors_sweep'] }
+		tree_parameters['algorithm'] = self.algorithm(hyperparameters, len(columns))
+		return tree_parameters
+
+	def __tree_key(self, rows, y, columns, tree_parameters):
+		return (ColumnScaler.rows_key(rows), tuple(columns), y.name, repr(sorted(tree_parameters.items())))
@@ -1,30 +1,105 @@
 import pandas as pd
 import numpy as np
 import sqlite3
+import json
+import time
+import warnings
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy.stats import norm
+from sklearn.model_selection import GroupKFold, train_test_split
+from data_sources.FeatureIndex import FeatureIndex
+from .RecencyWeights import RecencyWeights
+from utils.nfl import teams
 
 class PredictionModel:
-	def __init__(self, data_aggregate, target, feature_columns, prediction_set):
+	"""
+	Base class of the prediction models (see ModelPlugins for the registered ones).
+
+	A subclass sets `estimator_attribute` (where its fitted estimator is kept) and
+	implements fit, fit_and_score and predict_values; its __init__ then calls
+	train(evaluate, refit). Feature assembly, data prep, the evaluation modes and
+	publishing predictions are shared here.
+	"""
+	default_hyperparameters = {}
+	estimator_attribute = None
+	# Models that ignore sample weights skip computing them and warn about half_life / half_life_sweep
+	uses_sample_weights = True
+
+	# Sample weights decay with a game's age in seasons, halving every `half_life`
+	# seasons. The half-life and `half_life_sweep` (more half-lives whose test
+	# metrics are reported in model_output) are read from the hyperparameters and
+	# never passed to the estimators, see estimator_hyperparameters.
+	default_half_life = 6.0
+	sample_weight_hyperparameters = ['half_life', 'half_life_sweep']
+
+	# How the test pass scores a model:
+	#   holdout:   one shuffled 80/20 split (random_state 42)
+	#   season:    `folds` folds that each hold out whole seasons
+	#   expanding: the last `folds` seasons, each scored by a model trained on every earlier season
+	# Folds run on `jobs` threads (-1 for every core) with single-threaded estimators;
+	# with more than one fold each metric is the mean across folds and gets a matching `<metric>_variance`.
+	evaluation_modes = ['holdout', 'season', 'expanding']
+	default_evaluation = {
+		'mode': 'holdout',
+		'folds': 5,
+		'jobs': -1
+	}
+
+	# Classifiers report their accuracy on the test predictions above each confidence
+	confidence_thresholds = [0.6, 0.7, 0.8]
+
+	def __init__(self, data_aggregate, target, feature_columns, prediction_set, hyperparameters=None, train_fraction=1.0, evaluation=None, batch=None):
 		self.target = target
+		# Data prep shared with the other experiments of an ExperimentBatch group
+		self.batch = batch
+		self.hyperparameters = { **self.default_hyperparameters, **(hyperparameters or {}) }
+		ignored = [name for name in self.sample_weight_hyperparameters if name in self.hyperparameters]
+		if ignored and not self.uses_sample_weights:
+			warnings.warn(f"{ type(self).__name__ } does not use sample weights, ignoring { ignored }")
+			self.hyperparameters = { name: value for name, value in self.hyperparameters.items() if name not in ignored }
+		self.evaluation = { **self.default_evaluation, **(evaluation or {}) }
+		if self.evaluation['mode'] not in self.evaluation_modes:
+			raise ValueError(f"Unknown evaluation mode: { self.evaluation['mode'] }")
+		self.train_fraction = train_fraction
+		# Set while evaluate fits folds in parallel, see estimator_hyperparameters
+		self.parallel_folds = False
 		self.feature_columns = feature_columns
 		self.team_specific_feature_columns = self.__get_team_specific_feature_columns(self.feature_columns)
-		self.training_features = self.__prepare_features(data_aggregate, prediction=False)
-		self.prediction_features = self.__prepare_features(prediction_set, prediction=True)
+		# ModelRegistry assembles the features to key its entries and then trains that
+		# same instance, so they're only assembled again when the inputs changed
+		assembled_for = (id(data_aggregate), id(prediction_set), tuple(self.team_specific_feature_columns), batch)
+		if getattr(self, 'assembled_for', None) != assembled_for:
+			self.training_features = self.__prepare_features(data_aggregate, prediction=False)
+			self.prediction_features = self.__prepare_features(prediction_set, prediction=True)
+			self.assembled_for = assembled_for
+		self.recency = RecencyWeights.for_frame(data_aggregate) if self.uses_sample_weights else None
 		self.prediction_df = pd.DataFrame
+		self.model_output = { 'model_name': type(self).__name__, 'target': target, 'hyperparameters': self.hyperparameters }
 
 	def __prepare_features(self, aggregate_data, prediction=False):
 		feature_columns = self.team_specific_feature_columns.copy()
 		feature_columns.append("season")
 		#if(prediction):
 		#	feature_columns.remove(["team_a_" + self.target])
+		if self.batch is not None and not prediction:
+			return self.batch.training_features(feature_columns)
+		feature_index = FeatureIndex.for_frame(aggregate_data)
+		if feature_index.has_columns(feature_columns):
+			return feature_index.frame(feature_columns)
 		features = aggregate_data[feature_columns].copy()
 		features = features.dropna()
 		return features
 	
 	def __get_team_specific_feature_columns(self, prediction_columns=False):
+		return self.team_specific_columns(self.target, self.feature_columns, prediction_columns)
+
+	@staticmethod
+	def team_specific_columns(target, feature_columns, prediction_columns=False):
+		"""The team_a_ / team_b_ columns of `feature_columns`, led by team_a_<target> with `prediction_columns`."""
 		team_specific_feature_columns = []
 		if prediction_columns:
-			team_specific_feature_columns.append("team_a_" + self.target)
-		for col in self.feature_columns:
+			team_specific_feature_columns.append("team_a_" + target)
+		for col in feature_columns:
 			if "_away" not in col:
 				team_specific_feature_columns.append("team_a_" + col)
 			if "_home" not in col:
@@ -33,9 +108,150 @@ class PredictionModel:
 	
 	def add_predictions_to_database(self):
 		conn = sqlite3.connect("db/historical_data.db")
+		# Spread and win predictions have different columns, the table is created with the first one's
+		columns = [row[1] for row in conn.execute("PRAGMA table_info(predictons)").fetchall()]
+		if columns:
+			for column in self.prediction_df.columns.difference(columns, sort=False):
+				conn.execute(f'ALTER TABLE predictons ADD COLUMN "{ column }"')
 		self.prediction_df.to_sql('predictons', conn, if_exists = "append", index=False)
 		conn.close()
 
+	def train(self, evaluate=True, refit=True):
+		"""
+		Runs the test pass (`evaluate`, its metrics go to model_output) and the fit on
+		every training row (`refit`), keeping the last fitted estimator.
+		"""
+		start = time.time()
+		X, y, sample_weight = self.training_data()
+		seasons = self.training_features['season']
+		setattr(self, self.estimator_attribute, None)
+		if evaluate:
+			estimator, metrics = self.test_pass(X, y, sample_weight, seasons)
+			self.model_output.update(metrics)
+			setattr(self, self.estimator_attribute, estimator)
+			if self.uses_sample_weights and self.hyperparameters.get('half_life_sweep'):
+				self.model_output['half_life_sweep'] = self.__sweep_half_lives(X, y, seasons)
+		if refit:
+			setattr(self, self.estimator_attribute, self.fit(X, y, sample_weight))
+		self.model_output["train_time_in_seconds"] = round(time.time() - start, 2)
+
+	def training_data(self):
+		"""(X, y, sample_weight) for the training rows, with duplicate columns and season dropped from X."""
+		features = self.training_features
+		if self.batch is not None:
+			# One slice of the shared rows instead of two more copies of the features
+			X = self.batch.slice([col for col in features.columns if col not in ['team_a_' + self.target, 'season']])
+		else:
+			X = features.drop(['team_a_' + self.target], axis=1)
+		y = features['team_a_' + self.target]
+
+		# 🔒 Always sanitize before giving to XGBoost
+		X = self.sanitize_features(X, model = self.model_output["model_name"])
+
+		sample_weight = self.get_sample_weights(features, X) if self.uses_sample_weights else None
+
+		if "season" in X.columns:
+			X = X.drop(["season"], axis=1)
+		return X, y, sample_weight
+
+	def estimator_hyperparameters(self):
+		"""
+		The hyperparameters without the sample weight ones, for the estimators. While
+		evaluate runs folds on several threads each estimator gets n_jobs 1, so the
+		folds and the estimators' own threads don't oversubscribe the cores.
+		"""
+		hyperparameters = { k: v for k, v in self.hyperparameters.items() if k not in self.sample_weight_hyperparameters }
+		if self.parallel_folds and 'n_jobs' in hyperparameters:
+			hyperparameters['n_jobs'] = 1
+		return hyperparameters
+
+	def scale(self, scaler, X, fitted_rows, shared):
+		"""
+		scaler.transform(X), for a scaler fitted on the rows labelled `fitted_rows`. In a
+		batch, `shared` scalers (from the frame's ColumnScaler) scale the group's columns
+		once and every member takes its columns' slice.
+		"""
+		if self.batch is None or not shared:
+			return scaler.transform(X)
+		return self.batch.scaled(fitted_rows, X)
+
+	def fit(self, X, y, sample_weight):
+		"""Returns the estimator fitted on X, y."""
+		raise NotImplementedError
+
+	def fit_and_score(self, X, y, sample_weight, X_test, y_test):
+		"""Returns (estimator, metrics) for a model fitted on X, y and scored on X_test, y_test."""
+		raise NotImplementedError
+
+	def predict(self, prediction_set):
+		"""Predicts and publishes the spreads (regressors) or winners (classifiers) of `prediction_set`."""
+		return self.publish_values(prediction_set, self.predict_values(prediction_set))
+
+	def publish_values(self, prediction_set, values):
+		"""Publishes the (predictions, probabilities) of predict_values for `prediction_set`."""
+		predictions, probabilities = values
+		if probabilities is None:
+			return self.publish_results(prediction_set, spread_predictions=predictions)
+		return self.publish_results(prediction_set, win_predictions=predictions, probabilities=probabilities)
+
+	def publish_results(self, prediction_set, spread_predictions=None, win_predictions=None, probabilities=None):
+		"""
+		Builds the readable results for spread predictions or for win predictions and
+		their probabilities with column operations, saves them to the predictions
+		table and adds them to model_output.
+		"""
+		results = prediction_set[['home_team', 'away_team']].copy()
+		results['home_team'] = results['home_team'].map(teams.pfr_team_to_odds_api_team)
+		results['away_team'] = results['away_team'].map(teams.pfr_team_to_odds_api_team)
+
+		# Serialized feature payload, one common dtype per row as when it was built from row Series
+		prediction_data = prediction_set[self.team_specific_feature_columns]
+		columns = prediction_data.columns.str.replace('team_a', 'home_team').str.replace('team_b', 'away_team')
+		records = pd.DataFrame(prediction_data.to_numpy(), columns=columns).to_dict(orient="records")
+		results['prediction_data'] = [json.dumps(record, indent=2) for record in records]
+
+		home_team = results['home_team'].to_numpy()
+		away_team = results['away_team'].to_numpy()
+		if spread_predictions is not None:
+			results['predicted_spread'] = spread_predictions
+			results['predicted_winner'] = np.where(spread_predictions < 0, home_team, away_team)
+			margin = np.rint(np.abs(spread_predictions)).astype(int).astype(str)
+			results['prediction_text'] = results['predicted_winner'] + " by " + margin
+			win_probabilities = self.win_probabilities(spread_predictions)
+			if win_probabilities is not None:
+				results['confidence'] = win_probabilities.max(axis=1)
+		else:
+			results['predicted_winner'] = np.where(win_predictions == 1, home_team, away_team)
+			results['confidence'] = probabilities.max(axis=1)
+
+		self.prediction_df = results
+		self.add_predictions_to_database()
+		results_obj = results.to_dict(orient="records")
+		self.model_output['results'] = results_obj
+		return results_obj
+
+	def win_probabilities(self, spread_predictions):
+		"""
+		Win probabilities implied by spread predictions, columns ordered like the
+		classifiers' classes ([team_a loses, team_a wins]), or None until a test pass
+		has measured the spread error. The actual point differential is taken as normal
+		around the prediction, scaled by the test pass's root_mean_squared_error (the
+		zero-mean normal fitted to the held out residuals), so team_a wins with
+		probability P(point_differential < 0) = Φ(-spread / rmse).
+		"""
+		rmse = self.model_output.get('root_mean_squared_error')
+		if not rmse:
+			return None
+		team_a_wins = norm.cdf(-np.asarray(spread_predictions, dtype=np.float64) / rmse)
+		return np.column_stack([1 - team_a_wins, team_a_wins])
+
+	def predict_values(self, prediction_set):
+		"""
+		Raw predictions for `prediction_set` without publishing them: (spreads, None) for
+		the regressors, (win predictions, class probabilities) for the classifiers.
+		"""
+		raise NotImplementedError
+
 	def sanitize_features(self, df, model):
 		"""
 		Ensure columns are unique and log any duplicates the moment they appear.
@@ -59,18 +275,170 @@ class PredictionModel:
 		df = df.loc[:, ~dup_mask].copy()
 		return df
 	
+	def apply_train_fraction(self, *arrays):
+		"""
+		Keep only the first `train_fraction` of the (already shuffled) training rows.
+		Used for cheap partial fits when searching hyperparameters.
+		"""
+		if self.train_fraction >= 1.0:
+			return arrays
+		n = max(1, int(np.ceil(len(arrays[0]) * self.train_fraction)))
+		return tuple(self.__take(a, slice(0, n)) for a in arrays)
+
+	def evaluation_splits(self, seasons):
+		"""(train positions, test positions) for each fold of the evaluation mode."""
+		if self.batch is not None:
+			key = ('evaluation_splits', self.evaluation['mode'], self.evaluation['folds'])
+			return self.batch.shared(key, lambda: self.__evaluation_splits(seasons))
+		return self.__evaluation_splits(seasons)
+
+	def __evaluation_splits(self, seasons):
+		positions = np.arange(len(seasons))
+		mode = self.evaluation['mode']
+		if mode == 'holdout':
+			# Same rows, in the same order, as train_test_split on the data itself
+			return [tuple(train_test_split(positions, test_size = 0.2, random_state = 42))]
+
+		seasons = np.asarray(seasons)
+		unique_seasons = np.unique(seasons)
+		if mode == 'season':
+			folds = GroupKFold(n_splits = min(self.evaluation['folds'], len(unique_seasons)))
+			return list(folds.split(positions, groups = seasons))
+		return [
+			(positions[seasons < season], positions[seasons == season])
+			for season in unique_seasons[1:][-self.evaluation['folds']:]
+		]
+
+	def test_pass(self, X, y, sample_weight, seasons):
+		"""(estimator, metrics) of the test pass, see evaluate."""
+		return self.evaluate(X, y, sample_weight, seasons, self.fit_and_score)
+
+	def evaluate(self, X, y, sample_weight, seasons, fit_and_score):
+		"""
+		Runs the test pass in the configured evaluation mode and returns the estimator
+		of the last fold and the metrics, averaged across folds when there are several.
+		`fit_and_score(X, y, sample_weight, X_test, y_test)` fits one fold and returns
+		(estimator, metrics).
+		"""
+		def run_fold(train_rows, test_rows):
+			X_train, y_train, w_train = self.apply_train_fraction(
+				self.__take(X, train_rows), self.__take(y, train_rows), self.__take(sample_weight, train_rows)
+			)
+			return fit_and_score(X_train, y_train, w_train, self.__take(X, test_rows), self.__take(y, test_rows))
+
+		splits = self.evaluation_splits(seasons)
+		if len(splits) == 1 or effective_n_jobs(self.evaluation['jobs']) == 1:
+			folds = [run_fold(train_rows, test_rows) for train_rows, test_rows in splits]
+		else:
+			# Estimators release the GIL while fitting, so threads avoid copying the data
+			self.parallel_folds = True
+			try:
+				folds = Parallel(n_jobs = self.evaluation['jobs'], prefer = "threads")(
+					delayed(run_fold)(train_rows, test_rows) for train_rows, test_rows in splits
+				)
+			finally:
+				self.parallel_folds = False
+
+		fold_metrics = [metrics for _, metrics in folds]
+		if len(fold_metrics) == 1:
+			return folds[-1][0], fold_metrics[0]
+		metrics = self.__merge_fold_metrics(fold_metrics)
+		metrics['evaluation'] = { 'mode': self.evaluation['mode'], 'folds': len(fold_metrics) }
+		return folds[-1][0], metrics
+
+	def __sweep_half_lives(self, X, y, seasons):
+		"""
+		{ half-life: test metric } for each half_life_sweep value, from test passes on
+		the same rows and splits with only the sample weights changed. The metric is
+		the mean absolute error for regressors and the test accuracy for classifiers.
+		"""
+		sweep = {}
+		for half_life in sorted(self.hyperparameters['half_life_sweep']):
+			_, metrics = self.test_pass(X, y, self.recency_weights(X.index, half_life), seasons)
+			metric = 'mean_absolute_error' if 'mean_absolute_error' in metrics else 'test_accuracy'
+			sweep[str(half_life)] = metrics[metric]
+		return sweep
+
+	def confidence_intervals(self, predictions, probabilities, actual):
+		"""
+		Count and accuracy of the predictions whose top class probability is above each
+		of the confidence_thresholds, all thresholds in one vectorized pass.
+		"""
+		thresholds = np.asarray(self.confidence_thresholds)
+		above = probabilities.max(axis=1)[:, None] > thresholds
+		correct = (np.asarray(predictions) == np.asarray(actual))[:, None]
+		counts = above.sum(axis=0)
+		hits = (above & correct).sum(axis=0)
+		return [
+			{ f"confidence_greater_than_{ threshold }": {
+				"count_predictions": int(count),
+				"accuracy": round(float(hit / count), 4)
+			} }
+			for threshold, count, hit in zip(self.confidence_thresholds, counts, hits)
+			if count > 0
+		]
+
+	def __merge_fold_metrics(self, fold_metrics):
+		merged = {}
+		for key, value in fold_metrics[0].items():
+			values = [metrics[key] for metrics in fold_metrics]
+			if isinstance(value, dict):
+				# Feature importances / coefficients, averaged per feature
+				means = pd.DataFrame(values).mean().sort_values(ascending=False)
+				merged[key] = { feature: round(float(mean), 4) for feature, mean in means.items() }
+			elif isinstance(value, list):
+				merged[key] = self.__merge_confidence_intervals(values)
+			else:
+				merged[key] = round(float(np.mean(values)), 4)
+				merged[key + '_variance'] = round(float(np.var(values, ddof=1)), 6)
+		return merged
+
+	def __merge_confidence_intervals(self, fold_intervals):
+		# Pool the predictions above each threshold across folds
+		totals = {}
+		for intervals in fold_intervals:
+			for interval in intervals:
+				for threshold, stats in interval.items():
+					count, correct = totals.get(threshold, (0, 0.0))
+					totals[threshold] = (count + stats['count_predictions'], correct + stats['accuracy'] * stats['count_predictions'])
+		return [
+			{ threshold: {
+				"count_predictions": count,
+				"accuracy": round(correct / count, 4)
+			} }
+			for threshold, (count, correct) in sorted(totals.items())
+		]
+
+	def __take(self, values, rows):
+		if values is None:
+			return None
+		return values.iloc[rows] if hasattr(values, "iloc") else values[rows]
+
 	def get_sample_weights(self, features, X):
 		# RECENCY DECAY
-		current_season = features['season'].max()
-		age_years = current_season - features['season']
-
-		half_life = 6.0 # tweak this (in seasons)
-		lam = np.log(2) / half_life
-		sample_weight = np.exp(-lam * age_years)
-		sample_weight = sample_weight.loc[X.index]
+		half_life = self.hyperparameters.get('half_life') or self.default_half_life
+		sample_weight = self.recency_weights(X.index, half_life, features)
 		
 		# ✅ Drop season so model never sees it
 		X = X.drop(["season"], axis=1, errors="ignore")
 		self.team_specific_feature_columns = list(X.columns)
 
 		return sample_weight
+
+	def recency_weights(self, rows, half_life, features=None):
+		"""Recency sample weights of the training rows labelled `rows` for `half_life` (in seasons)."""
+		if self.batch is not None:
+			# Every member of a batch group has the same training rows
+			return self.batch.shared(('sample_weights', half_life), lambda: self.__recency_weights(rows, half_life, features))
+		return self.__recency_weights(rows, half_life, features)
+
+	def __recency_weights(self, rows, half_life, features):
+		if self.recency is not None:
+			return self.recency.sample_weights(rows, half_life)
+
+		features = self.training_features if features is None else features
+		current_season = features['season'].max()
+		age_years = current_season - features['season']
+		lam = np.log(2) / half_life
+		sample_weight = np.exp(-lam * age_years)
+		return sample_weight.loc[rows]
@@ -0,0 +1,50 @@
+import hashlib
+import threading
+import numpy as np
+import xgboost as xgb
+from collections import OrderedDict
+from data_sources.FrameCache import FrameCache
+
+class QuantileMatrices:
+	"""
+	XGBoost training matrices over one aggregates frame.
+
+	A QuantileDMatrix (the `hist` tree method's pre-binned input) is built once per
+	set of training rows, sample weights, columns and max_bin, so experiments that
+	share a feature set and split (e.g. a hyperparameter search) bin the data once.
+	Row sets are identified by a hash of the row labels and weights, as in
+	LinearGram, so a lookup never reads the feature values. The matrices are
+	released with their frame.
+	"""
+	__cache = FrameCache()
+	max_cached_matrices = 32
+
+	def __init__(self):
+		self.matrices = OrderedDict()
+		self.lock = threading.Lock()
+
+	@classmethod
+	def for_frame(cls, frame):
+		"""Returns the cached matrices of `frame`, empty on first use."""
+		return cls.__cache.get(frame, cls)
+
+	def matrix(self, X, y, sample_weight, max_bin):
+		"""The QuantileDMatrix of X, y and sample_weight, rows and columns of this engine's frame."""
+		fingerprint = hashlib.sha1()
+		fingerprint.update(np.ascontiguousarray(X.index.to_numpy()).tobytes())
+		if sample_weight is not None:
+			fingerprint.update(np.ascontiguousarray(sample_weight, dtype=np.float64).tobytes())
+		key = (fingerprint.hexdigest(), tuple(X.columns), y.name, max_bin)
+
+		with self.lock:
+			matrix = self.matrices.get(key)
+			if matrix is not None:
+				self.matrices.move_to_end(key)
+				return matrix
+
+		matrix = xgb.QuantileDMatrix(X, label = y, weight = sample_weight, max_bin = max_bin)
+		with self.lock:
+			self.matrices[key] = matrix
+			while len(self.matrices) > self.max_cached_matrices:
+				self.matrices.popitem(last = False)
+		return matrix
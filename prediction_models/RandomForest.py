@@ -1,89 +1,93 @@
 from .PredictionModel import PredictionModel
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import numpy as np
 import pandas as pd
-from utils.nfl import teams
-import time
-import json
 
 class RandomForest(PredictionModel):
-	def __init__(self, data_aggregate, target, feature_columns, prediction_set):
-		start = time.time()
-		super().__init__(data_aggregate, target, feature_columns, prediction_set)
-		self.model_output = { 'model_name': 'RandomForest', 'target': target }
-		self.rf_regressor = self.__train_model(self.training_features, test = True)
-		self.rf_regressor = self.__train_model(self.training_features)
-		self.model_output["train_time_in_seconds"] = round(time.time() - start, 2)
-			
-	def __train_model(self, features, test = False):
-		# Prep data
-		X = features.drop(['team_a_' + self.target], axis=1)
-		y = features['team_a_' + self.target]
-		
-		# 🔒 Always sanitize before giving to XGBoost
-		X = self.sanitize_features(X, model = self.model_output["model_name"])
+	"""
+	Random forest regressor trained on every core, seeded like the other models.
 
-		sample_weight = self.get_sample_weights(features, X)
+	In the holdout evaluation mode the forest is fit once on all rows and scored on
+	its out-of-bag predictions (each row predicted only by the trees that didn't see
+	it), so there is no separate 80/20 fit followed by a refit, unless the test pass
+	only used a `train_fraction` of the rows. The season and expanding modes, and
+	bootstrap=False, still score on held out folds.
+	"""
+	estimator_attribute = 'rf_regressor'
+	default_hyperparameters = {
+		'n_estimators': 100,
+		'max_depth': None,
+		'min_samples_leaf': 1,
+		'max_features': 1.0,
+		'n_jobs': -1
+	}
 
-		X = X.drop(["season"], axis=1, errors="ignore")		
+	def __init__(self, data_aggregate, target, feature_columns, prediction_set, hyperparameters=None, train_fraction=1.0, refit=True, evaluate=True, evaluation=None, batch=None):
+		super().__init__(data_aggregate, target, feature_columns, prediction_set, hyperparameters, train_fraction, evaluation, batch)
+		self.train(evaluate, refit)
 
-		if(test):
-			X, X_test, y, y_test, w, w_test = train_test_split(
-				X, 
-				y,
-				sample_weight,
-				test_size = 0.2, 
-				random_state = 42
-			)
-			sample_weight = w
+	def train(self, evaluate=True, refit=True):
+		# A full-budget out-of-bag fit is already on every row, so it's also the refit
+		super().train(evaluate, refit and not (evaluate and self.__scores_out_of_bag() and self.train_fraction >= 1.0))
 
-		# Train the model
-		rf = RandomForestRegressor()
+	def test_pass(self, X, y, sample_weight, seasons):
+		if not self.__scores_out_of_bag():
+			return super().test_pass(X, y, sample_weight, seasons)
+		return self.__fit_and_score_out_of_bag(X, y, sample_weight)
+
+	def __scores_out_of_bag(self):
+		return self.evaluation['mode'] == 'holdout' and self.hyperparameters.get('bootstrap', True)
+
+	def fit(self, X, y, sample_weight):
+		return self.__fit(X, y, sample_weight)
+
+	def __fit(self, X, y, sample_weight, oob_score = False):
+		rf = RandomForestRegressor(**self.estimator_hyperparameters(), oob_score = oob_score, random_state = 42)
 		rf.fit(X, y, sample_weight = sample_weight)
-		
-		if test:
-			predictions = rf.predict(X_test)
-			self.model_output['mean_absolute_error'] = round(mean_absolute_error(y_test, predictions), 4)
-			self.model_output['root_mean_squared_error'] = round(float(np.sqrt(mean_squared_error(y_test, predictions))), 4)
-			importance = pd.DataFrame({
-				'feature': list(X.columns),
-				'importance': rf.feature_importances_
-			}).sort_values('importance', ascending=False)
-			self.model_output['feature_importance']  = {
-				feature: round(imp, 4)
-				for feature, imp in zip(importance["feature"], importance["importance"])
-			}
-			#self.model_output['feature_importance'] = dict(zip(importance["feature"], importance["importance"]))
-		
 		return rf
-	
-	def predict_spread(self, prediction_set):	
-		X_predict = prediction_set[self.team_specific_feature_columns].copy()
-		
-		spread_predictions = self.rf_regressor.predict(X_predict)
 
-		# Add to dataframe for readability
-		results = prediction_set[['home_team', 'away_team']].copy()
-		results['home_team'] = results['home_team'].map(teams.pfr_team_to_odds_api_team)
-		results['away_team'] = results['away_team'].map(teams.pfr_team_to_odds_api_team)
-		prediction_data = prediction_set[self.team_specific_feature_columns].copy()
-		prediction_data.columns = prediction_data.columns.str.replace('team_a', 'home_team').str.replace('team_b', 'away_team')
-		results['prediction_data'] = prediction_data.apply(
-			lambda row: json.dumps(row.to_dict(), indent=2), axis=1
-		)
-		results['predicted_spread'] = spread_predictions
-		results['predicted_winner'] = results.apply(
-			lambda row: f"{ row['home_team'] }"
-			if row['predicted_spread'] < 0
-			else f"{ row['away_team'] }",
-			axis=1
-		)
-		results['prediction_text'] = results.apply(lambda row: f"{ row['predicted_winner'] } by { round(abs(row['predicted_spread'])) }", axis=1)
-		self.prediction_df = results
-		self.add_predictions_to_database()
+	def __fit_and_score_out_of_bag(self, X, y, sample_weight):
+		if self.train_fraction < 1.0:
+			# Partial fits take a random subset, the rows are in date order
+			rows = np.random.RandomState(42).permutation(len(X))
+			X, y, sample_weight = self.apply_train_fraction(X.iloc[rows], y.iloc[rows], sample_weight.iloc[rows])
 
-		results_obj = results.to_dict(orient="records")
-		self.model_output['results'] = results_obj
-		return results_obj
\ No newline at end of file
+		rf = self.__fit(X, y, sample_weight, oob_score = True)
+
+		# Rows that were in every tree's bootstrap sample have no out-of-bag prediction
+		predictions = rf.oob_prediction_
+		scored = np.isfinite(predictions)
+		metrics = {}
+		metrics['mean_absolute_error'] = round(mean_absolute_error(y[scored], predictions[scored]), 4)
+		metrics['root_mean_squared_error'] = round(float(np.sqrt(mean_squared_error(y[scored], predictions[scored]))), 4)
+		importance = pd.DataFrame({
+			'feature': list(X.columns),
+			'importance': rf.feature_importances_
+		}).sort_values('importance', ascending=False)
+		metrics['feature_importance']  = {
+			feature: round(imp, 4)
+			for feature, imp in zip(importance["feature"], importance["importance"])
+		}
+		metrics['evaluation'] = { 'mode': 'out_of_bag', 'rows': int(scored.sum()) }
+		return rf, metrics
+
+	def fit_and_score(self, X, y, sample_weight, X_test, y_test):
+		rf = self.__fit(X, y, sample_weight)
+		predictions = rf.predict(X_test)
+		metrics = {}
+		metrics['mean_absolute_error'] = round(mean_absolute_error(y_test, predictions), 4)
+		metrics['root_mean_squared_error'] = round(float(np.sqrt(mean_squared_error(y_test, predictions))), 4)
+		importance = pd.DataFrame({
+			'feature': list(X.columns),
+			'importance': rf.feature_importances_
+		}).sort_values('importance', ascending=False)
+		metrics['feature_importance']  = {
+			feature: round(imp, 4)
+			for feature, imp in zip(importance["feature"], importance["importance"])
+		}
+		return rf, metrics
+
+	def predict_values(self, prediction_set):
+		X_predict = prediction_set[self.team_specific_feature_columns].copy()
+		return self.rf_regressor.predict(X_predict), None
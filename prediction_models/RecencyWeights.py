@@ -0,0 +1,58 @@
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from data_sources.FeatureIndex import FeatureIndex
+from data_sources.FrameCache import FrameCache
+
+class RecencyWeights:
+	"""
+	Exponential recency sample weights for the rows of one aggregates frame.
+
+	A game `age` seasons before the current season weighs exp(-ln(2) / half_life * age).
+	Ages only depend on the season column, so the weight of every row of the frame is
+	computed once per (half-life, current season) and a model's training rows take
+	theirs by position, which lets a half-life sweep reuse the same rows and seasons.
+	"""
+	__cache = FrameCache()
+	max_cached_weights = 16
+
+	def __init__(self, feature_index):
+		self.feature_index = feature_index
+		self.seasons = feature_index.values[feature_index.positions['season']].astype(np.float64)
+		self.weights = OrderedDict()
+		self.lock = threading.Lock()
+
+	@classmethod
+	def for_frame(cls, frame):
+		"""Returns the cached weights for `frame`, building them on first use."""
+		return cls.__cache.get(frame, lambda: cls.__build(frame))
+
+	@classmethod
+	def __build(cls, frame):
+		feature_index = FeatureIndex.for_frame(frame)
+		# Rows are looked up by label, which needs a season column and unique labels
+		if feature_index.has_columns(['season']) and feature_index.index.is_unique:
+			return cls(feature_index)
+		return None
+
+	def sample_weights(self, rows, half_life):
+		"""
+		Weights of the rows labelled `rows`, aged from the latest season among them,
+		as a Series labelled like the rows.
+		"""
+		positions = self.feature_index.index.get_indexer(rows)
+		current_season = self.seasons[positions].max()
+		key = (float(half_life), float(current_season))
+		with self.lock:
+			weights = self.weights.get(key)
+			if weights is not None:
+				self.weights.move_to_end(key)
+		if weights is None:
+			lam = np.log(2) / half_life
+			weights = np.exp(-lam * (current_season - self.seasons))
+			with self.lock:
+				self.weights[key] = weights
+				while len(self.weights) > self.max_cached_weights:
+					self.weights.popitem(last = False)
+		return pd.Series(weights[positions], index=rows, name='season')
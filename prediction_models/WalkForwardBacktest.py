@@ -0,0 +1,135 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+
+class WalkForwardBacktest:
+	"""
+	Walk-forward backtest over the historical weeks of an aggregates frame.
+
+	For every week from `start_season` to `end_season`, a model is trained only on
+	games from earlier weeks and then predicts that week's games. The aggregates are
+	already point-in-time (rolling stats are shifted by one game and ELO / RPI are read
+	before each result is applied), so every week is sliced out of a single
+	DataAggregate build instead of rebuilding the aggregates week by week.
+
+	`retrain_every` reuses a fitted model for that many weeks before refitting, and an
+	optional ModelRegistry (use keep_latest=False) stores each week's fit so reruns
+	with the same features and hyperparameters load models instead of training them.
+	"""
+	def __init__(self, aggregates, start_season=None, end_season=None, retrain_every=1, registry=None, retrain=False):
+		self.aggregates = aggregates
+		self.start_season = start_season if start_season is not None else int(aggregates['season'].min()) + 1
+		self.end_season = end_season if end_season is not None else int(aggregates['season'].max())
+		self.retrain_every = max(1, retrain_every)
+		self.registry = registry
+		self.retrain = retrain
+
+		# Sortable week number, e.g. 201503 for week 3 of 2015
+		self.week_keys = (aggregates['season'].astype(int) * 100 + aggregates['season_week_number'].astype(int)).to_numpy()
+
+	def weeks(self):
+		"""The week keys that get predicted, in order."""
+		seasons = self.week_keys // 100
+		in_range = (seasons >= self.start_season) & (seasons <= self.end_season)
+		return np.unique(self.week_keys[in_range])
+
+	def run(self, model_class, target, feature_columns, hyperparameters=None, log=None):
+		"""
+		Walks forward through weeks() and returns one row per game predicted, with the
+		actual result, the prediction and the size of the training set behind it.
+		`log` is an optional callable for progress messages.
+		"""
+		rows = []
+		model = None
+		fitted_week = None
+		models_loaded = 0
+		weeks = self.weeks()
+		start = time.time()
+
+		for i, week in enumerate(weeks):
+			games = self.aggregates[self.week_keys == week]
+
+			if model is None or i - fitted_week >= self.retrain_every:
+				training = self.aggregates[self.week_keys < week]
+				if len(training) == 0:
+					continue
+				model, loaded = self.__fit(model_class, training, target, feature_columns, games, hyperparameters)
+				models_loaded += loaded
+				fitted_week = i
+				trained_through = int(self.week_keys[self.week_keys < week].max())
+
+			# Only games with every feature (and the result) available can be scored
+			columns = list(dict.fromkeys(model.team_specific_feature_columns + ['team_a_' + target]))
+			games = games[games[columns].notna().all(axis=1)]
+			if len(games) == 0:
+				continue
+
+			predictions, probabilities = model.predict_values(games)
+			rows.append(self.__week_results(model, target, games, predictions, probabilities, trained_through))
+
+			season_done = i + 1 == len(weeks) or weeks[i + 1] // 100 != week // 100
+			if log is not None and season_done:
+				log(f"{ model_class.__name__ }: backtested through season { week // 100 } in { round(time.time() - start, 1) }s")
+
+		if log is not None:
+			log(f"{ model_class.__name__ }: backtested { len(weeks) } weeks in { round(time.time() - start, 1) }s, loaded { models_loaded } fitted models from the registry")
+
+		if not rows:
+			return pd.DataFrame()
+		results = pd.concat(rows, ignore_index=True)
+		results['features_used'] = json.dumps(feature_columns)
+		results['hyperparameters'] = json.dumps(model.hyperparameters)
+		return results
+
+	def __fit(self, model_class, training, target, feature_columns, games, hyperparameters):
+		if self.registry is not None:
+			return self.registry.load_or_train(
+				model_class, training, target, feature_columns, games, hyperparameters,
+				retrain = self.retrain, evaluate = False
+			)
+		return model_class(training, target, feature_columns, games, hyperparameters, evaluate = False), False
+
+	def __week_results(self, model, target, games, predictions, probabilities, trained_through):
+		actual = games['team_a_' + target].to_numpy(dtype=float)
+		results = pd.DataFrame({
+			'model_name': model.model_output['model_name'],
+			'target': target,
+			'season': games['season'].to_numpy(dtype=int),
+			'week': games['season_week_number'].to_numpy(dtype=int),
+			'event_id': games['event_id'].astype(str).to_numpy(),
+			'home_team': games['home_team'].astype(str).to_numpy(),
+			'away_team': games['away_team'].astype(str).to_numpy(),
+			'actual': actual,
+			'prediction': np.asarray(predictions, dtype=float),
+			'train_rows': len(model.training_features),
+			'trained_through': trained_through
+		})
+
+		# A negative point differential or a team_a win means the home team won
+		if probabilities is None:
+			results['confidence'] = np.nan
+			results['predicted_home_win'] = results['prediction'] < 0
+			results['home_win'] = actual < 0
+			results['absolute_error'] = np.abs(results['prediction'] - actual)
+		else:
+			results['confidence'] = probabilities.max(axis=1)
+			results['predicted_home_win'] = results['prediction'] == 1
+			results['home_win'] = actual == 1
+			results['absolute_error'] = np.nan
+		results['correct'] = results['predicted_home_win'] == results['home_win']
+		return results
+
+	@staticmethod
+	def summarize(results):
+		"""Games, winner accuracy and (for spread models) MAE / RMSE per model and target."""
+		if len(results) == 0:
+			return pd.DataFrame()
+		results = results.assign(squared_error=results['absolute_error'] ** 2)
+		summary = results.groupby(['model_name', 'target']).agg(
+			games = ('event_id', 'size'),
+			accuracy = ('correct', 'mean'),
+			mean_absolute_error = ('absolute_error', 'mean'),
+			root_mean_squared_error = ('squared_error', lambda x: np.sqrt(x.mean()))
+		)
+		return summary.round(4).reset_index()
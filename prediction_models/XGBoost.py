@@ -1,94 +1,107 @@
 from .PredictionModel import PredictionModel
+from .QuantileMatrices import QuantileMatrices
 from xgboost import XGBRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error
+import xgboost as xgb
 import numpy as np
 import pandas as pd
-from utils.nfl import teams
-import time
-import json
 
 class XGBoost(PredictionModel):
-	def __init__(self, data_aggregate, target, feature_columns, prediction_set):
-		super().__init__(data_aggregate, target, feature_columns, prediction_set)
-		start = time.time()
-		self.model_output = { 'model_name': 'XGBoost', 'target': target }
-		self.xgb_regressor = self.__train_model(self.training_features, test = True)
-		self.xgb_regressor = self.__train_model(self.training_features)
-		self.model_output['train_time_in_seconds'] = round(time.time() - start, 2)
-			
-	def __train_model(self, features, test = False):
-		# Prep data
-		X = features.drop(['team_a_' + self.target], axis=1)
-		y = features['team_a_' + self.target]
-		
-		# 🔒 Always sanitize before giving to XGBoost
-		X = self.sanitize_features(X, model = self.model_output["model_name"])
-		
-		sample_weight = self.get_sample_weights(features, X)
+	"""
+	Gradient boosted trees trained through the native xgboost API.
 
-		X = X.drop(["season"], axis=1, errors="ignore")
+	Training matrices are QuantileDMatrix objects (the `hist` tree method's pre-binned
+	input) cached per frame by QuantileMatrices, so experiments that share a feature
+	set and split (e.g. a hyperparameter search) bin the data once.
 
-		
-		if(test):
-			X, X_test, y, y_test, w, w_test = train_test_split(
-				X, 
-				y,
-				sample_weight,
-				test_size=0.2, 
-				random_state=42
-			)
-		else:
-			w = sample_weight
-			X_test = y_test = w_test = None
-		
-		# Train the model
-		xgb = XGBRegressor(
-			n_estimators = 100,
-			max_depth = 5,
-			learning_rate = 0.1,
+	Setting `early_stopping_rounds` turns on early stopping: each test-pass fit holds
+	out a random `validation_fraction` of its training rows and stops once validation
+	error hasn't improved for that many rounds, with `n_estimators` as the cap. The
+	refit on all rows then uses the number of trees the test pass settled on.
+	"""
+	estimator_attribute = 'xgb_regressor'
+	default_hyperparameters = {
+		'n_estimators': 100,
+		'max_depth': 5,
+		'learning_rate': 0.1,
+		'tree_method': 'hist',
+		'n_jobs': -1,
+		'early_stopping_rounds': None,
+		'validation_fraction': 0.1
+	}
+
+	def __init__(self, data_aggregate, target, feature_columns, prediction_set, hyperparameters=None, train_fraction=1.0, refit=True, evaluate=True, evaluation=None, batch=None):
+		super().__init__(data_aggregate, target, feature_columns, prediction_set, hyperparameters, train_fraction, evaluation, batch)
+		self.matrices = QuantileMatrices.for_frame(data_aggregate)
+		self.train(evaluate, refit)
+
+	def fit(self, X, y, sample_weight):
+		return self.__fit(X, y, sample_weight, self.model_output.get('best_n_estimators'))
+
+	def __fit(self, X, y, sample_weight, num_boost_round=None):
+		params = self.__booster_params()
+		early_stopping_rounds = self.hyperparameters['early_stopping_rounds']
+		if num_boost_round is not None or not early_stopping_rounds:
+			dtrain = self.__matrix(X, y, sample_weight)
+			return xgb.train(params, dtrain, num_boost_round = int(round(num_boost_round or self.hyperparameters['n_estimators'])))
+
+		X, X_val, y, y_val, sample_weight, w_val = train_test_split(
+			X,
+			y,
+			sample_weight,
+			test_size = self.hyperparameters['validation_fraction'],
 			random_state = 42
 		)
-		
-		xgb.fit(X, y, sample_weight=w)
-		
-		if(test):
-			predictions = xgb.predict(X_test)
-			self.model_output['mean_absolute_error'] = round(mean_absolute_error(y_test, predictions), 4)
-			self.model_output['root_mean_squared_error'] = round(float(np.sqrt(mean_squared_error(y_test, predictions))), 4)
-			importance = pd.DataFrame({
-				'feature': list(X.columns),
-				'importance': xgb.feature_importances_
-			}).sort_values('importance', ascending=False)
-			self.model_output['feature_importance']  = {
-				feature: round(imp, 4)
-				for feature, imp in zip(importance["feature"], importance["importance"])
-			}
-				
-		return xgb
-	
-	def predict_spread(self, prediction_set):	
-		X_predict = prediction_set[self.team_specific_feature_columns].copy()
-		spread_predictions = self.xgb_regressor.predict(X_predict)
-		# Add to dataframe for readability
-		results = prediction_set[['home_team', 'away_team']].copy()
-		results['home_team'] = results['home_team'].map(teams.pfr_team_to_odds_api_team)
-		results['away_team'] = results['away_team'].map(teams.pfr_team_to_odds_api_team)
-		prediction_data = prediction_set[self.team_specific_feature_columns].copy()
-		prediction_data.columns = prediction_data.columns.str.replace('team_a', 'home_team').str.replace('team_b', 'away_team')
-		results['prediction_data'] = prediction_data.apply(
-			lambda row: json.dumps(row.to_dict(), indent=2), axis=1
-		)
-		results['predicted_spread'] = spread_predictions
-		results['predicted_winner'] = results.apply(
-			lambda row: f"{ row['home_team'] }"
-			if row['predicted_spread'] < 0
-			else f"{ row['away_team'] }",
-			axis=1
+		dtrain = self.__matrix(X, y, sample_weight)
+		dvalidation = xgb.QuantileDMatrix(X_val, label = y_val, weight = w_val, ref = dtrain)
+		booster = xgb.train(
+			params,
+			dtrain,
+			num_boost_round = self.hyperparameters['n_estimators'],
+			evals = [(dvalidation, 'validation')],
+			early_stopping_rounds = early_stopping_rounds,
+			verbose_eval = False
 		)
-		results['prediction_text'] = results.apply(lambda row: f"{ row['predicted_winner'] } by { round(abs(row['predicted_spread'])) }", axis=1)
-		self.prediction_df = results
-		self.add_predictions_to_database()
-		results_obj = results.to_dict(orient="records")
-		self.model_output['results'] = results_obj
-		return results_obj
\ No newline at end of file
+		# Keep only the trees up to the best validation round
+		return booster[: booster.best_iteration + 1]
+
+	def fit_and_score(self, X, y, sample_weight, X_test, y_test):
+		booster = self.__fit(X, y, sample_weight)
+		predictions = booster.inplace_predict(X_test)
+		metrics = {}
+		metrics['mean_absolute_error'] = round(mean_absolute_error(y_test, predictions), 4)
+		metrics['root_mean_squared_error'] = round(float(np.sqrt(mean_squared_error(y_test, predictions))), 4)
+		if self.hyperparameters['early_stopping_rounds']:
+			metrics['best_n_estimators'] = booster.num_boosted_rounds()
+		importance = pd.DataFrame({
+			'feature': list(X.columns),
+			'importance': self.__feature_importances(booster, X.columns)
+		}).sort_values('importance', ascending=False)
+		metrics['feature_importance']  = {
+			feature: round(imp, 4)
+			for feature, imp in zip(importance["feature"], importance["importance"])
+		}
+		return booster, metrics
+
+	def __booster_params(self):
+		# Let the scikit-learn wrapper translate its parameter names into booster params
+		hyperparameters = {
+			k: v for k, v in self.estimator_hyperparameters().items()
+			if k not in ['n_estimators', 'early_stopping_rounds', 'validation_fraction']
+		}
+		return XGBRegressor(**hyperparameters, random_state = 42).get_xgb_params()
+
+	def __feature_importances(self, booster, columns):
+		# Normalized total gain, as XGBRegressor.feature_importances_ reports it
+		score = booster.get_score(importance_type = 'gain')
+		importances = np.array([score.get(col, 0.0) for col in columns], dtype=np.float32)
+		total = importances.sum()
+		return importances / total if total > 0 else importances
+
+	def __matrix(self, X, y, sample_weight):
+		return self.matrices.matrix(X, y, sample_weight, self.hyperparameters.get('max_bin', 256))
+
+	def predict_values(self, prediction_set):
+		X_predict = prediction_set[self.team_specific_feature_columns].copy()
+		return self.xgb_regressor.inplace_predict(X_predict), None
@@ -0,0 +1,23 @@
+CREATE TABLE IF NOT EXISTS backtest (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    backtest_id TEXT,
+    model_name TEXT,
+    target TEXT,
+    season INTEGER,
+    week INTEGER,
+    event_id TEXT,
+    home_team TEXT,
+    away_team TEXT,
+    actual REAL,
+    prediction REAL,
+    confidence REAL,
+    predicted_home_win INTEGER,
+    home_win INTEGER,
+    correct INTEGER,
+    absolute_error REAL,
+    train_rows INTEGER,
+    trained_through INTEGER,
+    features_used TEXT,
+    hyperparameters TEXT,
+    created TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
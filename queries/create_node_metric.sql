@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS node_metric (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent_id TEXT,
+    graph TEXT,
+    node TEXT,
+    wall_time_in_seconds REAL,
+    cpu_time_in_seconds REAL,
+    peak_rss_mb REAL,
+    rss_growth_mb REAL,
+    llm_tokens INTEGER,
+    error TEXT,
+    created TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,13 @@
+SELECT
+    id,
+    model_name,
+    features_used,
+    mean_absolute_error,
+    test_accuracy
+FROM
+    result
+WHERE
+    id > ? AND
+    agent_id = ?
+ORDER BY
+    id
@@ -0,0 +1,24 @@
+INSERT INTO
+    backtest (
+        backtest_id,
+        model_name,
+        target,
+        season,
+        week,
+        event_id,
+        home_team,
+        away_team,
+        actual,
+        prediction,
+        confidence,
+        predicted_home_win,
+        home_win,
+        correct,
+        absolute_error,
+        train_rows,
+        trained_through,
+        features_used,
+        hyperparameters
+    )
+VALUES
+    (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -0,0 +1,14 @@
+INSERT INTO
+    node_metric (
+        agent_id,
+        graph,
+        node,
+        wall_time_in_seconds,
+        cpu_time_in_seconds,
+        peak_rss_mb,
+        rss_growth_mb,
+        llm_tokens,
+        error
+    )
+VALUES
+    (?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -11,7 +11,8 @@ INSERT INTO
         feature_importance,
         feature_coefficients,
         confidence_intervals,
-        agent_id
+        agent_id,
+        hyperparameters
     )
 VALUES
     ({values})
\ No newline at end of file
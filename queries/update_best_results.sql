@@ -0,0 +1,18 @@
+UPDATE
+    best_result
+SET
+    target = ?,
+    train_time_in_seconds = ?,
+    features_used = ?,
+    mean_absolute_error = ?,
+    root_mean_squared_error = ?,
+    train_accuracy = ?,
+    test_accuracy = ?,
+    feature_importance = ?,
+    feature_coefficients = ?,
+    confidence_intervals = ?,
+    agent_id = ?,
+    hyperparameters = ?,
+    last_updated = CURRENT_TIMESTAMP
+WHERE
+    model_name = ?
@@ -1,3 +1,9 @@
+# Internal Libraries
+from utils.arguments import scrape_arguments
+
+# Parse arguments before loading anything heavy so --help returns immediately
+args = scrape_arguments().parse_args()
+
 print("Loading dependencies...\n")
 
 # Graphs
@@ -6,5 +12,9 @@ from graphs.scrape_graph import app
 # Internal Libraries
 import setup # Loads launch states, sets preferences from .env, enables argument parsing
 
+# Render the graph image only when asked, drawing goes through a remote renderer
+if args.draw_graphs:
+    app.get_graph().draw_mermaid_png(output_file_path="graphs/images/scrape_graph.png")
+
 # Run the app
-app.invoke({})
\ No newline at end of file
+app.invoke({})
@@ -8,7 +8,7 @@ def ensure_dir(path: str):
     Path(path).mkdir(parents=True, exist_ok=True)
 
 # Output directories needed for project
-directories = ["db", "results", "logs", "logs/scrape", "logs/predict", "logs/optimize"]
+directories = ["db", "results", "logs", "logs/scrape", "logs/predict", "logs/optimize", "logs/tune", "logs/backtest", "graphs/images"]
 
 # Loop through directories and create them if htey don't exist
 for directory in directories:
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+def make_aggregates(rows=400, seasons=10, seed=0):
+    """A small aggregates frame: two features per team, both targets and a season per game."""
+    rng = np.random.default_rng(seed)
+    elo = rng.normal(size=(rows, 2))
+    rpi = rng.normal(size=(rows, 2))
+    point_differential = 6 * (elo[:, 1] - elo[:, 0]) + 3 * (rpi[:, 1] - rpi[:, 0]) + rng.normal(scale=10, size=rows)
+    return pd.DataFrame({
+        'season': np.repeat(np.arange(2000, 2000 + seasons), rows // seasons),
+        'team_a_elo_rating': elo[:, 0],
+        'team_b_elo_rating': elo[:, 1],
+        'team_a_rpi_rating': rpi[:, 0],
+        'team_b_rpi_rating': rpi[:, 1],
+        'team_a_point_differential': np.round(point_differential),
+        # team_a wins when it's ahead, i.e. its point differential is negative
+        'team_a_win': (point_differential < 0).astype(int)
+    })
+
+def make_correlated_aggregates(rows=2000, features=6, seasons=10, seed=0):
+    """
+    Aggregates whose features are noisy copies of one rating per team, with a weak
+    signal, so many test games sit near a 50% prediction.
+    """
+    rng = np.random.default_rng(seed)
+    rating = rng.normal(size=(rows, 2))
+    columns = { 'season': np.repeat(np.arange(2000, 2000 + seasons), rows // seasons) }
+    for i in range(features):
+        columns[f'team_a_f{ i }'] = rating[:, 0] + rng.normal(scale=0.3 * (1 + i), size=rows)
+        columns[f'team_b_f{ i }'] = rating[:, 1] + rng.normal(scale=0.3 * (1 + i), size=rows)
+    point_differential = 2 * (rating[:, 1] - rating[:, 0]) + rng.normal(scale=10, size=rows)
+    columns['team_a_point_differential'] = np.round(point_differential)
+    columns['team_a_win'] = (point_differential < 0).astype(int)
+    return pd.DataFrame(columns)
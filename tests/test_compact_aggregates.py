@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from data_sources.DataAggregate import DataAggregate
+from prediction_models.ModelPlugins import ModelPlugins
+from tests.frames import make_correlated_aggregates
+
+FEATURES = [f'f{ i }' for i in range(6)]
+TEAMS = [f'team_{ i }' for i in range(32)]
+
+def make_game_aggregates(rows=2000, seed=0):
+    """Correlated aggregates with the id, team and date columns DataAggregate builds."""
+    aggregates = make_correlated_aggregates(rows=rows, seed=seed)
+    rng = np.random.default_rng(seed)
+    teams = np.array([rng.choice(TEAMS, size=2, replace=False) for _ in range(rows)])
+    aggregates['event_id'] = [f'{ season }_{ i }' for i, season in enumerate(aggregates['season'])]
+    aggregates['team_a'] = aggregates['home_team'] = teams[:, 0]
+    aggregates['team_b'] = aggregates['away_team'] = teams[:, 1]
+    aggregates['date'] = [f'{ season }-10-01' for season in aggregates['season']]
+    return aggregates
+
+class CompactAggregatesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.full = make_game_aggregates()
+        cls.compact = DataAggregate.compact(cls.full)
+
+    @classmethod
+    def tearDownClass(cls):
+        # Release the frames so the per-frame caches are empty for the other tests
+        del cls.full, cls.compact
+
+    def test_smaller_frame(self):
+        self.assertEqual(self.compact[[f'team_a_{ feature }' for feature in FEATURES]].dtypes.unique().tolist(), [np.float32])
+        self.assertLess(self.compact.memory_usage(deep=True).sum(), 0.6 * self.full.memory_usage(deep=True).sum())
+
+    def test_metric_drift(self):
+        # float32 features may move a test game or two across 50% and a spread by rounding
+        test_games = len(self.full) // 5
+        for name in ModelPlugins.names():
+            full, compact = [
+                ModelPlugins.build(name, aggregates, FEATURES, aggregates, refit = False).model_output
+                for aggregates in [self.full, self.compact]
+            ]
+            if ModelPlugins.model_type(name) == 'regressor':
+                self.assertAlmostEqual(compact['mean_absolute_error'], full['mean_absolute_error'], delta = 0.01 * full['mean_absolute_error'], msg = name)
+            else:
+                self.assertAlmostEqual(compact['test_accuracy'], full['test_accuracy'], delta = 2 / test_games + 1e-9, msg = name)
+
+if __name__ == '__main__':
+    unittest.main()
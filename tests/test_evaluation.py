@@ -0,0 +1,37 @@
+import unittest
+from prediction_models.RandomForest import RandomForest
+from tests.frames import make_aggregates
+
+FEATURES = ['elo_rating', 'rpi_rating']
+
+class RecordingForest(RandomForest):
+    """A RandomForest that records the n_jobs of the forests of its folds and its refit."""
+    def fit_and_score(self, X, y, sample_weight, X_test, y_test):
+        estimator, metrics = super().fit_and_score(X, y, sample_weight, X_test, y_test)
+        self.fold_jobs.append(estimator.n_jobs)
+        return estimator, metrics
+
+    def fit(self, X, y, sample_weight):
+        estimator = super().fit(X, y, sample_weight)
+        self.refit_jobs = estimator.n_jobs
+        return estimator
+
+    def train(self, evaluate=True, refit=True):
+        self.fold_jobs = []
+        super().train(evaluate, refit)
+
+class FoldThreadsTest(unittest.TestCase):
+    def fitted_jobs(self, jobs):
+        aggregates = make_aggregates()
+        model = RecordingForest(aggregates, 'point_differential', FEATURES, aggregates, { 'n_estimators': 10 }, evaluation = { 'mode': 'season', 'folds': 3, 'jobs': jobs })
+        return model.fold_jobs + [model.refit_jobs]
+
+    def test_parallel_folds_fit_single_threaded_estimators(self):
+        # Three folds on two threads, then the refit on every row keeps every core
+        self.assertEqual(self.fitted_jobs(2), [1, 1, 1, -1])
+
+    def test_sequential_folds_keep_the_estimator_threads(self):
+        self.assertEqual(self.fitted_jobs(1), [-1, -1, -1, -1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from pydantic import ValidationError
+from models.experiments_model import Experiment
+from prediction_models.KNearest import KNearest
+from nodes import optimize_trainer
+from prediction_models.ModelPlugins import ModelPlugins
+from utils.logger import read_log
+from tests.frames import make_aggregates
+
+def experiment(model, hyperparameters):
+    return { 'experiment_number': 1, 'model': model, 'features': ['elo_rating', 'rpi_rating'], 'hyperparameters': hyperparameters }
+
+class ExperimentValidationTest(unittest.TestCase):
+    def test_accepts_registered_hyperparameters(self):
+        for model in ModelPlugins.names():
+            hyperparameters = { name: None for name in ModelPlugins.hyperparameters(model) }
+            self.assertEqual(Experiment.model_validate(experiment(model, hyperparameters)).hyperparameters, hyperparameters)
+
+    def test_accepts_every_default(self):
+        # Results record the defaults alongside the planned hyperparameters
+        for model in ModelPlugins.names():
+            _, rejected = ModelPlugins.check_hyperparameters(model, ModelPlugins.get(model).default_hyperparameters)
+            self.assertEqual(rejected, [], model)
+
+    def test_rejects_unknown_hyperparameters(self):
+        with self.assertRaisesRegex(ValidationError, "does not accept the hyperparameters \\['max_dept'\\]"):
+            Experiment.model_validate(experiment('XGBoost', { 'max_depth': 3, 'max_dept': 3 }))
+
+class TrainerHyperparametersTest(unittest.TestCase):
+    def test_drops_unknown_hyperparameters_with_a_warning(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            optimize_trainer.log_path = os.path.join(tmp, "log.jsonl")
+            optimize_trainer.log_type = "file"
+            hyperparameters = optimize_trainer.experiment_hyperparameters(experiment('LogisticRegression', { 'C': 0.5, 'penalty_strength': 2 }))
+            self.assertEqual(hyperparameters, { 'C': 0.5 })
+            records = read_log(optimize_trainer.log_path)
+        self.assertEqual([record['level'] for record in records], ['warning'])
+        self.assertIn("['penalty_strength']", records[0]['message'])
+
+class SampleWeightsTest(unittest.TestCase):
+    # KNearest doesn't take sample weights, so a half-life would be silently ignored
+    def test_experiment_rejects_half_life_without_sample_weights(self):
+        for name, value in [('half_life', 4.0), ('half_life_sweep', [2.0, 4.0])]:
+            with self.assertRaisesRegex(ValidationError, f"does not accept the hyperparameters \\['{ name }'\\]"):
+                Experiment.model_validate({ **experiment('KNearest', None), name: value })
+        self.assertEqual(Experiment.model_validate({ **experiment('XGBoost', None), 'half_life': 4.0 }).half_life, 4.0)
+
+    def test_trainer_drops_half_life_with_a_warning(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            optimize_trainer.log_path = os.path.join(tmp, "log.jsonl")
+            optimize_trainer.log_type = "file"
+            hyperparameters = optimize_trainer.experiment_hyperparameters({ **experiment('KNearest', { 'n_neighbors': 7 }), 'half_life': 4.0 })
+            self.assertEqual(hyperparameters, { 'n_neighbors': 7 })
+            records = read_log(optimize_trainer.log_path)
+        self.assertEqual([record['level'] for record in records], ['warning'])
+        self.assertIn("['half_life']", records[0]['message'])
+
+    def test_model_warns_and_ignores_half_life(self):
+        aggregates = make_aggregates()
+        with self.assertWarnsRegex(UserWarning, "KNearest does not use sample weights"):
+            model = KNearest(aggregates, 'win', ['elo_rating', 'rpi_rating'], aggregates, { 'half_life': 4.0, 'half_life_sweep': [2.0] }, refit=False)
+        self.assertNotIn('half_life', model.model_output['hyperparameters'])
+        self.assertNotIn('half_life_sweep', model.model_output)
+
+if __name__ == '__main__':
+    unittest.main()
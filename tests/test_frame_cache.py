@@ -0,0 +1,92 @@
+import gc
+import unittest
+import weakref
+import numpy as np
+from data_sources.FrameCache import FrameCache
+from data_sources.FeatureIndex import FeatureIndex
+from prediction_models.RecencyWeights import RecencyWeights
+from prediction_models.LinearGram import LinearGram
+from prediction_models.ColumnScaler import ColumnScaler
+from prediction_models.LogisticPath import LogisticPath
+from prediction_models.NeighborIndex import NeighborIndex
+from prediction_models.QuantileMatrices import QuantileMatrices
+from tests.frames import make_aggregates
+
+class FrameCacheTest(unittest.TestCase):
+    def test_builds_once_per_frame(self):
+        cache = FrameCache()
+        frame = make_aggregates()
+        builds = []
+        first = cache.get(frame, lambda: builds.append(1) or object())
+        self.assertIs(cache.get(frame, lambda: builds.append(1) or object()), first)
+        self.assertEqual(len(builds), 1)
+
+    def test_drops_entries_with_their_frames(self):
+        cache = FrameCache()
+        frames = [make_aggregates(seed=i) for i in range(5)]
+        for frame in frames:
+            cache.get(frame, object)
+        self.assertEqual(len(cache), 5)
+        del frame, frames
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+
+    def test_caches_none(self):
+        cache = FrameCache()
+        frame = make_aggregates()
+        builds = []
+        cache.get(frame, lambda: builds.append(1))
+        cache.get(frame, lambda: builds.append(1))
+        self.assertEqual(len(builds), 1)
+
+class EngineCacheTest(unittest.TestCase):
+    """Engines built for dropped frames must not outlive them, nor keep their FeatureIndex alive."""
+    def assert_released(self, for_frame, use=None):
+        engines, indexes = [], []
+        for i in range(5):
+            frame = make_aggregates(seed=i)
+            engine = for_frame(frame)
+            if use is not None:
+                use(engine, frame)
+            engines.append(weakref.ref(engine))
+            indexes.append(weakref.ref(FeatureIndex.for_frame(frame)))
+            del frame, engine
+        gc.collect()
+        self.assertEqual([ref() for ref in engines], [None] * 5)
+        self.assertEqual([ref() for ref in indexes], [None] * 5)
+
+    def test_recency_weights(self):
+        self.assert_released(RecencyWeights.for_frame, lambda engine, frame: engine.sample_weights(frame.index[:50], 4.0))
+        self.assertEqual(len(RecencyWeights._RecencyWeights__cache), 0)
+
+    def test_linear_gram(self):
+        def solve(engine, frame):
+            engine.solve(frame.index, np.ones(len(frame)), ['team_a_elo_rating'], 'team_a_point_differential')
+        self.assert_released(LinearGram.for_frame, solve)
+        self.assertEqual(len(LinearGram._LinearGram__cache), 0)
+
+    def test_column_scaler(self):
+        self.assert_released(ColumnScaler.for_frame, lambda engine, frame: engine.scaler(frame.index, ['team_a_elo_rating']))
+        self.assertEqual(len(ColumnScaler._ColumnScaler__cache), 0)
+
+    def test_logistic_path(self):
+        self.assert_released(LogisticPath.for_frame, lambda engine, frame: engine.scaler(frame.index, ['team_a_elo_rating']))
+        self.assertEqual(len(LogisticPath._LogisticPath__cache), 0)
+
+    def test_neighbor_index(self):
+        def fit(engine, frame):
+            columns = ['team_a_elo_rating', 'team_b_elo_rating']
+            X = frame[columns]
+            scaler = engine.scaler(X.index, columns)
+            engine.classifier(X.index, scaler.transform(X), frame['team_a_win'], columns, { 'n_neighbors': 5 })
+        self.assert_released(NeighborIndex.for_frame, fit)
+        self.assertEqual(len(NeighborIndex._NeighborIndex__cache), 0)
+
+    def test_quantile_matrices(self):
+        def build(engine, frame):
+            engine.matrix(frame[['team_a_elo_rating']], frame['team_a_point_differential'], np.ones(len(frame)), 256)
+        self.assert_released(QuantileMatrices.for_frame, build)
+        self.assertEqual(len(QuantileMatrices._QuantileMatrices__cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
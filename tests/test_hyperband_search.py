@@ -0,0 +1,49 @@
+import unittest
+
+from planners.HyperbandSearch import HyperbandSearch
+
+FEATURES = [f"feature_{ i }" for i in range(20)]
+
+class HyperbandBudgetTest(unittest.TestCase):
+    def search(self, eta, min_budget):
+        return HyperbandSearch(lambda *args: {}, "LinearRegression", FEATURES, eta, min_budget, seed=0)
+
+    def test_power_of_eta(self):
+        search = self.search(3, 1/9)
+        self.assertEqual(search.s_max, 2)
+        for actual, expected in zip(search.budgets(2), [1/9, 1/3, 1.0]):
+            self.assertAlmostEqual(actual, expected)
+        for actual, expected in zip(search.budgets(1), [1/3, 1.0]):
+            self.assertAlmostEqual(actual, expected)
+        self.assertEqual(search.budgets(0), [1.0])
+
+    def test_min_budget_not_a_power_of_eta(self):
+        search = self.search(3, 0.2)
+        self.assertEqual(search.s_max, 1)
+        self.assertEqual(search.budgets(1), [0.2, 1.0])
+        self.assertEqual(search.budgets(0), [1.0])
+
+        search = self.search(2, 0.1)
+        self.assertEqual(search.s_max, 3)
+        for actual, expected in zip(search.budgets(3), [0.1, 0.2, 0.4, 1.0]):
+            self.assertAlmostEqual(actual, expected)
+        for actual, expected in zip(search.budgets(2), [0.2, 0.4, 1.0]):
+            self.assertAlmostEqual(actual, expected)
+
+    def test_evaluated_fractions(self):
+        fractions = []
+        def evaluate(model_name, features, hyperparameters, train_fraction):
+            fractions.append(train_fraction)
+            return { "mean_absolute_error": len(features) }
+        search = HyperbandSearch(evaluate, "LinearRegression", FEATURES, 3, 0.2, seed=0)
+        results = search.run(brackets=1)
+        self.assertAlmostEqual(min(fractions), 0.2)
+        self.assertEqual(fractions.count(1.0), len(results))
+
+    def test_invalid_min_budget(self):
+        for min_budget in [0, -0.5, 1.5]:
+            with self.assertRaises(ValueError):
+                self.search(3, min_budget)
+
+if __name__ == "__main__":
+    unittest.main()
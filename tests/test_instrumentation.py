@@ -0,0 +1,40 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from data_sources.ResultsDB import ResultsDB
+from utils import instrumentation
+
+class SaveRecordsTest(unittest.TestCase):
+    def setUp(self):
+        instrumentation.records.clear()
+        instrumentation.pending.clear()
+
+    def tables(self, db_path):
+        conn = sqlite3.connect(db_path)
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        conn.close()
+        return tables
+
+    def test_writes_once_at_the_end_of_the_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "run.db")
+            node = instrumentation.instrument("test", "node", lambda state: { "agent_id": "agent" })
+            for _ in range(5):
+                node({ "db_path": db_path })
+            # Nodes don't touch the database while the run goes on
+            self.assertFalse(os.path.exists(db_path) and "node_metric" in self.tables(db_path))
+            self.assertEqual(len(instrumentation.pending), 5)
+
+            instrumentation.save_records()
+            self.assertEqual(instrumentation.pending, [])
+            metrics = ResultsDB(db_path).load_node_metrics("agent")
+            self.assertEqual([metric["node"] for metric in metrics], ["node"] * 5)
+
+            # Saving again doesn't duplicate the rows
+            instrumentation.save_records()
+            self.assertEqual(len(ResultsDB(db_path).load_node_metrics("agent")), 5)
+        self.assertEqual(len(instrumentation.records), 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from sklearn.linear_model import LinearRegression as LinearRegressor
+from prediction_models.LinearRegression import LinearRegression
+from tests.frames import make_aggregates
+
+FEATURES = ['elo_rating', 'rpi_rating']
+
+class GramSolveTest(unittest.TestCase):
+    """The Gram-matrix fits must match scikit-learn's weighted least squares."""
+    def setUp(self):
+        self.aggregates = make_aggregates()
+
+    def model(self, hyperparameters=None, evaluation=None):
+        return LinearRegression(self.aggregates, 'point_differential', FEATURES, self.aggregates, hyperparameters, evaluation = evaluation)
+
+    def reference(self, model, hyperparameters=None):
+        """(mean fold MAE, mean fold coefficients, refit) of scikit-learn on the model's own rows, weights and splits."""
+        X, y, sample_weight = model.training_data()
+        def fit(rows):
+            lr = LinearRegressor(**(hyperparameters or {}))
+            return lr.fit(X.iloc[rows], y.iloc[rows], sample_weight = sample_weight.iloc[rows])
+        errors, coefficients = [], []
+        for train_rows, test_rows in model.evaluation_splits(model.training_features['season']):
+            lr = fit(train_rows)
+            errors.append(np.mean(np.abs(y.iloc[test_rows].to_numpy() - lr.predict(X.iloc[test_rows]))))
+            coefficients.append(dict(zip(X.columns, lr.coef_)))
+        mean_coefficients = { col: np.mean([fold[col] for fold in coefficients]) for col in X.columns }
+        return np.mean(errors), mean_coefficients, fit(np.arange(len(X)))
+
+    def assert_matches(self, model, hyperparameters=None):
+        mean_absolute_error, coefficients, refit = self.reference(model, hyperparameters)
+        self.assertAlmostEqual(model.model_output['mean_absolute_error'], mean_absolute_error, delta = 1e-3)
+        for col, coefficient in coefficients.items():
+            self.assertAlmostEqual(model.model_output['feature_coefficients'][col], coefficient, delta = 1e-3)
+        np.testing.assert_allclose(model.lr_regressor.coef_, refit.coef_, rtol = 1e-8, atol = 1e-10)
+        self.assertAlmostEqual(model.lr_regressor.intercept_, refit.intercept_, places = 8)
+
+    def test_weighted_holdout(self):
+        model = self.model()
+        self.assertIsNotNone(model.gram)
+        self.assertGreater(np.ptp(model.training_data()[2]), 0)
+        self.assert_matches(model)
+
+    def test_weighted_season_folds(self):
+        model = self.model(evaluation = { 'mode': 'season', 'folds': 3, 'jobs': 1 })
+        self.assertIsNotNone(model.gram)
+        self.assert_matches(model)
+
+    def test_without_intercept_falls_back_to_scikit_learn(self):
+        model = self.model({ 'fit_intercept': False })
+        self.assertIsNone(model.gram)
+        self.assertEqual(model.lr_regressor.intercept_, 0.0)
+        self.assert_matches(model, { 'fit_intercept': False })
+
+if __name__ == '__main__':
+    unittest.main()
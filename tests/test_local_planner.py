@@ -0,0 +1,63 @@
+import argparse
+import unittest
+from planners.LocalPlanner import LocalPlanner
+from utils.arguments import local_planner_phase, optimize_arguments
+
+FEATURES = [f"feature_{ i }" for i in range(30)]
+MODELS = [{ "name": "LinearRegression" }]
+
+class LocalSearchPlannerTest(unittest.TestCase):
+    def test_candidates_have_at_least_min_features(self):
+        memory = {}
+        historical = []
+        for _ in range(6):
+            planner = LocalPlanner('greedy', MODELS, FEATURES, historical, memory, seed=0)
+            experiments = planner.plan(10)
+            for experiment in experiments:
+                self.assertGreaterEqual(len(experiment["features"]), planner.min_features)
+                self.assertLessEqual(len(experiment["features"]), planner.max_features)
+                # Larger feature sets score better, so forward selection keeps growing the base
+                historical.append({ "model_name": experiment["model"], "features_used": experiment["features"], "result": { "mean_absolute_error": 10 - len(experiment["features"]) / 100 + FEATURES.index(experiment["features"][-1]) / 1000 } })
+
+    def test_base_grows_with_batches_larger_than_the_queue(self):
+        # 45 experiments per batch against 20 greedy candidates, the rest are random
+        memory = {}
+        historical = []
+        bases = []
+        for _ in range(6):
+            planner = LocalPlanner('greedy', MODELS, FEATURES, historical, memory, seed=len(historical))
+            for experiment in planner.plan(45):
+                features = experiment["features"]
+                historical.append({ "model_name": experiment["model"], "features_used": features, "result": { "mean_absolute_error": 10 - len(features) / 100 + FEATURES.index(features[-1]) / 10000 } })
+            bases.append(len(memory["greedy"]["LinearRegression"]["base"]))
+        self.assertEqual(bases, [2, 3, 4, 5, 6, 7])
+
+    def test_strategies_refill_between_batches(self):
+        for strategy in ['annealing', 'halving']:
+            memory = {}
+            planner = LocalPlanner(strategy, MODELS, FEATURES, [], memory, seed=0)
+            planner.plan(45)
+            # The first proposals are still waiting for results, so they weren't replaced
+            self.assertEqual(memory[strategy]["LinearRegression"]["queue"], [], strategy)
+            if strategy == 'annealing':
+                self.assertEqual(memory[strategy]["LinearRegression"]["temperature"], 0.05)
+            else:
+                self.assertEqual(memory[strategy]["LinearRegression"]["rung"], 0)
+
+class LocalPlannerArgumentsTest(unittest.TestCase):
+    def test_parses_phase_and_strategy(self):
+        self.assertEqual(local_planner_phase("2=greedy"), (2, "greedy"))
+
+    def test_rejects_invalid_values(self):
+        for value in ["greedy", "x=greedy", "1=bayesian"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                local_planner_phase(value)
+
+    def test_parser_exits_on_invalid_values(self):
+        parser = optimize_arguments()
+        self.assertEqual(parser.parse_args(["--local_planner", "1=random", "3=halving"]).local_planner, [(1, "random"), (3, "halving")])
+        with self.assertRaises(SystemExit):
+            parser.parse_args(["--local_planner", "1=bayesian"])
+
+if __name__ == '__main__':
+    unittest.main()
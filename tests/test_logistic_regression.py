@@ -0,0 +1,30 @@
+import unittest
+from prediction_models.LogisticRegression import LogisticRegression
+from tests.frames import make_correlated_aggregates
+
+FEATURES = [f'f{ i }' for i in range(6)]
+PATH = [0.001, 0.01, 0.1, 1.0, 10.0]
+
+class RegularizationPathTest(unittest.TestCase):
+    def setUp(self):
+        # A warm-started path used to land a game away from the main fit at C=1.0 here
+        self.aggregates = make_correlated_aggregates(rows=2000, seed=18)
+        self.test_games = 400
+
+    def model(self, hyperparameters):
+        return LogisticRegression(self.aggregates, 'win', FEATURES, self.aggregates, hyperparameters, refit=False)
+
+    def test_own_C_matches_main_fit(self):
+        for C in [1.0, 0.1]:
+            output = self.model({ 'C': C, 'regularization_path': PATH }).model_output
+            self.assertEqual(output['regularization_path'][str(C)], output['test_accuracy'])
+
+    def test_other_points_within_tolerance_of_cold_fits(self):
+        # Warm-started fits stop within lbfgs's tolerance of the optimum, a game or two either way
+        path = self.model({ 'regularization_path': PATH }).model_output['regularization_path']
+        for C in PATH:
+            cold = self.model({ 'C': C }).model_output['test_accuracy']
+            self.assertAlmostEqual(path[str(C)], cold, delta = 2 / self.test_games + 1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from prediction_models.ModelRegistry import ModelRegistry
+from prediction_models.PredictionModel import PredictionModel
+from prediction_models.LinearRegression import LinearRegression
+from tests.frames import make_aggregates
+
+FEATURES = ['elo_rating', 'rpi_rating']
+
+class LoadOrTrainTest(unittest.TestCase):
+    def load_or_train(self, registry, aggregates):
+        prepare = PredictionModel._PredictionModel__prepare_features
+        with mock.patch.object(PredictionModel, '_PredictionModel__prepare_features', autospec = True, side_effect = prepare) as prepared:
+            model, loaded = registry.load_or_train(LinearRegression, aggregates, 'point_differential', FEATURES, aggregates)
+        return model, loaded, prepared.call_count
+
+    def test_features_are_assembled_once(self):
+        aggregates = make_aggregates()
+        with tempfile.TemporaryDirectory() as tmp:
+            registry = ModelRegistry(tmp)
+            # Training and prediction features, once each, whether the model is trained or loaded
+            trained, loaded, calls = self.load_or_train(registry, aggregates)
+            self.assertEqual((loaded, calls), (False, 2))
+            warm, loaded, calls = self.load_or_train(registry, aggregates)
+            self.assertEqual((loaded, calls), (True, 2))
+
+        fresh = LinearRegression(aggregates, 'point_differential', FEATURES, aggregates)
+        for model in [trained, warm]:
+            np.testing.assert_array_equal(model.predict_values(aggregates)[0], fresh.predict_values(aggregates)[0])
+        self.assertEqual(trained.model_output['mean_absolute_error'], fresh.model_output['mean_absolute_error'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+from prediction_models.RandomForest import RandomForest
+from tests.frames import make_aggregates
+
+FEATURES = ['elo_rating', 'rpi_rating']
+
+class RandomForestSeedTest(unittest.TestCase):
+    def test_repeated_fits_match(self):
+        aggregates = make_aggregates()
+        for evaluation in [None, { 'mode': 'season', 'folds': 3 }]:
+            first, second = [
+                RandomForest(aggregates, 'point_differential', FEATURES, aggregates, { 'n_estimators': 20 }, evaluation = evaluation)
+                for _ in range(2)
+            ]
+            self.assertEqual(first.model_output['mean_absolute_error'], second.model_output['mean_absolute_error'])
+            np.testing.assert_array_equal(first.predict_values(aggregates)[0], second.predict_values(aggregates)[0])
+
+class RecordingForest(RandomForest):
+    """A RandomForest that records the rows of its refits."""
+    def fit(self, X, y, sample_weight):
+        self.refit_rows = len(X)
+        return super().fit(X, y, sample_weight)
+
+class OutOfBagRefitTest(unittest.TestCase):
+    def refit_rows(self, train_fraction):
+        aggregates = make_aggregates()
+        model = RecordingForest(aggregates, 'point_differential', FEATURES, aggregates, { 'n_estimators': 20 }, train_fraction = train_fraction)
+        return getattr(model, 'refit_rows', None), len(aggregates)
+
+    def test_full_budget_out_of_bag_fit_is_the_refit(self):
+        self.assertEqual(self.refit_rows(1.0)[0], None)
+
+    def test_partial_out_of_bag_fit_is_refit_on_every_row(self):
+        refit_rows, rows = self.refit_rows(0.3)
+        self.assertEqual(refit_rows, rows)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from prediction_models.XGBoost import XGBoost
+from prediction_models.QuantileMatrices import QuantileMatrices
+from tests.frames import make_aggregates
+
+FEATURES = ['elo_rating', 'rpi_rating']
+
+class QuantileMatricesTest(unittest.TestCase):
+    def model(self, aggregates, hyperparameters):
+        return XGBoost(aggregates, 'point_differential', FEATURES, aggregates, { 'n_estimators': 10, **hyperparameters })
+
+    def test_experiments_share_matrices(self):
+        aggregates = make_aggregates()
+        matrices = QuantileMatrices.for_frame(aggregates).matrices
+        first = self.model(aggregates, { 'max_depth': 3 })
+        # The test pass split and the refit on every row
+        self.assertEqual(len(matrices), 2)
+        self.model(aggregates, { 'max_depth': 5, 'learning_rate': 0.3 })
+        self.assertEqual(len(matrices), 2)
+        # Another binning or half-life is another matrix
+        self.model(aggregates, { 'max_bin': 64 })
+        self.model(aggregates, { 'half_life': 2.0 })
+        self.assertEqual(len(matrices), 6)
+
+        again = self.model(aggregates, { 'max_depth': 3 })
+        self.assertEqual(again.model_output['mean_absolute_error'], first.model_output['mean_absolute_error'])
+
+    def test_frames_have_their_own_matrices(self):
+        aggregates, other = make_aggregates(seed=0), make_aggregates(seed=1)
+        first, second = self.model(aggregates, {}), self.model(other, {})
+        self.assertNotEqual(first.model_output['mean_absolute_error'], second.model_output['mean_absolute_error'])
+        self.assertIsNot(first.matrices, second.matrices)
+
+if __name__ == '__main__':
+    unittest.main()
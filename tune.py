@@ -0,0 +1,93 @@
+# Internal Libraries
+from utils.arguments import tune_arguments
+
+# Parse arguments before loading anything heavy so --help returns immediately
+args = tune_arguments().parse_args()
+
+print("Loading dependencies...\n")
+
+# External Libraries
+from dotenv import load_dotenv
+import os
+import sys
+import uuid
+import datetime
+import sqlite3
+
+# Data Sources
+from data_sources.DataAggregate import DataAggregate
+from data_sources.ResultsDB import ResultsDB
+
+# Nodes
+from nodes.optimize_trainer import evaluate_model_with_features
+
+# Planners
+from planners.HyperbandSearch import HyperbandSearch
+
+# Utilities
+from utils.logger import log
+from utils.features import get_extended_features
+
+# Internal Libraries
+import setup # Loads launch states, sets preferences from .env, enables argument parsing
+
+load_dotenv()
+this_filename = os.path.basename(__file__).replace(".py","")
+
+
+state = {
+    "agent_id": str(uuid.uuid4()),
+    "db_path": os.getenv("DB_PATH"),
+    "log_type": "all" if args.debug else "file",
+    "compact_aggregates": args.compact
+}
+now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+state["log_path"] = f"logs/{ this_filename }/{ now }_{ state["agent_id"] }.jsonl"
+log(state["log_path"], f"Tuning { args.model }...\n", state["log_type"], this_filename)
+
+with open("queries/insert_agent_run.sql") as f:
+    query = f.read().format(
+        agent_id = f"\"{ state["agent_id"] }\"",
+        agent_name = f"\"Tune Agent\""
+    )
+conn = sqlite3.connect(state["db_path"])
+conn.execute(query)
+conn.commit()
+conn.close()
+
+rdb = ResultsDB(state["db_path"])
+rdb.ensure_hyperparameters_column()
+
+data_aggregates = DataAggregate(state)
+
+def evaluate(model_name, features, hyperparameters, train_fraction):
+    return evaluate_model_with_features(
+        data_aggregates.aggregates,
+        model_name,
+        features,
+        data_aggregates.prediction_set,
+        hyperparameters,
+        train_fraction,
+        refit = False,
+        evaluation = { "mode": args.evaluation, "folds": args.cv_folds }
+    )
+
+search = HyperbandSearch(evaluate, args.model, get_extended_features(), args.eta, args.min_budget, args.seed)
+results = search.run(args.brackets)
+
+# Save every full-budget result and keep the best one if it beats the current best result
+best = None
+for result in results:
+    result["result"]["agent_id"] = state["agent_id"]
+    rdb.save_result(result["result"], result["features_used"])
+    if best is None or search.loss(result["result"]) < search.loss(best["result"]):
+        best = result
+
+metric = "mean_absolute_error" if best and best["result"]["target"] == "point_differential" else "test_accuracy"
+for current in rdb.load_best_results():
+    if best and current["model_name"] == args.model and search.loss(best["result"]) < search.loss(current):
+        log(state["log_path"], f"🥳 NEW BEST FOR { args.model }: { best["result"][metric] } (was { current[metric] })", state["log_type"], this_filename)
+        rdb.save_best_result(best["result"], best["features_used"])
+
+log(state["log_path"], f"Evaluated { len(results) } full-budget configurations for { args.model }", state["log_type"], this_filename)
+rdb.set_agent_completion(state["agent_id"])
@@ -0,0 +1,73 @@
+# External Libraries
+import argparse
+
+# Planners
+from planners.LocalPlanner import LocalPlanner
+
+# Prediction Models
+from prediction_models.ModelPlugins import ModelPlugins
+
+# Kept free of heavy imports: entry points parse arguments before loading the graphs,
+# so --help and argument errors return immediately
+
+def local_planner_phase(value):
+    """(phase, strategy) of a --local_planner PHASE=STRATEGY value."""
+    phase, _, strategy = value.partition("=")
+    if not phase.isdigit() or strategy not in LocalPlanner.strategies:
+        raise argparse.ArgumentTypeError(f"expected PHASE=STRATEGY with a strategy in { LocalPlanner.strategies }, got { value }")
+    return int(phase), strategy
+
+def optimize_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--debug", action = "store_true", help = "verbose printing of logs to stdout (not just logfile)")
+    parser.add_argument("--max_experiments", type = int, default = 500, help = "max number of experiments to run, default is 500")
+    parser.add_argument("--local_planner", nargs = "*", type = local_planner_phase, default = [], metavar = "PHASE=STRATEGY", help = f"plan these phases locally instead of with the LLM, e.g. 1=random 2=greedy. Strategies: { ', '.join(LocalPlanner.strategies) }")
+    parser.add_argument("--compact", action = "store_true", help = "load aggregates as float32 / categorical columns to reduce memory")
+    parser.add_argument("--local_batch_size", type = int, default = 10, help = "number of experiments per locally planned batch, default is 10")
+    parser.add_argument("--evaluation", choices = ["holdout", "season", "expanding"], default = "holdout", help = "how experiments are scored: one random 80/20 split (default), season-grouped folds or expanding-window folds over the last seasons")
+    parser.add_argument("--cv_folds", type = int, default = 5, help = "number of folds for the season / expanding evaluations, default is 5")
+    parser.add_argument("--cv_jobs", type = int, default = -1, help = "folds trained in parallel, default is -1 for every core")
+    parser.add_argument("--draw_graphs", action = "store_true", help = "render PNGs of the optimize and planner graphs to graphs/images (uses the mermaid.ink API)")
+    return parser
+
+def predict_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--debug", action="store_true", help="verbose printing of logs to stdout (not just logfile)")
+    parser.add_argument("--compact", action="store_true", help="load aggregates as float32 / categorical columns to reduce memory")
+    parser.add_argument("--retrain", action="store_true", help="retrain every best model instead of loading fitted models from the registry")
+    parser.add_argument("--multi_target", action="store_true", help="only fit the spread models, each one also gives the winner's confidence, instead of fitting the classifiers too")
+    parser.add_argument("--stack", action="store_true", help="also blend the best models into one stacked spread and win probability per game, learned from their cached out-of-fold predictions")
+    parser.add_argument("--draw_graphs", action="store_true", help="render PNGs of the predict and analyzer graphs to graphs/images (uses the mermaid.ink API)")
+    return parser
+
+def scrape_arguments():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--history", action="store_true", help="load all historical data, if not set only the current season will be loaded")
+    parser.add_argument("--debug", action="store_true", help="verbose printing of logs to stdout (not just logfile)")
+    parser.add_argument("--draw_graphs", action="store_true", help="render a PNG of the scrape graph to graphs/images (uses the mermaid.ink API)")
+    return parser
+
+def backtest_arguments():
+    parser = argparse.ArgumentParser(description = "Walk-forward backtest of the best models: each week is predicted by a model trained only on earlier weeks")
+    parser.add_argument("--models", nargs = "*", default = None, help = "models to backtest with their best features and hyperparameters, default is every best result")
+    parser.add_argument("--start_season", type = int, default = None, help = "first season to predict, default is the second season in the data")
+    parser.add_argument("--end_season", type = int, default = None, help = "last season to predict, default is the latest season")
+    parser.add_argument("--retrain_every", type = int, default = 1, help = "refit each model every N weeks, default is every week")
+    parser.add_argument("--cache_models", action = "store_true", help = "keep each week's fitted models in results/backtest_registry so reruns load them instead of training")
+    parser.add_argument("--retrain", action = "store_true", help = "with --cache_models, refit every week and overwrite the cached models")
+    parser.add_argument("--compact", action = "store_true", help = "load aggregates as float32 / categorical columns to reduce memory")
+    parser.add_argument("--debug", action = "store_true", help = "verbose printing of logs to stdout (not just logfile)")
+    return parser
+
+def tune_arguments():
+    parser = argparse.ArgumentParser(description = "Hyperband search over features and hyperparameters for one model")
+    parser.add_argument("--model", required = True, choices = ModelPlugins.names(), help = "model to tune")
+    parser.add_argument("--eta", type = int, default = 3, help = "keep the best 1/eta configurations at each rung, default is 3")
+    parser.add_argument("--min_budget", type = float, default = 1/9, help = "fraction of training rows used by the cheapest fits, default is 1/9")
+    parser.add_argument("--brackets", type = int, default = None, help = "number of Hyperband brackets to run, default is all")
+    parser.add_argument("--seed", type = int, default = None, help = "random seed for sampling configurations")
+    parser.add_argument("--compact", action = "store_true", help = "load aggregates as float32 / categorical columns to reduce memory")
+    parser.add_argument("--evaluation", choices = ["holdout", "season", "expanding"], default = "holdout", help = "how configurations are scored: one random 80/20 split (default), season-grouped folds or expanding-window folds over the last seasons")
+    parser.add_argument("--cv_folds", type = int, default = 5, help = "number of folds for the season / expanding evaluations, default is 5")
+    parser.add_argument("--debug", action = "store_true", help = "verbose printing of logs to stdout (not just logfile)")
+    return parser
@@ -1,3 +1,5 @@
+from prediction_models.ModelPlugins import ModelPlugins
+
 base_features = [
     'elo_rating',
     'rpi_rating',
@@ -35,7 +37,7 @@ windowed_trend_features = [
 ]
 
 def get_extended_features():
-    ef = base_features
+    ef = list(base_features)
     for feature in windowed_avg_features:
         for interval in [3, 5, 7]:
             ef.append(f"{ feature }_l{ interval }")
@@ -48,7 +50,7 @@ def get_extended_features():
 
 def calculate_feature_effects(data_with, data_without):
         effects = {}
-        for model in ['XGBoost', 'LinearRegression', 'RandomForest', 'LogisticRegression', 'KNearest']:
+        for model in ModelPlugins.names():
             effects[model] = { 
                 'with': { 'total': 0.0, 'count': 0, 'average': 0.0 },
                 'without': { 'total': 0.0, 'count': 0, 'average': 0.0 },
@@ -56,7 +58,7 @@ def calculate_feature_effects(data_with, data_without):
         for item in data_with:
             model = item['model_name']
             effects[model]['with']['count'] += 1
-            if model in ['XGBoost', 'LinearRegression', 'RandomForest']:
+            if ModelPlugins.model_type(model) == 'regressor':
                 effects[model]['with']['total'] += float(item['mean_absolute_error'])
             else:
                 effects[model]['with']['total'] += float(item['test_accuracy'])
@@ -66,7 +68,7 @@ def calculate_feature_effects(data_with, data_without):
         for item in data_without:
             model = item['model_name']
             effects[model]['without']['count'] += 1
-            if model in ['XGBoost', 'LinearRegression', 'RandomForest']:
+            if ModelPlugins.model_type(model) == 'regressor':
                 effects[model]['without']['total'] += float(item['mean_absolute_error'])
             else:
                 effects[model]['without']['total'] += float(item['test_accuracy'])
@@ -48,11 +48,11 @@ class formatting:
         for matchup in matchups:
             lines.append(f"\n***** { matchup } *****")
             for prediction in matchups[matchup]["predictions"]:
-                prediction_text = (
-                    matchups[matchup]["predictions"][prediction].get("prediction_text") or 
-                    matchups[matchup]["predictions"][prediction].get("predicted_winner") +
-                    f" (Confidence: {int(matchups[matchup]["predictions"][prediction].get("confidence") * 100) }%)"
-                )
+                result = matchups[matchup]["predictions"][prediction]
+                prediction_text = result.get("prediction_text") or result.get("predicted_winner")
+                # Spread models report a confidence too once their error has been measured
+                if result.get("confidence") is not None:
+                    prediction_text += f" (Confidence: {int(result["confidence"] * 100) }%)"
                 lines.append(f"- { prediction }: { prediction_text }")
             lines.append(f"")
         return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,123 @@
+# External Libraries
+import sys
+import atexit
+import time
+import sqlite3
+import resource
+import functools
+
+# Data Sources
+from data_sources.ResultsDB import ResultsDB
+
+# Every node invocation recorded by this process, in order
+records = []
+# (db_path, metric) of the records not yet written to the node_metric table
+pending = []
+
+def peak_rss_mb():
+    """High-water resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def count_llm_tokens(state, update):
+    """
+    Tokens used by the LLM calls a node made, read from the agent response it returns
+    as `llm_response`. AI messages the node passed back in from its history are skipped.
+    """
+    if not isinstance(update, dict) or not update.get("llm_response"):
+        return 0
+    seen = { message.id for message in state.get("messages", []) if getattr(message, "id", None) }
+    tokens = 0
+    for message in update["llm_response"].get("messages", []):
+        usage = (getattr(message, "response_metadata", None) or {}).get("token_usage")
+        if usage and getattr(message, "id", None) not in seen:
+            tokens += usage.get("total_tokens", 0)
+    return tokens
+
+def instrument(graph, node_name, node):
+    """
+    Wraps a LangGraph node so every invocation records wall time, CPU time, peak RSS
+    and LLM tokens. Records are kept in `records` and written to the node_metric table
+    of the run's database by save_records, once at the end of the run.
+    """
+    @functools.wraps(node)
+    def instrumented_node(state):
+        start_rss = peak_rss_mb()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        update = None
+        error = None
+        try:
+            update = node(state)
+            return update
+        except Exception as e:
+            error = f"{ type(e).__name__ }: { e }"
+            raise
+        finally:
+            end_rss = peak_rss_mb()
+            latest = update if isinstance(update, dict) else {}
+            metric = {
+                "agent_id": str(latest.get("agent_id") or state.get("agent_id") or ""),
+                "graph": graph,
+                "node": node_name,
+                "wall_time_in_seconds": time.perf_counter() - start_wall,
+                "cpu_time_in_seconds": time.process_time() - start_cpu,
+                "peak_rss_mb": end_rss,
+                "rss_growth_mb": end_rss - start_rss,
+                "llm_tokens": count_llm_tokens(state, update),
+                "error": error
+            }
+            records.append(metric)
+
+            db_path = latest.get("db_path") or state.get("db_path")
+            if db_path:
+                pending.append((db_path, metric))
+    return instrumented_node
+
+def save_records():
+    """
+    Writes the records not yet saved to the node_metric table, one transaction per
+    database. Entry points call it when their graph returns, and it runs at exit for
+    runs that end early.
+    """
+    by_db = {}
+    for db_path, metric in pending:
+        by_db.setdefault(db_path, []).append(metric)
+    pending.clear()
+    for db_path, metrics in by_db.items():
+        try:
+            ResultsDB(db_path).save_node_metrics(metrics)
+        except sqlite3.Error as e:
+            print(f"Instrumentation error saving node metrics: { e }")
+
+atexit.register(save_records)
+
+def summarize(agent_id=None):
+    """Table of where the time went, one row per graph node, slowest first."""
+    totals = {}
+    for metric in records:
+        if agent_id is not None and metric["agent_id"] != str(agent_id):
+            continue
+        key = (metric["graph"], metric["node"])
+        total = totals.setdefault(key, { "calls": 0, "wall": 0.0, "cpu": 0.0, "peak_rss": 0.0, "tokens": 0, "errors": 0 })
+        total["calls"] += 1
+        total["wall"] += metric["wall_time_in_seconds"]
+        total["cpu"] += metric["cpu_time_in_seconds"]
+        total["peak_rss"] = max(total["peak_rss"], metric["peak_rss_mb"])
+        total["tokens"] += metric["llm_tokens"]
+        total["errors"] += 1 if metric["error"] else 0
+
+    overall = sum(total["wall"] for total in totals.values())
+    lines = []
+    lines.append("NODE TIMINGS")
+    lines.append(f"{'='*100}")
+    lines.append(f"{ "node":<28}{ "calls":>7}{ "wall (s)":>12}{ "mean (s)":>11}{ "cpu (s)":>11}{ "% wall":>9}{ "peak RSS MB":>13}{ "tokens":>9}")
+    for (graph, node_name), total in sorted(totals.items(), key=lambda item: item[1]["wall"], reverse=True):
+        name = f"{ graph }.{ node_name }" + (f" ({ total["errors"] } errors)" if total["errors"] else "")
+        lines.append(
+            f"{ name:<28}{ total["calls"]:>7}{ total["wall"]:>12.2f}{ total["wall"] / total["calls"]:>11.3f}"
+            f"{ total["cpu"]:>11.2f}{ 100 * total["wall"] / max(overall, 1e-9):>8.1f}%{ total["peak_rss"]:>13.1f}{ total["tokens"]:>9}"
+        )
+    lines.append(f"{'='*100}")
+    lines.append(f"Total node time: { overall:.2f}s")
+    return "\n".join(lines)
@@ -1,23 +1,116 @@
 from datetime import datetime
+import os
+import json
+import queue
+import atexit
+import threading
 
-def log(log_path, log_data, log_type = "file", calling_file = ""):
+class LogWriter:
+    """
+    Background writer for JSON-lines log files.
+
+    `log` only puts a record on a bounded queue; a daemon thread keeps each log file
+    open, writes whatever has queued up (up to `batch_size` records) and flushes
+    after every batch. A full queue blocks the caller rather than dropping lines.
+    """
+    def __init__(self, max_queue_size=10000, batch_size=1000):
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.batch_size = batch_size
+        self.files = {}
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def write(self, log_path, record):
+        self.__start()
+        self.queue.put((log_path, record))
+
+    def flush(self):
+        """Blocks until every queued record has been written to disk."""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def __start(self):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self.__run, name="log-writer", daemon=True)
+                    self.thread.start()
+
+    def __run(self):
+        while True:
+            item = self.queue.get()
+            batch = [item]
+            # Drain whatever else is waiting so one flush covers many lines
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            stop = batch[-1] is None
+            for entry in batch:
+                if entry is not None:
+                    self.__write(*entry)
+            for f in self.files.values():
+                f.flush()
+            for _ in batch:
+                self.queue.task_done()
+
+            if stop:
+                for f in self.files.values():
+                    f.close()
+                self.files = {}
+                return
+
+    def __write(self, log_path, record):
+        try:
+            f = self.files.get(log_path)
+            if f is None:
+                os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+                f = self.files[log_path] = open(log_path, 'a')
+            f.write(json.dumps(record, default=str) + "\n")
+        except Exception as e:
+            print(f"Loggit error saving to file: { e }")
+
+writer = LogWriter()
+atexit.register(writer.close)
+
+def run_id_from_path(log_path):
+    """Log files are named {timestamp}_{agent_id}.jsonl, so the run id is the last part of the name."""
+    name = os.path.splitext(os.path.basename(log_path))[0]
+    return name.rsplit("_", 1)[-1]
+
+def log(log_path, log_data, log_type = "file", calling_file = "", level = "info"):
     # Generate a timestamp for l ogs
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now = datetime.now()
 
     if not type(log_data) == 'str':
         log_data = str(log_data)
-        
-    # Teamplate to start each log
-    log_data = f"""[{ ts } :: { calling_file }] """ + log_data
 
     # Do we want to print this only to file or...
     if (log_type == "file" or log_type == "all"):
-        try:
-            with open(log_path, 'a') as f:
-                f.write(f"{ log_data }\n")
-        except Exception as e:
-            print(f"Loggit error saving to file: { e }")
+        writer.write(log_path, {
+            "timestamp": now.isoformat(timespec="milliseconds"),
+            "run_id": run_id_from_path(log_path),
+            "node": calling_file,
+            "level": level,
+            "message": log_data
+        })
 
     # Also to stdout
     if (log_type == "print" or log_type == "all"):
-        print(log_data)
\ No newline at end of file
+        # Teamplate to start each log
+        print(f"""[{ now.strftime("%Y-%m-%d %H:%M:%S") } :: { calling_file }] """ + log_data)
+
+def read_log(log_path):
+    """Returns the records of a JSON-lines log file, e.g. for pandas.DataFrame(read_log(path))."""
+    writer.flush()
+    with open(log_path) as f:
+        return [json.loads(line) for line in f if line.strip()]